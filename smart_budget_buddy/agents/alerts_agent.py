@@ -1,18 +1,102 @@
+from .budget_planner import VARIABLE_CATEGORIES
+from ..utils.instrumentation import traced
+
+# Raw transaction categories (lower-cased) -> budget categories.
+CATEGORY_MAPPING = {
+    'restuarant': 'food', 'coffe': 'food', 'market': 'food',
+    'transport': 'transportation', 'taxi': 'transportation', 'travel': 'transportation', 'rent_car': 'transportation',
+    'clothing': 'personal_care',
+    'phone': 'technology',
+    'learning': 'books_supplies',
+    'events': 'entertainment', 'film/enjoyment': 'entertainment', 'sport': 'entertainment',
+    'health': 'health_wellness',
+    'communal': 'miscellaneous', 'other': 'miscellaneous', 'business_lunch': 'food', 'motel': 'miscellaneous'
+}
+
+NEAR_LIMIT_RATIO = 0.9
+
+
+def budget_category(raw_category, budget_categories):
+    """Maps one raw category; names that already are budget categories map to themselves."""
+    key = str(raw_category).lower()
+    default = key if key in budget_categories else 'miscellaneous'
+    return CATEGORY_MAPPING.get(key, default)
+
+
+def evaluate_period_alerts(spending, limits, freq='M', near_ratio=NEAR_LIMIT_RATIO, student_col='student_id'):
+    """
+    Vectorized budget-vs-actual check for every period (and every student).
+
+    `spending` has `date`, `category` and `amount` columns: raw transactions
+    or any pre-aggregated rows of them, such as SpendingAnalyzerAgent's cube.
+    If it has a `student_col` column, each student is checked separately.
+    `limits` is either one {budget_category: limit} dict for everyone, or a
+    DataFrame indexed by student id with `limit_<category>` columns (the
+    output of budget_planner.generate_budgets()).
+
+    Returns one record per alert with columns [student_col,] period,
+    category, spent, limit and level ('over_limit' or 'near_limit').
+    """
+    import numpy as np
+    import pandas as pd
+    from ..utils.data_loader import amounts_float64
+
+    per_student = student_col in spending.columns
+    budget_categories = list(VARIABLE_CATEGORIES)
+    if isinstance(limits, dict):
+        budget_categories += [c for c in limits if c not in budget_categories]
+
+    # Raw -> budget category through the (small) set of distinct raw values.
+    # Spending without a limit (e.g. transportation, a fixed cost) gets code -1
+    # and is dropped, as are rows with no category.
+    raw = spending['category']
+    if not isinstance(raw.dtype, pd.CategoricalDtype):
+        raw = raw.astype('category')
+    position = {c: i for i, c in enumerate(budget_categories)}
+    lookup = np.array([position.get(budget_category(c, budget_categories), -1) for c in raw.cat.categories] + [-1], dtype=np.int64)
+    budget_codes = lookup[raw.cat.codes.to_numpy()]
+
+    dates = spending['date']
+    if getattr(dates.dt, 'tz', None) is not None:
+        dates = dates.dt.tz_localize(None)
+    keys = [dates.dt.to_period(freq).rename('period'), pd.Series(budget_codes, index=spending.index, name='budget')]
+    if per_student:
+        keys.insert(0, spending[student_col])
+    valid = budget_codes >= 0
+    totals = amounts_float64(spending['amount'])[valid].groupby([k[valid] for k in keys], observed=True).sum()
+    pivot = totals.unstack('budget', fill_value=0.0).reindex(columns=range(len(budget_categories)), fill_value=0.0)
+    actual = pivot.to_numpy()
+
+    if isinstance(limits, dict):
+        limit_matrix = np.broadcast_to(
+            np.array([limits.get(c, np.nan) for c in budget_categories], dtype=float), actual.shape)
+    else:
+        columns = [f'limit_{c}' for c in budget_categories]
+        students = pivot.index.get_level_values(student_col)
+        limit_matrix = limits.reindex(columns=columns).reindex(students).to_numpy(dtype=float)
+
+    over = actual > limit_matrix
+    near = (actual > limit_matrix * near_ratio) & ~over
+    rows, cols = np.nonzero(over | near)
+
+    records = {}
+    if per_student:
+        records[student_col] = pivot.index.get_level_values(student_col)[rows]
+    records['period'] = pivot.index.get_level_values('period')[rows].astype(str)
+    records['category'] = np.array(budget_categories, dtype=object)[cols]
+    records['spent'] = actual[rows, cols]
+    records['limit'] = limit_matrix[rows, cols]
+    records['level'] = np.where(over[rows, cols], 'over_limit', 'near_limit')
+    return pd.DataFrame(records)
+
+
 class AlertsAgent:
     def __init__(self, budget_plan, spending_analysis):
         self.budget = budget_plan
         self.spending = spending_analysis
-        self.mapping = {
-            'restuarant': 'food', 'coffe': 'food', 'market': 'food',
-            'transport': 'transportation', 'taxi': 'transportation', 'travel': 'transportation', 'rent_car': 'transportation',
-            'clothing': 'personal_care',
-            'phone': 'technology',
-            'learning': 'books_supplies',
-            'events': 'entertainment', 'film/enjoyment': 'entertainment', 'sport': 'entertainment',
-            'health': 'health_wellness',
-            'communal': 'miscellaneous', 'other': 'miscellaneous', 'business_lunch': 'food', 'motel': 'miscellaneous'
-        }
+        self.mapping = CATEGORY_MAPPING
 
+    @traced("AlertsAgent.check_alerts", rows=lambda result, self: len(self.spending['category_breakdown']))
     def check_alerts(self):
         alerts = []
         category_spending = self.spending['category_breakdown']
@@ -20,7 +104,7 @@ class AlertsAgent:
         # Aggregate actual spending into budget categories
         aggregated_actuals = {}
         for cat, amount in category_spending.items():
-            budget_cat = self.mapping.get(cat.lower(), 'miscellaneous')
+            budget_cat = budget_category(cat, self.budget['category_limits'])
             aggregated_actuals[budget_cat] = aggregated_actuals.get(budget_cat, 0) + amount
             
         # Compare
@@ -28,10 +112,27 @@ class AlertsAgent:
             actual = aggregated_actuals.get(cat, 0)
             if actual > limit:
                 alerts.append(f"⚠️ Overspending in {cat}: Spent ${actual:.2f} vs Limit ${limit:.2f}")
-            elif actual > limit * 0.9:
+            elif actual > limit * NEAR_LIMIT_RATIO:
                 alerts.append(f"⚠️ Near limit in {cat}: Spent ${actual:.2f} vs Limit ${limit:.2f}")
                 
         return {
             "alerts": alerts,
             "aggregated_spending": aggregated_actuals
         }
+
+    @traced("AlertsAgent.check_monthly_alerts", rows=lambda result, self, spending_df: len(spending_df))
+    def check_monthly_alerts(self, spending_df):
+        """
+        Compares each calendar month's spending with the monthly category
+        limits, instead of the whole period's total. `spending_df` is raw
+        transactions or SpendingAnalyzerAgent.aggregate() reset to columns.
+        """
+        records = evaluate_period_alerts(spending_df, self.budget['category_limits'])
+        alerts = []
+        for r in records.to_dict('records'):
+            label = "Overspending" if r['level'] == 'over_limit' else "Near limit"
+            alerts.append(f"⚠️ {label} in {r['category']} ({r['period']}): Spent ${r['spent']:.2f} vs Limit ${r['limit']:.2f}")
+        return {
+            "alerts": alerts,
+            "records": records.to_dict('records')
+        }
@@ -1,7 +1,39 @@
+from ..utils.instrumentation import traced
+
+# Categories for variable spending
+VARIABLE_CATEGORIES = ['food', 'books_supplies', 'entertainment', 'personal_care', 'technology', 'health_wellness', 'miscellaneous']
+
+# Standard allocation percentages for variable spending (sum = 1.0)
+STANDARD_ALLOCATIONS = {
+    'food': 0.35,
+    'books_supplies': 0.15,
+    'entertainment': 0.10,
+    'personal_care': 0.10,
+    'technology': 0.10,
+    'health_wellness': 0.10,
+    'miscellaneous': 0.10
+}
+
+REC_CRITICAL = "⚠️ Critical: Your fixed expenses exceed your income. Seek financial aid or reduce housing costs."
+REC_COVERED = "✅ Income covers fixed costs."
+REC_SAVING = "You are saving money! Great job."
+REC_OVERSPENDING = "⚠️ You are overspending your disposable income. Reducing variable spending is advised."
+REC_STANDARD = "ℹ️ Using standard student budget allocation rules."
+
+# Which branch of generate_budget() a profile falls into, and the
+# recommendations that branch produces.
+PLAN_RECOMMENDATIONS = {
+    'deficit': [REC_CRITICAL],
+    'saving': [REC_COVERED, REC_SAVING],
+    'overspending': [REC_COVERED, REC_OVERSPENDING],
+    'standard': [REC_COVERED, REC_STANDARD]
+}
+
 class BudgetPlannerAgent:
     def __init__(self, profile):
         self.profile = profile
 
+    @traced("BudgetPlannerAgent.generate_budget")
     def generate_budget(self):
         """
         Generates a monthly budget based on the student profile.
@@ -26,8 +58,7 @@ class BudgetPlannerAgent:
         # We'll just allocate remaining income to categories based on their historical spending in the profile
         # or set reasonable limits.
         
-        # Categories for variable spending
-        categories = ['food', 'books_supplies', 'entertainment', 'personal_care', 'technology', 'health_wellness', 'miscellaneous']
+        categories = VARIABLE_CATEGORIES
         
         # Calculate total historical spending in these categories (if available)
         current_spending = sum(self.profile.get(c, 0) for c in categories)
@@ -40,32 +71,23 @@ class BudgetPlannerAgent:
             "recommendations": []
         }
         
-        # Standard allocation percentages for variable spending (sum = 1.0)
-        allocations = {
-            'food': 0.35,
-            'books_supplies': 0.15,
-            'entertainment': 0.10,
-            'personal_care': 0.10,
-            'technology': 0.10,
-            'health_wellness': 0.10,
-            'miscellaneous': 0.10
-        }
+        allocations = STANDARD_ALLOCATIONS
 
         if disposable_income < 0:
-            budget_plan['recommendations'].append("⚠️ Critical: Your fixed expenses exceed your income. Seek financial aid or reduce housing costs.")
+            budget_plan['recommendations'].append(REC_CRITICAL)
             # Set strict limits (minimal survival budget)
             for cat in categories:
                 budget_plan['category_limits'][cat] = 0
         else:
-            budget_plan['recommendations'].append("✅ Income covers fixed costs.")
+            budget_plan['recommendations'].append(REC_COVERED)
             
             if current_spending > 0:
                 # Use historical data logic
                 if disposable_income > current_spending:
-                     budget_plan['recommendations'].append("You are saving money! Great job.")
+                     budget_plan['recommendations'].append(REC_SAVING)
                      factor = 1.0 
                 else:
-                     budget_plan['recommendations'].append("⚠️ You are overspending your disposable income. Reducing variable spending is advised.")
+                     budget_plan['recommendations'].append(REC_OVERSPENDING)
                      factor = disposable_income / current_spending
                 
                 for cat in categories:
@@ -73,9 +95,95 @@ class BudgetPlannerAgent:
                     budget_plan['category_limits'][cat] = round(limit, 2)
             else:
                 # Use standard allocation logic (New User / Manual Input)
-                budget_plan['recommendations'].append("ℹ️ Using standard student budget allocation rules.")
+                budget_plan['recommendations'].append(REC_STANDARD)
                 for cat in categories:
                     limit = disposable_income * allocations.get(cat, 0.1)
                     budget_plan['category_limits'][cat] = round(limit, 2)
             
         return budget_plan
+
+
+def _round2(values):
+    """
+    Rounds to 2 decimals exactly like Python's round(). np.round only differs
+    when value * 100 lands next to a .5 boundary, so just those are redone.
+    """
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    result = np.round(values, 2)
+    scaled = values * 100
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        result[near_half] = [round(v, 2) for v in values[near_half].tolist()]
+    return result
+
+
+@traced("generate_budgets", rows=lambda result, df_profiles: len(df_profiles))
+def generate_budgets(df_profiles):
+    """
+    Vectorized generate_budget() over a whole profiles DataFrame (e.g. from
+    load_profiles()). Returns one row per profile, aligned with its index:
+    total_income, fixed_<cost>, disposable_income, limit_<category> and a
+    categorical `plan` naming the branch taken (see PLAN_RECOMMENDATIONS).
+    `budget_plan_from_row()` turns a row back into the scalar dict.
+    """
+    # Imported here so the scalar planner (and the CLI pipeline) load without NumPy/pandas.
+    import numpy as np
+    import pandas as pd
+
+    def col(name):
+        if name in df_profiles.columns:
+            return df_profiles[name].to_numpy(dtype=float)
+        return np.zeros(len(df_profiles))
+
+    income = col('monthly_income') + col('financial_aid')
+    tuition = col('tuition') / 6
+    housing = col('housing')
+    transportation = col('transportation')
+    disposable = income - (tuition + housing + transportation)
+
+    spending = {c: col(c) for c in VARIABLE_CATEGORIES}
+    current_spending = np.zeros(len(df_profiles))
+    for c in VARIABLE_CATEGORIES:
+        current_spending = current_spending + spending[c]
+
+    deficit = disposable < 0
+    historical = ~deficit & (current_spending > 0)
+    saving = historical & (disposable > current_spending)
+    overspending = historical & ~saving
+    standard = ~deficit & ~historical
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = np.where(saving, 1.0, disposable / current_spending)
+        historical_limits = {c: spending[c] * factor for c in VARIABLE_CATEGORIES}
+
+    result = pd.DataFrame({
+        'total_income': income,
+        'fixed_tuition': tuition,
+        'fixed_housing': housing,
+        'fixed_transportation': transportation,
+        'disposable_income': disposable
+    }, index=df_profiles.index)
+    for c in VARIABLE_CATEGORIES:
+        limit = np.where(historical, historical_limits[c], disposable * STANDARD_ALLOCATIONS[c])
+        result[f'limit_{c}'] = np.where(deficit, 0.0, _round2(limit))
+
+    plan = np.select([deficit, saving, overspending, standard], list(PLAN_RECOMMENDATIONS), default='standard')
+    result['plan'] = pd.Categorical(plan, categories=list(PLAN_RECOMMENDATIONS))
+    return result
+
+
+def budget_plan_from_row(row):
+    """Converts one row of generate_budgets() into generate_budget()'s dict layout."""
+    return {
+        "total_income": row['total_income'],
+        "fixed_costs": {
+            'tuition': row['fixed_tuition'],
+            'housing': row['fixed_housing'],
+            'transportation': row['fixed_transportation']
+        },
+        "disposable_income": row['disposable_income'],
+        "category_limits": {c: row[f'limit_{c}'] for c in VARIABLE_CATEGORIES},
+        "recommendations": list(PLAN_RECOMMENDATIONS[row['plan']])
+    }
@@ -1,108 +1,184 @@
-import google.generativeai as genai
-import json
 import os
+from .guardrails import DEFAULT_MATCHER, KNOWLEDGE_BASE
+from ..utils.context_builder import ConversationContext
+from ..utils.instrumentation import traced
+from ..utils.knowledge_index import get_default_index
+from ..utils.llm_client import get_model_pool
 from ..utils.memory_store import MemoryStore
-from .tools import calculate_budget_tool, expense_classifier_tool, memory_lookup_tool, memory_update_tool, dataset_loader_tool
+from ..utils.response_cache import context_hash, get_shared_response_cache, normalize_query
+
+MODEL_NAME = 'gemini-2.5-flash-lite'
+STREAM_TIMEOUT_SECONDS = 30
+REFUSAL_MESSAGE = "I'm here only to help with student budgeting and financial literacy. I cannot assist with that topic."
 
 class FinancialLiteracyChatBot:
-    def __init__(self, api_key=None):
-        self.memory = MemoryStore()
+    def __init__(self, api_key=None, response_cache=None, context_token_budget=600, memory=None):
+        # A service passes each user's own store; the app uses the shared file.
+        self.memory = memory or MemoryStore()
+        # Indexed once here, then kept up to date turn by turn.
+        self.context = ConversationContext(token_budget=context_token_budget)
+        for message in self.memory.get_history():
+            self.context.add_turn(message["role"], message["content"])
         self.api_key = api_key
         self.model = None
+        # LLM answers are shared across sessions unless a cache is passed in.
+        self.response_cache = response_cache or get_shared_response_cache()
         
         if self.api_key:
             try:
-                genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel('gemini-2.5-flash-lite')
+                # Shared, rate-limited client: sessions with the same key reuse it.
+                self.model = get_model_pool().get(self.api_key, MODEL_NAME)
             except Exception as e:
                 print(f"Error configuring Gemini API: {e}")
                 self.model = None
 
-        # Fallback Knowledge Base
-        self.knowledge_base = {
-            "budget": "💡 **Budgeting** is creating a plan for your money. It helps you balance income and expenses so you don't overspend. Try the 50/30/20 rule: 50% needs, 30% wants, 20% savings!",
-            "saving": "💰 **Saving** means setting aside money for future goals. Start small! Even saving $10 a week adds up. Try automating transfers to a savings account.",
-            "expense": "📉 **Expense tracking** is recording every purchase. Use apps or a simple notebook. Knowing where your money goes is the first step to controlling it.",
-            "goal": "🎯 **Goal-based planning** means saving for specific things (like a laptop or trip). Set a target amount and a deadline, then break it down into monthly savings targets.",
-            "emergency": "🚨 An **emergency fund** is money saved for unexpected costs like car repairs or medical bills. Aim for $500-$1000 to start.",
-            "student": "🎓 **Student Tip**: Take advantage of student discounts! Always carry your ID. Buy used textbooks, cook at home, and use campus resources."
-        }
+        # Offline answers and restricted topics are shared with FinancialLiteracyAgent.
+        self.knowledge_base = KNOWLEDGE_BASE
+        self.matcher = DEFAULT_MATCHER
+
+    def _check_guardrails(self, matches):
+        """Returns the refusal message if the query touches a restricted topic."""
+        return REFUSAL_MESSAGE if matches["restricted"] else None
+
+    def _offline_answer(self, query, matches):
+        # Best BM25 match from the tips corpus, then the keyword answers.
+        hits = get_default_index().search(query, k=1)
+        if hits:
+            return hits[0][1]["text"]
+        if matches["knowledge"]:
+            return self.knowledge_base[matches["knowledge"][0]]
+        return "🤔 I can help you with budgeting, saving, and tracking expenses. (Add an API Key for smarter answers!)"
+
+    def _cache_key(self, query):
+        # The answer depends on the question and the profile sent as context.
+        return f"{normalize_query(query)}|{context_hash(MODEL_NAME, self.memory.get_profile())}"
+
+    def _build_prompt(self, query, exclude_turn=None):
+        # System Prompt for Guardrails and Persona
+        system_instruction = """
+        You are Smart Budget Buddy, an AI financial literacy assistant specifically designed for students.
+        Your goal is to teach budgeting, saving, and responsible money habits.
+        
+        STRICT GUARDRAILS:
+        1. You MUST NOT give investment advice (stocks, crypto, trading).
+        2. You MUST NOT recommend specific loans, credit cards, or debt products.
+        3. You MUST NOT discuss gambling, politics, adult content, hacking, or illegal acts.
+        4. You MUST NOT give medical, legal, or mental health advice.
+        5. If asked about restricted topics, reply EXACTLY: "I'm here only to help with student budgeting and financial literacy. I cannot assist with that topic."
+        6. Keep answers short, crisp, clear, and student-friendly.
+        7. Use emojis to be engaging.
+        
+        AVAILABLE TOOLS:
+        - If the user asks to calculate a budget, you can suggest they use the Budget Planner tool in the sidebar.
+        - If the user asks about their past data, you can mention you have access to their profile.
+        """
         
-        # Strict Restricted Topics
-        self.restricted_topics = [
-            "stock", "invest", "crypto", "bitcoin", "loan", "credit card", "borrow", "trading", 
-            "mutual fund", "bond", "debt", "gamble", "gambling", "betting", "casino", 
-            "politics", "political", "election", "vote", "hack", "hacking", "illegal", 
-            "drug", "weapon", "adult", "sex", "porn", "medical", "doctor", "lawyer", "legal"
-        ]
+        # Profile, latest and most relevant turns, packed under the token budget
+        context_str = self.context.build(query, self.memory.get_profile(), exclude_turn=exclude_turn)
+        
+        full_prompt = f"{system_instruction}\n\nContext:\n{context_str}\n\nUser Query: {query}"
+        return full_prompt
 
+    @traced("FinancialLiteracyChatBot.ask")
     def ask(self, query):
         """
         Processes a user query. Uses LLM if available, otherwise falls back to keyword matching.
         """
         # Save user message to memory
-        self.memory.add_chat_message("user", query)
+        query_turn = self._add_message("user", query)
+
+        matches = self.matcher.match(query)
         
         # 1. LLM Response (if API Key is valid)
         if self.model:
+            # The model's system prompt enforces the guardrails online; a
+            # flagged query only skips the shared cache, so no cached answer
+            # is served for (or stored from) it.
+            cache_key = None if self._check_guardrails(matches) else self._cache_key(query)
+            cached = self.response_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                self._add_message("assistant", cached)
+                return cached
+
             try:
-                # System Prompt for Guardrails and Persona
-                system_instruction = """
-                You are Smart Budget Buddy, an AI financial literacy assistant specifically designed for students.
-                Your goal is to teach budgeting, saving, and responsible money habits.
-                
-                STRICT GUARDRAILS:
-                1. You MUST NOT give investment advice (stocks, crypto, trading).
-                2. You MUST NOT recommend specific loans, credit cards, or debt products.
-                3. You MUST NOT discuss gambling, politics, adult content, hacking, or illegal acts.
-                4. You MUST NOT give medical, legal, or mental health advice.
-                5. If asked about restricted topics, reply EXACTLY: "I'm here only to help with student budgeting and financial literacy. I cannot assist with that topic."
-                6. Keep answers short, crisp, clear, and student-friendly.
-                7. Use emojis to be engaging.
-                
-                AVAILABLE TOOLS:
-                - If the user asks to calculate a budget, you can suggest they use the Budget Planner tool in the sidebar.
-                - If the user asks about their past data, you can mention you have access to their profile.
-                """
-                
-                # Fetch context from memory
-                profile = self.memory.get_profile()
-                history = self.memory.get_history()[-5:] # Last 5 messages for context
-                
-                context_str = f"User Profile: {json.dumps(profile)}\nRecent History: {json.dumps(history)}"
-                
-                full_prompt = f"{system_instruction}\n\nContext:\n{context_str}\n\nUser Query: {query}"
-                
+                full_prompt = self._build_prompt(query, exclude_turn=query_turn)
                 response_obj = self.model.generate_content(full_prompt)
                 response = response_obj.text
+                if cache_key:
+                    self.response_cache.put(cache_key, response)
                 
                 # Save assistant response to memory
-                self.memory.add_chat_message("assistant", response)
+                self._add_message("assistant", response)
                 return response
             except Exception as e:
                 return f"⚠️ API Error: {e}. Switching to offline mode."
 
-        # 2. Fallback Logic (Offline Mode)
-        query_lower = query.lower()
-        
-        # Guardrails check for offline mode
-        for topic in self.restricted_topics:
-            if topic in query_lower:
-                response = "I'm here only to help with student budgeting and financial literacy. I cannot assist with that topic."
-                self.memory.add_chat_message("assistant", response)
-                return response
+        # 2. Fallback Logic (Offline Mode): keyword guardrails, then offline answers
+        response = self._check_guardrails(matches) or self._offline_answer(query, matches)
+        self._add_message("assistant", response)
+        return response
 
-        response = None
-        for key, value in self.knowledge_base.items():
-            if key in query_lower:
-                response = value
-                break
-        
-        if not response:
-            response = "🤔 I can help you with budgeting, saving, and tracking expenses. (Add an API Key for smarter answers!)"
+    async def ask_stream_async(self, query, timeout=STREAM_TIMEOUT_SECONDS):
+        """
+        Async variant of ask() that yields the answer in chunks as they arrive.
 
-        self.memory.add_chat_message("assistant", response)
-        return response
+        Both chat messages are written to memory once, after the last chunk.
+        If the consumer cancels (or closes the generator) nothing is recorded;
+        on timeout the partial answer is kept with a notice appended.
+        """
+        # Deferred with the rest of the streaming path: asyncio is slow to import.
+        import asyncio
+        from contextlib import aclosing
+        from ..utils.llm_stream import stream_text
+
+        if not self.model:
+            # Offline answers are instant; ask() already records them.
+            yield self.ask(query)
+            return
+
+        # As in ask(): flagged queries go to the model but bypass the cache.
+        cache_key = None if self._check_guardrails(self.matcher.match(query)) else self._cache_key(query)
+        cached = self.response_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            yield cached
+            self._record_exchange(query, cached)
+            return
+
+        full_prompt = self._build_prompt(query)
+        chunks = []
+        try:
+            async with aclosing(stream_text(self.model, full_prompt, timeout=timeout)) as stream:
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    yield chunk
+        except asyncio.TimeoutError:
+            notice = "\n\n⏱️ The answer took too long and was cut short."
+            chunks.append(notice)
+            yield notice
+            self._record_exchange(query, "".join(chunks))
+            return
+        except Exception as e:
+            error = f"⚠️ API Error: {e}. Switching to offline mode."
+            yield error
+            return
+
+        response = "".join(chunks)
+        if cache_key:
+            self.response_cache.put(cache_key, response)
+        self._record_exchange(query, response)
+
+    def ask_stream(self, query, timeout=STREAM_TIMEOUT_SECONDS):
+        """Synchronous generator over ask_stream_async() for st.write_stream."""
+        from ..utils.llm_stream import iterate_sync
+        return iterate_sync(self.ask_stream_async(query, timeout=timeout))
+
+    def _record_exchange(self, query, response):
+        self._add_message("user", query)
+        self._add_message("assistant", response)
+
+    def _add_message(self, role, content):
+        self.memory.add_chat_message(role, content)
+        return self.context.add_turn(role, content)
 
     def get_history(self):
         # Return history formatted for Streamlit
@@ -111,3 +187,4 @@ class FinancialLiteracyChatBot:
 
     def clear_history(self):
         self.memory.clear_history()
+        self.context.clear()
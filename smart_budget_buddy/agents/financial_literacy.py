@@ -1,4 +1,9 @@
-import google.generativeai as genai
+from .guardrails import DEFAULT_MATCHER, KNOWLEDGE_BASE
+from ..utils.knowledge_index import get_default_index
+from ..utils.instrumentation import traced
+from ..utils.llm_client import get_model_pool
+
+STREAM_TIMEOUT_SECONDS = 30
 
 class FinancialLiteracyAgent:
     def __init__(self, api_key=None):
@@ -8,23 +13,34 @@ class FinancialLiteracyAgent:
         
         if self.api_key:
             try:
-                genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel('gemini-pro')
+                # Shared, rate-limited client: sessions with the same key reuse it.
+                self.model = get_model_pool().get(self.api_key, 'gemini-pro')
             except Exception as e:
                 print(f"Error configuring Gemini API: {e}")
                 self.model = None
 
-        # Fallback Knowledge Base
-        self.knowledge_base = {
-            "budget": "💡 **Budgeting** is creating a plan for your money. It helps you balance income and expenses so you don't overspend. Try the 50/30/20 rule: 50% needs, 30% wants, 20% savings!",
-            "saving": "💰 **Saving** means setting aside money for future goals. Start small! Even saving $10 a week adds up. Try automating transfers to a savings account.",
-            "expense": "📉 **Expense tracking** is recording every purchase. Use apps or a simple notebook. Knowing where your money goes is the first step to controlling it.",
-            "goal": "🎯 **Goal-based planning** means saving for specific things (like a laptop or trip). Set a target amount and a deadline, then break it down into monthly savings targets.",
-            "emergency": "🚨 An **emergency fund** is money saved for unexpected costs like car repairs or medical bills. Aim for $500-$1000 to start.",
-            "student": "🎓 **Student Tip**: Take advantage of student discounts! Always carry your ID. Buy used textbooks, cook at home, and use campus resources."
-        }
-        self.restricted_topics = ["stock", "invest", "crypto", "bitcoin", "loan", "credit card", "borrow", "trading", "mutual fund", "bond", "debt"]
+        # Offline answers and restricted topics are shared with FinancialLiteracyChatBot.
+        self.knowledge_base = KNOWLEDGE_BASE
+        self.matcher = DEFAULT_MATCHER
+
+    def _build_prompt(self, query):
+        # System Prompt for Guardrails
+        system_instruction = """
+        You are Smart Budget Buddy, a helpful AI assistant for students.
+        Your goal is to teach financial literacy, budgeting, and saving tips.
+        
+        STRICT GUARDRAILS:
+        1. You MUST NOT give investment advice (stocks, crypto, trading).
+        2. You MUST NOT recommend specific loans, credit cards, or debt products.
+        3. If asked about restricted topics, politely decline and steer back to budgeting/saving.
+        4. Keep answers short, encouraging, and student-friendly.
+        5. Use emojis to be engaging.
+        """
+        
+        full_prompt = f"{system_instruction}\n\nUser Query: {query}"
+        return full_prompt
 
+    @traced("FinancialLiteracyAgent.ask")
     def ask(self, query):
         """
         Processes a user query. Uses LLM if available, otherwise falls back to keyword matching.
@@ -34,20 +50,7 @@ class FinancialLiteracyAgent:
         # 1. LLM Response (if API Key is valid)
         if self.model:
             try:
-                # System Prompt for Guardrails
-                system_instruction = """
-                You are Smart Budget Buddy, a helpful AI assistant for students.
-                Your goal is to teach financial literacy, budgeting, and saving tips.
-                
-                STRICT GUARDRAILS:
-                1. You MUST NOT give investment advice (stocks, crypto, trading).
-                2. You MUST NOT recommend specific loans, credit cards, or debt products.
-                3. If asked about restricted topics, politely decline and steer back to budgeting/saving.
-                4. Keep answers short, encouraging, and student-friendly.
-                5. Use emojis to be engaging.
-                """
-                
-                full_prompt = f"{system_instruction}\n\nUser Query: {query}"
+                full_prompt = self._build_prompt(query)
                 response_obj = self.model.generate_content(full_prompt)
                 response = response_obj.text
                 
@@ -57,22 +60,15 @@ class FinancialLiteracyAgent:
                 return f"⚠️ API Error: {e}. Switching to offline mode."
 
         # 2. Fallback Logic (Offline Mode)
-        query_lower = query.lower()
-        
-        # Guardrails check for offline mode
-        for topic in self.restricted_topics:
-            if topic in query_lower:
-                response = "🚫 Sorry, I only assist with student budget management. I cannot provide advice on investments or loans."
-                self.history.append({"role": "assistant", "content": response})
-                return response
-
-        response = None
-        for key, value in self.knowledge_base.items():
-            if key in query_lower:
-                response = value
-                break
-        
-        if not response:
+        matches = self.matcher.match(query)
+        hits = None if matches["restricted"] else get_default_index().search(query, k=1)
+        if matches["restricted"]:
+            response = "🚫 Sorry, I only assist with student budget management. I cannot provide advice on investments or loans."
+        elif hits:
+            response = hits[0][1]["text"]
+        elif matches["knowledge"]:
+            response = self.knowledge_base[matches["knowledge"][0]]
+        else:
             response = "🤔 I can help you with budgeting, saving, and tracking expenses. (Add an API Key for smarter answers!)"
 
         self.history.append({"role": "assistant", "content": response})
@@ -93,3 +89,40 @@ class FinancialLiteracyAgent:
 
     def clear_history(self):
         self.history = []
+
+    async def ask_stream_async(self, query, timeout=STREAM_TIMEOUT_SECONDS):
+        """
+        Async variant of ask() that yields the answer in chunks as they arrive.
+
+        History is updated once, after the last chunk; a cancelled stream
+        leaves it untouched.
+        """
+        import asyncio
+        from contextlib import aclosing
+        from ..utils.llm_stream import stream_text
+
+        if not self.model:
+            yield self.ask(query)
+            return
+
+        chunks = []
+        try:
+            async with aclosing(stream_text(self.model, self._build_prompt(query), timeout=timeout)) as stream:
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    yield chunk
+        except asyncio.TimeoutError:
+            notice = "\n\n⏱️ The answer took too long and was cut short."
+            chunks.append(notice)
+            yield notice
+        except Exception as e:
+            yield f"⚠️ API Error: {e}. Switching to offline mode."
+            return
+
+        self.history.append({"role": "user", "content": query})
+        self.history.append({"role": "assistant", "content": "".join(chunks)})
+
+    def ask_stream(self, query, timeout=STREAM_TIMEOUT_SECONDS):
+        """Synchronous generator over ask_stream_async() for st.write_stream."""
+        from ..utils.llm_stream import iterate_sync
+        return iterate_sync(self.ask_stream_async(query, timeout=timeout))
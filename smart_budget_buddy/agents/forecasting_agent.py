@@ -1,31 +1,100 @@
-import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
+from ..utils.instrumentation import traced
+
+
+def _as_matrix(series):
+    # One series per row, padded with NaN.
+    if isinstance(series, np.ndarray) and series.ndim == 2:
+        return series.astype(float)
+    rows = [np.asarray(s, dtype=float) for s in series]
+    width = max((len(r) for r in rows), default=0)
+    y = np.full((len(rows), width), np.nan)
+    for i, r in enumerate(rows):
+        y[i, :len(r)] = r
+    return y
+
+
+def fit_linear_trends(series):
+    """
+    Ordinary least-squares line through each series, all fitted at once.
+
+    `series` is a 2-D array (one series per row) or a list of 1-D arrays of
+    any length; shorter rows are padded with NaN, and NaN points are skipped.
+    Point i of a series sits at x = i, as with month_num in
+    predict_next_month(). Returns (slope, intercept, n_points) arrays with one
+    entry per series.
+    """
+    return _fit(_as_matrix(series))
+
+
+def _fit(y):
+    mask = ~np.isnan(y)
+    n = mask.sum(axis=1)
+    x = np.broadcast_to(np.arange(y.shape[1], dtype=float), y.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = np.where(mask, x, 0).sum(axis=1) / n
+        y_mean = np.where(mask, y, 0).sum(axis=1) / n
+        dx = np.where(mask, x - x_mean[:, None], 0)
+        dy = np.where(mask, y - y_mean[:, None], 0)
+        slope = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+    intercept = y_mean - slope * x_mean
+    return slope, intercept, n
+
+
+def predict_many(series):
+    """
+    Next-point forecasts for many series in one vectorized fit, each in the
+    same format as ForecastingAgent.predict_next_month().
+    """
+    y = _as_matrix(series)
+    slope, intercept, n = _fit(y)
+    # The next point follows the last real one, wherever padding or gaps sit.
+    finite = ~np.isnan(y)
+    next_x = (finite * np.arange(1, y.shape[1] + 1)).max(axis=1, initial=0)
+    predicted = np.round(intercept + slope * next_x, 2).tolist()
+    increasing = (slope > 0).tolist()
+    results = []
+    for i, count in enumerate(n.tolist()):
+        if count < 2:
+            first = float(y[i][finite[i]][0]) if count > 0 else 0
+            results.append({"prediction": first, "note": "Not enough data for regression"})
+        else:
+            results.append({
+                "predicted_spending": predicted[i],
+                "trend": "increasing" if increasing[i] else "decreasing"
+            })
+    return results
+
 
 class ForecastingAgent:
-    def __init__(self, transactions_df):
+    def __init__(self, transactions_df, monthly_spending=None):
         self.df = transactions_df
+        # Optional precomputed monthly totals (e.g. SpendingAnalyzerAgent.monthly_totals())
+        # so the raw transactions don't have to be grouped again.
+        self.monthly_spending = monthly_spending
 
+    @traced("ForecastingAgent.predict_next_month", rows=lambda result, self: len(self.df))
     def predict_next_month(self):
         """
         Predicts next month's spending using Linear Regression on monthly totals.
         """
-        monthly_spending = self.df.groupby(self.df['date'].dt.to_period('M'))['amount'].sum().reset_index()
-        monthly_spending['month_num'] = np.arange(len(monthly_spending))
-        
-        if len(monthly_spending) < 2:
-            return {"prediction": monthly_spending['amount'].iloc[0] if len(monthly_spending) > 0 else 0, "note": "Not enough data for regression"}
-
-        X = monthly_spending[['month_num']]
-        y = monthly_spending['amount']
-        
-        model = LinearRegression()
-        model.fit(X, y)
-        
-        next_month_num = monthly_spending['month_num'].max() + 1
-        prediction = model.predict([[next_month_num]])[0]
-        
-        return {
-            "predicted_spending": round(prediction, 2),
-            "trend": "increasing" if model.coef_[0] > 0 else "decreasing"
-        }
+        if self.monthly_spending is not None:
+            monthly_spending = self.monthly_spending
+        else:
+            from ..utils.data_loader import amounts_float64
+            amounts = amounts_float64(self.df['amount'])
+            monthly_spending = amounts.groupby(self.df['date'].dt.to_period('M')).sum()
+
+        return predict_many([monthly_spending.to_numpy(dtype=float)])[0]
+
+    def predict_by_category(self):
+        """
+        Predicts next month's spending for every category with one batched fit.
+        Months without spending in a category count as zero for that category.
+        """
+        from ..utils.data_loader import amounts_float64
+        amounts = amounts_float64(self.df['amount'])
+        monthly = amounts.groupby([self.df['date'].dt.to_period('M'), self.df['category']], observed=True).sum()
+        table = monthly.unstack('category', fill_value=0)
+        forecasts = predict_many(table.to_numpy(dtype=float).T)
+        return dict(zip(table.columns, forecasts))
@@ -0,0 +1,113 @@
+import re
+
+# Offline answers, checked in this order when a query mentions several keys.
+KNOWLEDGE_BASE = {
+    "budget": "💡 **Budgeting** is creating a plan for your money. It helps you balance income and expenses so you don't overspend. Try the 50/30/20 rule: 50% needs, 30% wants, 20% savings!",
+    "saving": "💰 **Saving** means setting aside money for future goals. Start small! Even saving $10 a week adds up. Try automating transfers to a savings account.",
+    "expense": "📉 **Expense tracking** is recording every purchase. Use apps or a simple notebook. Knowing where your money goes is the first step to controlling it.",
+    "goal": "🎯 **Goal-based planning** means saving for specific things (like a laptop or trip). Set a target amount and a deadline, then break it down into monthly savings targets.",
+    "emergency": "🚨 An **emergency fund** is money saved for unexpected costs like car repairs or medical bills. Aim for $500-$1000 to start.",
+    "student": "🎓 **Student Tip**: Take advantage of student discounts! Always carry your ID. Buy used textbooks, cook at home, and use campus resources."
+}
+
+# Topics both chat agents refuse to discuss.
+RESTRICTED_TOPICS = (
+    "stock", "invest", "crypto", "bitcoin", "loan", "credit card", "borrow", "trading",
+    "mutual fund", "bond", "debt", "gamble", "gambling", "betting", "casino",
+    "politics", "political", "election", "vote", "hack", "hacking", "illegal",
+    "drug", "weapon", "adult", "sex", "porn", "medical", "doctor", "lawyer", "legal advice"
+)
+
+# Other forms of a term that count as the term itself. Terms match whole
+# words only, so "invest" covers "investing" but not "investigate".
+INFLECTIONS = {
+    "stock": ("stocks",),
+    "invest": ("invests", "invested", "investing", "investment", "investments", "investor", "investors"),
+    "crypto": ("cryptocurrency", "cryptocurrencies"),
+    "bitcoin": ("bitcoins",),
+    "loan": ("loans",),
+    "credit card": ("credit cards",),
+    "borrow": ("borrows", "borrowed", "borrowing"),
+    "trading": ("trader", "traders"),
+    "mutual fund": ("mutual funds",),
+    "bond": ("bonds",),
+    "debt": ("debts",),
+    "gamble": ("gambles", "gambled", "gambler", "gamblers"),
+    "casino": ("casinos",),
+    "politics": ("politician", "politicians"),
+    "election": ("elections",),
+    "vote": ("votes", "voted", "voting"),
+    "hack": ("hacks", "hacked", "hacker", "hackers"),
+    "drug": ("drugs",),
+    "weapon": ("weapons",),
+    "porn": ("porno", "pornography"),
+    "doctor": ("doctors",),
+    "lawyer": ("lawyers",),
+    "budget": ("budgets", "budgeted", "budgeting"),
+    "saving": ("save", "saves", "saved", "savings"),
+    "expense": ("expenses",),
+    "goal": ("goals",),
+    "emergency": ("emergencies",),
+    "student": ("students",),
+}
+
+_SPACES = re.compile(r"\s+")
+
+
+def _trie_pattern(node):
+    # Factor shared prefixes so the regex engine branches per character,
+    # not per term: matching cost no longer grows with the number of terms.
+    branches = []
+    for ch, child in sorted((k, v) for k, v in node.items() if k):
+        branches.append((r"\s+" if ch == " " else re.escape(ch)) + _trie_pattern(child))
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # A term ending here may be extended by a longer one; the longest wins.
+    return "(?:" + body + ")?" if "" in node else body
+
+
+def compile_terms(terms):
+    """One regex matching any of `terms` as whole words."""
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in _SPACES.sub(" ", term.lower().strip()):
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return re.compile(r"\b" + _trie_pattern(trie) + r"\b")
+
+
+class TopicMatcher:
+    """
+    Finds restricted topics and knowledge keys in a query in a single pass.
+
+    Terms match whole words, plus the forms listed for them in
+    `inflections`: "bonds" and "investing" hit "bond" and "invest", while
+    "vagabond" and "investigate" do not. Whitespace inside multi-word terms
+    ("credit card") is flexible. Results keep the order the terms were given
+    in, which is their priority.
+    """
+
+    def __init__(self, restricted_topics=RESTRICTED_TOPICS, knowledge_keys=KNOWLEDGE_BASE, inflections=INFLECTIONS):
+        self.restricted_rank = {t: i for i, t in enumerate(restricted_topics)}
+        self.knowledge_rank = {k: i for i, k in enumerate(knowledge_keys)}
+        # Every matchable form -> the term it stands for.
+        self.canonical = {}
+        for term in list(self.restricted_rank) + list(self.knowledge_rank):
+            for form in (term,) + tuple(inflections.get(term, ())):
+                self.canonical.setdefault(form, term)
+        self.pattern = compile_terms(self.canonical)
+
+    def match(self, query):
+        found = set()
+        for m in self.pattern.finditer(query.lower()):
+            found.add(self.canonical[_SPACES.sub(" ", m.group())])
+        return {
+            "restricted": sorted(found.intersection(self.restricted_rank), key=self.restricted_rank.get),
+            "knowledge": sorted(found.intersection(self.knowledge_rank), key=self.knowledge_rank.get)
+        }
+
+
+# Built once at import and shared by both chat agents.
+DEFAULT_MATCHER = TopicMatcher()
@@ -1,27 +1,138 @@
 import pandas as pd
+from ..utils.instrumentation import traced
 
 class SpendingAnalyzerAgent:
-    def __init__(self, transactions_df):
+    """
+    Keeps running per-(day, category), per-category, per-day and per-month
+    sums and counts of the transactions it has seen. The DataFrame passed in
+    is aggregated on first use; later batches can be added with `ingest()`
+    at a cost proportional to the batch, not the history.
+
+    While every amount is a whole number of cents the sums are kept in
+    (integer-valued float) cents, which add exactly in any order, so
+    ingesting in batches gives bit-for-bit the same analysis as one pass.
+    The first amount with finer precision switches the state to plain
+    float sums.
+    """
+
+    def __init__(self, transactions_df=None):
         self.df = transactions_df
+        self._loaded = False
+        self._total = 0.0
+        self._rows = 0
+        self._cells = {}       # (day, category) -> [sum, count]
+        self._categories = {}  # category -> [sum, count]
+        self._days = {}        # day -> [sum, count]
+        self._months = {}      # month period -> [sum, count]
+        self._scale = 100      # 100 while sums are held in cents, else 1
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self._loaded = True
+            if self.df is not None:
+                self._accumulate(self.df)
+
+    @staticmethod
+    def _add(totals, key, amount, count):
+        entry = totals.get(key)
+        if entry is None:
+            totals[key] = [amount, count]
+        else:
+            entry[0] += amount
+            entry[1] += count
+
+    def _drop_to_float(self):
+        for totals in (self._cells, self._categories, self._days, self._months):
+            for entry in totals.values():
+                entry[0] /= self._scale
+        self._total /= self._scale
+        self._scale = 1
+
+    def _accumulate(self, batch):
+        raw = batch['amount']
+        amounts = raw.astype(float)
+        if self._scale != 1:
+            cents = (amounts * 100).round()
+            # Compared in the column's own dtype so float32 cents still qualify.
+            if (((cents / 100).astype(raw.dtype) == raw) | raw.isna()).all():
+                amounts = cents
+            else:
+                self._drop_to_float()
+        self._total += amounts.sum()
+        self._rows += len(batch)
+
+        day = batch['date'].dt.normalize().rename('day')
+        cells = amounts.groupby([day, batch['category']], dropna=False, observed=True).agg(['sum', 'count'])
+        days = cells.index.get_level_values('day')
+        months = days.to_period('M')
+        categories = cells.index.get_level_values('category')
+        for d, m, c, amount, count in zip(days, months, categories, cells['sum'], cells['count']):
+            # Rows missing a category still belong to their day and month,
+            # and undated rows still belong to their category.
+            if pd.isna(c):
+                c = None
+            else:
+                self._add(self._categories, c, amount, count)
+            if pd.isna(d):
+                continue
+            self._add(self._cells, (d, c), amount, count)
+            self._add(self._days, d, amount, count)
+            self._add(self._months, m, amount, count)
+
+    def ingest(self, transactions_df):
+        """
+        Adds a batch of new transactions (same columns as the initial
+        DataFrame) to the running totals. The raw rows are not retained.
+        """
+        self._ensure_loaded()
+        self._accumulate(transactions_df)
+
+    def aggregate(self):
+        """The day x category cube of sums and counts every view is projected from."""
+        self._ensure_loaded()
+        keys = sorted(self._cells, key=lambda k: (k[0], k[1] is None, k[1] or ''))
+        index = pd.MultiIndex.from_tuples(keys, names=['day', 'category'])
+        values = [self._cells[key] for key in keys]
+        cube = pd.DataFrame(values, index=index, columns=['sum', 'count'])
+        cube['sum'] /= self._scale
+        return cube
+
+    def _series(self, totals, name):
+        sums = {key: entry[0] / self._scale for key, entry in totals.items()}
+        return pd.Series(sums, dtype=float).sort_index().rename_axis(name)
+
+    def category_totals(self):
+        self._ensure_loaded()
+        return self._series(self._categories, 'category')
+
+    def daily_totals(self):
+        self._ensure_loaded()
+        return self._series(self._days, 'day')
+
+    def monthly_totals(self):
+        self._ensure_loaded()
+        return self._series(self._months, 'month')
 
+    @traced("SpendingAnalyzerAgent.analyze", rows=lambda result, self: self._rows)
     def analyze(self):
         """
         Analyzes spending patterns.
         """
         # Group by category
-        category_spending = self.df.groupby('category')['amount'].sum().to_dict()
+        category_totals = self.category_totals()
+        category_spending = category_totals.to_dict()
         
         # Daily spending
-        daily_spending = self.df.groupby(self.df['date'].dt.date)['amount'].sum()
+        daily_spending = self.daily_totals()
         
         # Monthly spending
-        monthly_spending = self.df.groupby(self.df['date'].dt.to_period('M'))['amount'].sum()
+        monthly_spending = self.monthly_totals()
         
         # Top categories
-        top_categories = self.df.groupby('category')['amount'].sum().sort_values(ascending=False).head(5).to_dict()
+        top_categories = category_totals.sort_values(ascending=False).head(5).to_dict()
         
         return {
-            "total_spent": self.df['amount'].sum(),
+            "total_spent": self._total / self._scale,
             "category_breakdown": category_spending,
             "average_daily_spending": daily_spending.mean(),
             "monthly_spending": {str(k): v for k, v in monthly_spending.items()},
@@ -0,0 +1,204 @@
+import csv
+import math
+import os
+import re
+import time
+from datetime import date, datetime
+
+from .alerts_agent import NEAR_LIMIT_RATIO, budget_category
+
+LEVELS = ('near_limit', 'over_limit')
+
+# Year and month of an ISO-like stamp such as '2022-07-06 05:57:10 +0000'.
+_ISO_MONTH = re.compile(r'\s*(\d{4})-(0[1-9]|1[0-2])(?:-\d{2})?(?:[ T]|$)')
+
+
+def period_key(value):
+    """
+    'YYYY-MM' for a datetime/date or an ISO-like string such as
+    '2022-07-06 05:57:10 +0000' (the local month, as read_transactions()
+    keeps it). Other strings, e.g. '07/06/2022', raise ValueError.
+    """
+    if isinstance(value, (datetime, date)):
+        return f"{value.year:04d}-{value.month:02d}"
+    match = _ISO_MONTH.match(str(value))
+    if match is None:
+        raise ValueError(f"Not an ISO date: {value!r}")
+    return f"{match.group(1)}-{match.group(2)}"
+
+
+class StreamingAlertEvaluator:
+    """
+    Evaluates budget alerts one transaction at a time.
+
+    Keeps, per (user, month), the running spend and the highest alert level
+    already raised for each budget category, so an alert is emitted exactly
+    once, on the transaction that crosses 90% or 100% of the limit. Work per
+    event is a few dict lookups; nothing is re-aggregated.
+
+    `category_limits` is BudgetPlannerAgent's `category_limits`; `user_limits`
+    optionally overrides it per user id.
+    """
+
+    def __init__(self, category_limits, user_limits=None, near_ratio=NEAR_LIMIT_RATIO, user_field='student_id'):
+        self.category_limits = category_limits
+        self.user_limits = user_limits or {}
+        self.near_ratio = near_ratio
+        self.user_field = user_field
+        self._state = {}      # (user, period) -> {budget_category: [spent, level_index]}
+        self._mapping = {}    # raw category -> budget category (or None if unbudgeted)
+        self.events = 0
+
+    def _budget_category(self, raw):
+        mapped = self._mapping.get(raw, False)
+        if mapped is False:
+            mapped = budget_category(raw, self.category_limits)
+            if mapped not in self.category_limits:
+                mapped = None  # e.g. transportation, budgeted as a fixed cost
+            self._mapping[raw] = mapped
+        return mapped
+
+    def push(self, transaction):
+        """
+        Adds one transaction (a dict with date, category, amount and optionally
+        the user field) and returns the alerts it triggered, usually none.
+        """
+        self.events += 1
+        category = self._budget_category(transaction['category'])
+        if category is None:
+            return []
+        user = transaction.get(self.user_field)
+        limits = self.user_limits.get(user, self.category_limits)
+        limit = limits.get(category)
+        if limit is None:
+            return []
+
+        key = (user, period_key(transaction['date']))
+        categories = self._state.get(key)
+        if categories is None:
+            categories = self._state[key] = {}
+        entry = categories.get(category)
+        if entry is None:
+            entry = categories[category] = [0.0, -1]
+        entry[0] += float(transaction['amount'])
+
+        spent = entry[0]
+        if spent > limit:
+            level = 1
+        elif spent > limit * self.near_ratio:
+            level = 0
+        else:
+            return []
+        if level <= entry[1]:
+            return []
+        entry[1] = level
+        return [self._alert(user, key[1], category, spent, limit, LEVELS[level])]
+
+    def _alert(self, user, period, category, spent, limit, level):
+        label = "Overspending" if level == 'over_limit' else "Near limit"
+        return {
+            "user": user,
+            "period": period,
+            "category": category,
+            "spent": spent,
+            "limit": limit,
+            "level": level,
+            "message": f"⚠️ {label} in {category} ({period}): Spent ${spent:.2f} vs Limit ${limit:.2f}"
+        }
+
+    def push_many(self, transactions):
+        """Processes a micro-batch and returns all alerts it triggered, in order."""
+        alerts = []
+        for transaction in transactions:
+            alerts.extend(self.push(transaction))
+        return alerts
+
+    def consume(self, transactions):
+        """Yields alerts as they fire while draining any iterable of transactions."""
+        for transaction in transactions:
+            yield from self.push(transaction)
+
+    async def consume_queue(self, queue):
+        """
+        Async generator over an asyncio.Queue of transactions or lists of
+        transactions (micro-batches). A `None` item ends the stream.
+        """
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                batch = item if isinstance(item, list) else [item]
+                for alert in self.push_many(batch):
+                    yield alert
+            finally:
+                queue.task_done()
+
+    def drop_periods_before(self, period):
+        """Forgets state for months earlier than `period` ('YYYY-MM')."""
+        for key in [k for k in self._state if k[1] < period]:
+            del self._state[key]
+
+    def spent(self, user=None, period=None):
+        """Running spend per budget category for one user and month."""
+        return {c: entry[0] for c, entry in self._state.get((user, period), {}).items()}
+
+
+def _clean_row(row):
+    """The row with a float amount, or None if its amount or date is unusable."""
+    try:
+        if 'amount' in row:
+            row['amount'] = float(row['amount'])
+            if not math.isfinite(row['amount']):
+                return None
+        if 'date' in row:
+            period_key(row['date'])
+    except (TypeError, ValueError):
+        return None
+    return row
+
+
+def tail_csv(path, follow=True, from_start=True, poll_interval=0.25, stop_event=None, bad_rows=None):
+    """
+    Yields rows of a growing transactions CSV as dicts with normalized column
+    names and float amounts, like `tail -f`. With follow=False it stops at
+    end of file. Partial last lines are held back until their newline lands.
+    Rows with a missing or non-numeric amount or a non-ISO date are skipped;
+    pass a list as `bad_rows` to collect their raw lines.
+    """
+    with open(path, 'r', newline='') as f:
+        header = f.readline()
+        fields = [c.strip().lower().replace(" ", "_") for c in next(csv.reader([header]))]
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        pending = ''
+        while stop_event is None or not stop_event.is_set():
+            line = f.readline()
+            if not line:
+                if not follow:
+                    break
+                time.sleep(poll_interval)
+                continue
+            pending += line
+            if not pending.endswith('\n'):
+                continue
+            line, pending = pending, ''
+            row = _clean_row(dict(zip(fields, next(csv.reader([line]), []))))
+            if row is None:
+                if bad_rows is not None:
+                    bad_rows.append(line)
+                continue
+            yield row
+
+
+async def queue_from_iterable(transactions, queue, batch_size=1):
+    """Feeds an asyncio.Queue from an iterable (in micro-batches), then sends None."""
+    batch = []
+    for transaction in transactions:
+        batch.append(transaction)
+        if len(batch) >= batch_size:
+            await queue.put(batch if batch_size > 1 else batch[0])
+            batch = []
+    if batch:
+        await queue.put(batch)
+    await queue.put(None)
@@ -1,12 +1,25 @@
+import copy
 import json
-import pandas as pd
+import os
+import threading
 from .budget_planner import BudgetPlannerAgent
 from .spending_analyzer import SpendingAnalyzerAgent
 from ..utils.memory_store import MemoryStore
-from ..utils.data_loader import DataLoader
+from ..utils.data_loader import DataLoader, read_transactions
+from ..utils.result_cache import ResultCache, content_hash
+
+# Created on first use, not at import.
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_memory():
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            _memory = MemoryStore()
+        return _memory
 
-# Initialize Memory Store
-memory = MemoryStore()
 
 def calculate_budget_tool(income, fixed_expenses, variable_expenses=None):
     """
@@ -16,7 +29,7 @@ def calculate_budget_tool(income, fixed_expenses, variable_expenses=None):
         fixed_expenses (dict): Dictionary of fixed expenses (e.g., {'rent': 500}).
         variable_expenses (dict, optional): Dictionary of variable expenses.
     Returns:
-        str: JSON string of the budget plan.
+        dict: The budget plan.
     """
     profile = {
         'monthly_income': income,
@@ -26,10 +39,9 @@ def calculate_budget_tool(income, fixed_expenses, variable_expenses=None):
         'transportation': fixed_expenses.get('transportation', 0),
     }
     # Add other fixed expenses if any
-    
+
     planner = BudgetPlannerAgent(profile)
-    budget = planner.generate_budget()
-    return json.dumps(budget, indent=2)
+    return planner.generate_budget()
 
 def expense_classifier_tool(transactions_csv_path):
     """
@@ -37,67 +49,163 @@ def expense_classifier_tool(transactions_csv_path):
     Args:
         transactions_csv_path (str): Path to the transactions CSV file.
     Returns:
-        str: JSON string of the analysis.
+        dict: The spending analysis.
     """
     try:
-        df = pd.read_csv(transactions_csv_path)
-        # Basic preprocessing
-        df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'])
-            
+        df = read_transactions(transactions_csv_path)
         analyzer = SpendingAnalyzerAgent(df)
-        analysis = analyzer.analyze()
-        return json.dumps(analysis, indent=2)
+        return analyzer.analyze()
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return {"error": str(e)}
 
-def memory_lookup_tool(key):
+def memory_lookup_tool(key, memory=None):
     """
     Fetches stored user data.
     Args:
         key (str): The key to lookup (e.g., 'user_profile', 'budget_plans').
     Returns:
-        str: JSON string of the data.
+        The stored data.
     """
+    memory = memory or get_memory()
     if key == 'user_profile':
-        return json.dumps(memory.get_profile(), indent=2)
+        return memory.get_profile()
     elif key == 'history':
-        return json.dumps(memory.get_history(), indent=2)
+        return memory.get_history()
     elif key == 'latest_budget':
-        return json.dumps(memory.get_latest_budget(), indent=2)
+        return memory.get_latest_budget()
     else:
-        return json.dumps({"error": "Key not found"})
+        return {"error": "Key not found"}
 
-def memory_update_tool(key, data):
+def memory_update_tool(key, data, memory=None):
     """
     Updates conversation history or user profile.
     Args:
         key (str): 'user_profile' or 'history'.
         data (dict): Data to update.
     Returns:
-        str: Status message.
+        dict: Status message.
     """
     if key == 'user_profile':
-        memory.update_profile(data)
-        return "Profile updated."
+        (memory or get_memory()).update_profile(data)
+        return {"status": "Profile updated."}
     else:
-        return "Update not supported for this key via tool."
+        return {"status": "Update not supported for this key via tool."}
 
 def dataset_loader_tool(directory_path):
     """
-    Reads files in the project folder.
+    Describes the datasets in a folder from its catalog index.
     Args:
         directory_path (str): Path to the directory.
     Returns:
-        str: Summary of files found.
+        dict: One entry per file with size, schema, row count and date range.
     """
     try:
-        loader = DataLoader(directory_path)
-        # Assuming DataLoader has a method to list or load files. 
-        # If not, we'll just list files for now as a simple implementation.
-        import os
-        files = os.listdir(directory_path)
-        return json.dumps({"files": files}, indent=2)
+        if not os.path.isdir(directory_path):
+            return {"error": f"Not a directory: {directory_path}"}
+        # Only files that changed since the last call are re-read.
+        return {"files": DataLoader(directory_path).describe()}
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return {"error": str(e)}
+
+
+def to_json(result):
+    """Serializes a tool result for the LLM or an API response."""
+    return json.dumps(result, separators=(',', ':'), default=str)
+
+
+_MISSING = object()
+
+
+def _file_stamp(path):
+    # Edits to a file (or entries added to a directory) change its stamp.
+    try:
+        stat = os.stat(path)
+        return [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        return [path, None, None]
+
+
+class ToolRegistry:
+    """
+    Runs tools by name, memoizing pure ones and batching independent calls.
+
+    A cacheable tool's result is keyed on its name, its arguments and the
+    mtime/size of its `path_args`, so a changed CSV is re-read but repeated
+    calls are free. Each call gets its own copy of a cached result, and
+    {"error": ...} results are never cached.
+    """
+
+    def __init__(self, cache=None, max_workers=4):
+        self.cache = cache or ResultCache(max_entries=128, max_bytes=64 * 1024 * 1024)
+        self.max_workers = max_workers
+        self.tools = {}
+
+    def register(self, name, func, cacheable=True, path_args=(), mutates=False):
+        self.tools[name] = {"func": func, "cacheable": cacheable, "path_args": path_args, "mutates": mutates}
+
+    def call(self, name, **kwargs):
+        tool = self.tools.get(name)
+        if tool is None:
+            return {"error": f"Unknown tool: {name}"}
+        if not tool["cacheable"]:
+            return tool["func"](**kwargs)
+        stamps = [_file_stamp(kwargs[arg]) for arg in tool["path_args"] if arg in kwargs]
+        key = content_hash("tool", name, kwargs, stamps)
+        result = self.cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = tool["func"](**kwargs)
+            if isinstance(result, dict) and "error" in result:
+                return result  # e.g. a missing file: retried on the next call
+            self.cache.put(key, result)
+        # Callers may mutate what they get back; the cached entry must not change.
+        return copy.deepcopy(result)
+
+    def _safe_call(self, call):
+        try:
+            return self.call(call["name"], **call.get("args", {}))
+        except Exception as e:
+            return {"error": str(e)}
+
+    def call_batch(self, calls):
+        """
+        Runs [{"name": ..., "args": {...}}, ...] and returns results in order.
+
+        Read-only calls between two mutating calls run concurrently; mutating
+        calls run alone, in order, so reads see the writes before them.
+        """
+        results = [None] * len(calls)
+        group = []
+
+        def flush():
+            if len(group) == 1:
+                results[group[0]] = self._safe_call(calls[group[0]])
+            elif group:
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(group))) as pool:
+                    for i, result in zip(group, pool.map(lambda i: self._safe_call(calls[i]), group)):
+                        results[i] = result
+            group.clear()
+
+        for i, call in enumerate(calls):
+            if self.tools.get(call["name"], {}).get("mutates"):
+                flush()
+                results[i] = self._safe_call(call)
+            else:
+                group.append(i)
+        flush()
+        return results
+
+    def call_batch_json(self, calls):
+        """call_batch() serialized once for the LLM."""
+        return to_json(self.call_batch(calls))
+
+
+def default_registry(cache=None):
+    registry = ToolRegistry(cache=cache)
+    registry.register("calculate_budget", calculate_budget_tool)
+    registry.register("expense_classifier", expense_classifier_tool, path_args=("transactions_csv_path",))
+    registry.register("memory_lookup", memory_lookup_tool, cacheable=False)
+    registry.register("memory_update", memory_update_tool, cacheable=False, mutates=True)
+    # The catalog refresh is incremental; a directory mtime would miss in-place edits.
+    registry.register("dataset_loader", dataset_loader_tool, cacheable=False)
+    return registry
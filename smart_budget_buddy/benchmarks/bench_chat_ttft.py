@@ -0,0 +1,64 @@
+"""
+Time-to-first-token of the streaming chat path vs the blocking ask(), using
+FakeStreamingModel so no API key or network is needed.
+
+Run from the repository root (first-token and per-token latency in ms are optional):
+    python -m smart_budget_buddy.benchmarks.bench_chat_ttft 300 20
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.agents.financial_chat import FinancialLiteracyChatBot
+from smart_budget_buddy.utils.llm_stream import FakeStreamingModel
+from smart_budget_buddy.utils.response_cache import ResponseCache
+
+ANSWER = ("💡 A budget is a plan for your money. List your income, subtract fixed costs like rent, "
+          "then split the rest between needs, wants and savings. Review it every month!")
+ROUNDS = 5
+
+
+def _bot(model):
+    # Fresh cache so every round really reaches the model.
+    bot = FinancialLiteracyChatBot(response_cache=ResponseCache())
+    bot.model = model
+    return bot
+
+
+def run(first_token_ms, token_ms):
+    model = FakeStreamingModel(ANSWER, first_token_latency=first_token_ms / 1000, token_latency=token_ms / 1000)
+    n_tokens = len(model.tokenize(ANSWER))
+    print(f"fake model: {n_tokens} tokens, first token {first_token_ms} ms, then {token_ms} ms/token")
+
+    blocking = []
+    for i in range(ROUNDS):
+        bot = _bot(model)
+        start = time.perf_counter()
+        bot.ask(f"what is a budget {i}")
+        blocking.append(time.perf_counter() - start)
+
+    ttft, total = [], []
+    for i in range(ROUNDS):
+        bot = _bot(model)
+        start = time.perf_counter()
+        first = None
+        for _ in bot.ask_stream(f"what is a budget {i}"):
+            if first is None:
+                first = time.perf_counter() - start
+        ttft.append(first)
+        total.append(time.perf_counter() - start)
+
+    best = min
+    print(f"blocking ask:   first text after {best(blocking) * 1000:8.1f} ms")
+    print(f"streaming ask:  first text after {best(ttft) * 1000:8.1f} ms  (complete after {best(total) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as workdir:
+        # The chat bot keeps its MemoryStore in the working directory.
+        os.chdir(workdir)
+        run(int(sys.argv[1]) if len(sys.argv) > 1 else 300,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,71 @@
+"""
+Prompt context size and assembly time as a conversation grows: the old
+"full profile JSON + last 5 messages" context vs ConversationContext.
+
+Run from the repository root (token budget is optional, default 600):
+    python -m smart_budget_buddy.benchmarks.bench_context_builder 600
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.utils.context_builder import ConversationContext, estimate_tokens
+
+PROFILE = {
+    "name": "Sam", "monthly_income": 1500, "housing": 700, "tuition": 600, "transportation": 50,
+    "goals": ["laptop", "trip home"], "notes": "", "preferences": {"currency": "USD", "alerts": True}
+}
+EARLY_FACT = "My landlord is raising the rent to 780 next month and I am worried."
+QUERY = "How should I adjust my budget now that the rent is going up?"
+FILLER = ["how do I cut grocery costs", "is a bus pass worth it", "ideas for cheap weekends",
+          "saving for a laptop", "my phone bill is too high", "how do envelopes work"]
+
+
+def make_history(n_turns, seed=0):
+    rng = np.random.default_rng(seed)
+    history = [{"role": "user", "content": EARLY_FACT},
+               {"role": "assistant", "content": "Let's plan for the higher rent together."}]
+    while len(history) < n_turns:
+        history.append({"role": "user", "content": str(rng.choice(FILLER))})
+        history.append({"role": "assistant", "content": "Here are a few ideas that fit a student budget. " * 12})
+    return history
+
+
+def legacy_context(history, profile):
+    return f"User Profile: {json.dumps(profile)}\nRecent History: {json.dumps(history[-5:])}"
+
+
+def _best_us(fn, rounds=200):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        fn()
+        best = min(best, time.perf_counter_ns() - start)
+    return best / 1000
+
+
+def run(token_budget):
+    print(f"{'turns':>7} | {'legacy tokens':>13} {'us':>7} {'recalls rent':>12} | "
+          f"{'new tokens':>10} {'us':>7} {'recalls rent':>12}")
+    for n_turns in (10, 100, 1000, 10000):
+        history = make_history(n_turns)
+        context = ConversationContext(token_budget=token_budget)
+        for message in history:
+            context.add_turn(message["role"], message["content"])
+
+        # The old code re-read the whole history list on every call.
+        legacy = legacy_context(history, PROFILE)
+        legacy_us = _best_us(lambda: legacy_context(list(history), PROFILE))
+        built = context.build(QUERY, PROFILE)
+        new_us = _best_us(lambda: context.build(QUERY, PROFILE))
+        print(f"{n_turns:>7} | {estimate_tokens(legacy):>13} {legacy_us:>7.1f} {str('780' in legacy):>12} | "
+              f"{estimate_tokens(built):>10} {new_us:>7.1f} {str('780' in built):>12}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 600)
@@ -0,0 +1,58 @@
+"""
+"What data do I have": describing a dataset directory by loading every CSV
+vs the incremental DatasetCatalog (first scan, no-op refresh, one file edited).
+
+Run from the repository root (per-file size in MB and file count are optional):
+    python -m smart_budget_buddy.benchmarks.bench_dataset_catalog 100 3
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.benchmarks.synthetic_data import write_export
+from smart_budget_buddy.utils.data_loader import read_transactions
+from smart_budget_buddy.utils.dataset_catalog import DatasetCatalog
+
+
+def describe_by_loading(directory):
+    # The only way to answer before: open and parse every file.
+    summary = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.csv'):
+            df = read_transactions(os.path.join(directory, name))
+            summary[name] = (len(df), df['date'].min(), df['date'].max())
+    return summary
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def run(size_mb, n_files):
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(n_files):
+            write_export(os.path.join(directory, f"export_{i}.csv"), size_mb * 1024 * 1024, seed=i)
+
+        elapsed, _ = _timed(lambda: describe_by_loading(directory))
+        print(f"{n_files} x {size_mb} MB CSVs")
+        print(f"load every file:    {elapsed:8.3f} s")
+
+        elapsed, report = _timed(lambda: DatasetCatalog(directory).refresh())
+        print(f"catalog first scan: {elapsed:8.3f} s  scanned {len(report['scanned'])}")
+        elapsed, report = _timed(lambda: DatasetCatalog(directory).refresh())
+        print(f"catalog no change:  {elapsed * 1000:8.3f} ms  unchanged {report['unchanged']}")
+
+        with open(os.path.join(directory, "export_0.csv"), 'a') as f:
+            f.write("2025-01-01 12:00:00 +0000,Food,9.99\n")
+        elapsed, report = _timed(lambda: DatasetCatalog(directory).refresh())
+        print(f"one file appended:  {elapsed:8.3f} s  scanned {report['scanned']}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3)
@@ -0,0 +1,68 @@
+"""
+Per-series cost of the batched closed-form forecaster against fitting one
+model per series (scikit-learn LinearRegression when installed, otherwise a
+per-series NumPy lstsq call standing in for it).
+
+Run from the repository root:
+    python -m smart_budget_buddy.benchmarks.bench_forecasting
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.agents.forecasting_agent import fit_linear_trends, predict_many
+
+N_SERIES = 10_000
+N_MONTHS = 12
+
+
+def per_series_fit(series):
+    try:
+        from sklearn.linear_model import LinearRegression
+    except ImportError:
+        LinearRegression = None
+
+    predictions = []
+    x = np.arange(series.shape[1]).reshape(-1, 1)
+    for y in series:
+        if LinearRegression is not None:
+            model = LinearRegression().fit(x, y)
+            predictions.append(model.predict([[len(y)]])[0])
+        else:
+            design = np.hstack([np.ones_like(x), x])
+            coef = np.linalg.lstsq(design, y, rcond=None)[0]
+            predictions.append(coef[0] + coef[1] * len(y))
+    return np.array(predictions)
+
+
+def run():
+    rng = np.random.default_rng(0)
+    trend = rng.normal(0, 20, (N_SERIES, 1)) * np.arange(N_MONTHS)
+    series = 1000 + trend + rng.normal(0, 50, (N_SERIES, N_MONTHS))
+
+    start = time.perf_counter()
+    baseline = per_series_fit(series)
+    loop_cost = (time.perf_counter() - start) / N_SERIES
+
+    start = time.perf_counter()
+    fit_linear_trends(series)
+    fit_cost = (time.perf_counter() - start) / N_SERIES
+
+    start = time.perf_counter()
+    batched = predict_many(series)
+    batch_cost = (time.perf_counter() - start) / N_SERIES
+
+    predicted = np.array([r["predicted_spending"] for r in batched])
+    print(f"{N_SERIES} series x {N_MONTHS} months")
+    print(f"per-series fit: {loop_cost * 1e6:8.1f} us/series")
+    print(f"batched fit:    {fit_cost * 1e6:8.1f} us/series  ({loop_cost / fit_cost:.0f}x faster)")
+    print(f"predict_many:   {batch_cost * 1e6:8.1f} us/series  (fit + result dicts, {loop_cost / batch_cost:.0f}x faster)")
+    print(f"max |difference|: {np.max(np.abs(predicted - baseline)):.4f} (after rounding to cents)")
+
+
+if __name__ == "__main__":
+    run()
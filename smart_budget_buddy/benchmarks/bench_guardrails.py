@@ -0,0 +1,80 @@
+"""
+Guardrail matching cost: the old per-topic substring loops vs the compiled
+TopicMatcher, with large synthetic topic lists and long pasted queries.
+
+Run from the repository root (term count and query length in words are optional):
+    python -m smart_budget_buddy.benchmarks.bench_guardrails 5000 2000
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.agents.guardrails import KNOWLEDGE_BASE, RESTRICTED_TOPICS, TopicMatcher
+
+ROUNDS = 20
+
+
+def make_terms(n, seed=0):
+    rng = np.random.default_rng(seed)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    terms = set(RESTRICTED_TOPICS)
+    while len(terms) < n:
+        word = "".join(rng.choice(letters, rng.integers(4, 11)))
+        # Every tenth term is a two-word phrase, like "credit card".
+        if len(terms) % 10 == 0:
+            word += " " + "".join(rng.choice(letters, rng.integers(3, 8)))
+        terms.add(word)
+    return sorted(terms)
+
+
+def make_query(n_words, seed=1):
+    rng = np.random.default_rng(seed)
+    vocabulary = ["my", "monthly", "budget", "is", "tight", "and", "i", "want", "to", "cut", "food",
+                  "spending", "before", "rent", "is", "due", "vagabond", "savings", "goal", "for", "a", "laptop"]
+    return " ".join(rng.choice(vocabulary, n_words)) + " should i invest in bonds?"
+
+
+def legacy_match(query, restricted_topics, knowledge_base):
+    # The loops both agents used before, collecting every hit.
+    query_lower = query.lower()
+    restricted = [topic for topic in restricted_topics if topic in query_lower]
+    knowledge = [key for key in knowledge_base if key in query_lower]
+    return restricted, knowledge
+
+
+def _best(fn):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(n_terms, n_words):
+    terms = make_terms(n_terms)
+    query = make_query(n_words)
+
+    start = time.perf_counter()
+    matcher = TopicMatcher(terms, KNOWLEDGE_BASE)
+    compile_s = time.perf_counter() - start
+    print(f"{len(terms):,} restricted terms, query of {len(query):,} chars; matcher built in {compile_s * 1000:.1f} ms")
+
+    legacy_s = _best(lambda: legacy_match(query, terms, KNOWLEDGE_BASE))
+    matcher_s = _best(lambda: matcher.match(query))
+    print(f"legacy loops: {legacy_s * 1000:9.3f} ms/query  {legacy_match(query, terms, KNOWLEDGE_BASE)[0]}")
+    print(f"TopicMatcher: {matcher_s * 1000:9.3f} ms/query  {matcher.match(query)['restricted']}  ({legacy_s / matcher_s:.1f}x)")
+
+    short = "how do i start saving for a laptop?"
+    legacy_s = _best(lambda: legacy_match(short, terms, KNOWLEDGE_BASE))
+    matcher_s = _best(lambda: matcher.match(short))
+    print(f"short query:  legacy {legacy_s * 1e6:.1f} us, TopicMatcher {matcher_s * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
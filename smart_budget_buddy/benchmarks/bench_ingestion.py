@@ -0,0 +1,68 @@
+"""
+Parse time and peak RSS of the typed ingestion path (read_transactions)
+against the previous plain read_csv + inferred to_datetime, on a synthetic
+bank export in the real '2022-07-06 05:57:10 +0000' layout.
+
+Each parser runs in its own subprocess so peak RSS is measured cleanly.
+Run from the repository root (size in GB is optional, default 5):
+    python -m smart_budget_buddy.benchmarks.bench_ingestion 5
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(REPO_ROOT)
+
+from smart_budget_buddy.benchmarks.synthetic_data import write_export
+
+PARSERS = {
+    'legacy': '''
+import pandas as pd
+df = pd.read_csv(PATH)
+df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
+df['date'] = pd.to_datetime(df['date'])
+''',
+    'typed (c engine)': '''
+from smart_budget_buddy.utils.data_loader import read_transactions
+df = read_transactions(PATH, engine='c')
+''',
+    'typed (pyarrow)': '''
+from smart_budget_buddy.utils.data_loader import read_transactions
+df = read_transactions(PATH, engine='pyarrow')
+''',
+}
+
+CHILD = '''
+import resource, sys, time
+PATH = sys.argv[1]
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(f"{{elapsed:.2f}} {{rss_kb / 1024:.0f}} {{len(df)}}")
+'''
+
+
+def run(size_gb):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'export.csv')
+        start = time.perf_counter()
+        write_export(path, int(size_gb * 1024 ** 3))
+        print(f"export: {os.path.getsize(path) / 1024 ** 3:.2f} GB written in {time.perf_counter() - start:.0f}s")
+
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+        for name, body in PARSERS.items():
+            proc = subprocess.run([sys.executable, '-c', CHILD.format(body=body), path],
+                                  env=env, capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"{name:>18}: failed ({proc.stderr.strip().splitlines()[-1]})")
+                continue
+            elapsed, rss_mb, rows = proc.stdout.split()
+            print(f"{name:>18}: {float(elapsed):7.2f}s  peak RSS {int(rss_mb):>6} MB  rows={int(rows):,}")
+
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,51 @@
+"""
+Overhead of the instrumentation layer on a cheap, hot agent call
+(BudgetPlannerAgent.generate_budget): undecorated vs traced but disabled
+vs recording spans vs recording with tracemalloc peak memory.
+
+Run from the repository root (call count is optional):
+    python -m smart_budget_buddy.benchmarks.bench_instrumentation 20000
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.agents.budget_planner import BudgetPlannerAgent
+from smart_budget_buddy.pipeline.main_workflow import manual_profile
+from smart_budget_buddy.utils import instrumentation
+
+
+def _per_call_us(func, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def run(n):
+    agent = BudgetPlannerAgent(manual_profile())
+    undecorated = BudgetPlannerAgent.generate_budget.__wrapped__
+    _per_call_us(lambda: undecorated(agent), n)  # warm-up
+    base = _per_call_us(lambda: undecorated(agent), n)
+    print(f"{n} calls of generate_budget")
+    print(f"undecorated:            {base:7.2f} us/call")
+
+    instrumentation.disable()
+    disabled = _per_call_us(agent.generate_budget, n)
+    print(f"traced, disabled:       {disabled:7.2f} us/call  (+{disabled - base:.2f} us)")
+
+    instrumentation.enable()
+    enabled = _per_call_us(agent.generate_budget, n)
+    print(f"traced, enabled:        {enabled:7.2f} us/call  (+{enabled - base:.2f} us)")
+
+    instrumentation.enable(trace_memory=True)
+    with_memory = _per_call_us(agent.generate_budget, n)
+    instrumentation.disable()
+    print(f"traced, + tracemalloc:  {with_memory:7.2f} us/call  (+{with_memory - base:.2f} us)")
+    print(instrumentation.metrics()["BudgetPlannerAgent.generate_budget"])
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,63 @@
+"""
+BM25 knowledge index over the bundled tips corpus (the hand-written tips plus
+the generated ones, see utils/tips_corpus.py): build time, serialized size,
+load time and top-k query latency, then the first load of the shipped index.
+
+Run from the repository root:
+    python -m smart_budget_buddy.benchmarks.bench_knowledge_index
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.utils.knowledge_index import BM25Index, load_index, read_corpora
+
+QUERIES = [
+    "how do I start saving?", "what is a budget", "cheap groceries and meal prep",
+    "my roommate won't split the electricity bill", "I spent too much this month",
+    "student bus pass", "should I buy a car", "saving for a laptop", "textbooks are expensive",
+    "emergency fund size", "how to stop impulse shopping online", "part-time job and scholarships"
+]
+
+
+def _latencies(index, k=5, rounds=200):
+    samples = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            start = time.perf_counter_ns()
+            index.search(query, k=k)
+            samples.append(time.perf_counter_ns() - start)
+    return np.array(samples) / 1000
+
+
+def run():
+    docs = read_corpora()
+    start = time.perf_counter()
+    index = BM25Index.build(docs)
+    build_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "index.json")
+        index.save(path)
+        size_mb = os.path.getsize(path) / 1e6
+        start = time.perf_counter()
+        BM25Index.load(path)
+        load_s = time.perf_counter() - start
+
+    print(f"{len(docs):,} tips, {len(index.postings):,} terms: build {build_s:.2f} s, {size_mb:.1f} MB on disk, load {load_s * 1000:.0f} ms")
+    samples = _latencies(index)
+    print(f"top-5 query: p50 {np.percentile(samples, 50):.0f} us  p99 {np.percentile(samples, 99):.0f} us")
+
+    # What the first offline chat answer pays: load plus the staleness check.
+    start = time.perf_counter()
+    load_index()
+    print(f"shipped index: first load {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,92 @@
+"""
+A burst of concurrent chat sessions against a fake backend with a quota:
+one unmanaged model per session vs the shared ModelPool (rate limit,
+bounded concurrency, jittered retries, coalescing of identical prompts).
+
+Run from the repository root (session count and backend quota in req/s are optional):
+    python -m smart_budget_buddy.benchmarks.bench_llm_pool 40 10
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.utils.llm_client import ModelPool
+from smart_budget_buddy.utils.llm_stream import FakeStreamingModel
+
+PROMPTS = ["how do I start saving?", "what is a budget", "cheap groceries", "bus pass worth it?"]
+
+
+class ResourceExhausted(Exception):
+    """Same name as the google.api_core quota error, so it is treated as transient."""
+    code = 429
+
+
+class QuotaBackend(FakeStreamingModel):
+    """Fake model that rejects requests beyond `quota` per second (burst of the same size)."""
+
+    def __init__(self, quota):
+        super().__init__("Start small and automate it.", first_token_latency=0.2, token_latency=0.0)
+        self.quota = quota
+        self.rejected = 0
+        self._tokens = float(quota)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _admit(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.quota, self._tokens + (now - self._updated) * self.quota)
+            self._updated = now
+            if self._tokens < 1:
+                self.rejected += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    def generate_content(self, prompt, stream=False):
+        if not self._admit():
+            raise ResourceExhausted("429 quota exceeded")
+        return super().generate_content(prompt, stream)
+
+
+def _burst(n_sessions, model_for_session, unique=False):
+    errors = []
+
+    def session(i):
+        prompt = f"{PROMPTS[i % len(PROMPTS)]} #{i}" if unique else PROMPTS[i % len(PROMPTS)]
+        try:
+            model_for_session(i).generate_content(prompt)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(n_sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, errors
+
+
+def run(n_sessions, quota):
+    backend = QuotaBackend(quota)
+    elapsed, errors = _burst(n_sessions, lambda i: backend)
+    print(f"{n_sessions} sessions\nper-session clients:           {elapsed:.2f} s, backend answered {backend.calls}, "
+          f"quota errors shown to users {len(errors)}")
+
+    for unique in (False, True):
+        backend = QuotaBackend(quota)
+        pool = ModelPool(requests_per_second=quota, burst=quota, max_concurrency=8, base_delay=0.1,
+                         model_factory=lambda api_key, model_name: backend)
+        pooled = pool.get("key", "fake-model")
+        elapsed, errors = _burst(n_sessions, lambda i: pooled, unique=unique)
+        label = "shared pool, distinct prompts:" if unique else "shared pool, repeated prompts:"
+        print(f"{label} {elapsed:.2f} s, backend answered {backend.calls}, quota errors shown to users {len(errors)}")
+        print(f"    {pooled.stats}  backend rejections {backend.rejected}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 40,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10)
@@ -0,0 +1,66 @@
+"""
+Compares per-write latency of MemoryStore's full-rewrite path against the
+append-only journal as conversation history grows.
+
+Run from the repository root:
+    python -m smart_budget_buddy.benchmarks.bench_memory_store
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.utils.memory_store import MemoryStore
+
+HISTORY_SIZES = [1000, 5000, 10000, 20000]
+WRITES_PER_SIZE = 50
+# Disable the ring-buffer limit so history really grows to each size.
+UNBOUNDED = {"conversation_history": None}
+
+
+def _prefill(store, n):
+    # Grow history in memory only so the setup itself isn't timed.
+    for i in range(n):
+        store.data["conversation_history"].append({
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": f"message number {i} about budgeting and saving money",
+            "timestamp": "2025-01-01T00:00:00"
+        })
+    store.save_data()
+
+
+def _time_writes(store, n_writes):
+    start = time.perf_counter()
+    for i in range(n_writes):
+        store.add_chat_message("user", f"benchmark message {i}")
+    return (time.perf_counter() - start) / n_writes
+
+
+def run():
+    print(f"{'history':>8} {'rewrite ms/write':>18} {'journal ms/write':>18} {'speedup':>8}")
+    for size in HISTORY_SIZES:
+        with tempfile.TemporaryDirectory() as tmp:
+            rewrite = MemoryStore(os.path.join(tmp, 'rewrite.json'), limits=UNBOUNDED)
+            _prefill(rewrite, size)
+            rewrite_cost = _time_writes(rewrite, WRITES_PER_SIZE)
+
+            journal = MemoryStore(os.path.join(tmp, 'journal.json'), journal=True, compact_every=0, limits=UNBOUNDED)
+            _prefill(journal, size)
+            journal_cost = _time_writes(journal, WRITES_PER_SIZE)
+            journal.close()
+
+        print(f"{size:>8} {rewrite_cost * 1000:>18.3f} {journal_cost * 1000:>18.3f} {rewrite_cost / journal_cost:>7.0f}x")
+
+    # End-to-end journal run from an empty store, compaction included.
+    total = HISTORY_SIZES[-1]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(os.path.join(tmp, 'journal.json'), journal=True, limits=UNBOUNDED)
+        elapsed = _time_writes(store, total) * total
+        store.close()
+    print(f"\njournal, {total} writes from empty (compact_every=1000): {elapsed:.2f}s total")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,133 @@
+"""
+Hundreds of students at once against the HTTP service: each one saves a
+profile and gets a budget, checks alerts on a month of transactions and asks
+a chat question, over one keep-alive connection. Reports throughput, latency
+percentiles, shed (503) requests and how long /health takes while the CPU
+pool is busy, which shows whether the event loop stays responsive. For
+reference, the same work runs one student after another against the single
+shared user_data.json.
+
+Run from the repository root (students, transactions per student, executor are optional):
+    python -m smart_budget_buddy.benchmarks.bench_service 300 500 process
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.benchmarks.synthetic_data import make_profiles, make_transactions
+from smart_budget_buddy.service import BudgetService, alerts_job
+from smart_budget_buddy.agents.budget_planner import BudgetPlannerAgent
+from smart_budget_buddy.agents.financial_chat import FinancialLiteracyChatBot
+from smart_budget_buddy.utils.memory_store import MemoryStore
+
+QUESTION = "How do I start saving?"
+
+
+async def request(reader, writer, method, path, body=None):
+    data = json.dumps(body).encode('utf-8') if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode('latin-1') + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length)) if length else None
+
+
+def _student_payloads(n_students, n_transactions):
+    profiles = make_profiles(n_students).to_dict('records')
+    # One month of spending per student, in the JSON shape clients send.
+    transactions = make_transactions(n_transactions, seed=1)
+    transactions['date'] = transactions['date'].dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+    records = transactions.astype({'category': str}).to_dict('records')
+    return [({k: (v.item() if hasattr(v, 'item') else v) for k, v in p.items()}, records) for p in profiles]
+
+
+async def student(port, user_id, profile, records, latencies, statuses):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        for path, body in (("/budget", {"user_id": user_id, "profile": profile}),
+                           ("/alerts", {"user_id": user_id, "transactions": records}),
+                           ("/chat", {"user_id": user_id, "message": QUESTION})):
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, "POST", path, body)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def probe_health(port, stop, samples):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    while not stop.is_set():
+        start = time.perf_counter()
+        await request(reader, writer, "GET", "/health")
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.05)
+    writer.close()
+
+
+def _pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+
+async def serve_load(payloads, executor, workdir):
+    service = BudgetService(data_dir=os.path.join(workdir, 'users'), executor=executor)
+    server = await service.start('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    latencies, statuses, health = [], {}, []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_health(port, stop, health))
+    start = time.perf_counter()
+    await asyncio.gather(*[student(port, f"student-{i}", profile, records, latencies, statuses)
+                           for i, (profile, records) in enumerate(payloads)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    await service.close()
+    return elapsed, latencies, statuses, health
+
+
+def single_file(payloads, workdir):
+    # The Streamlit model: every student shares one user_data.json, one at a time.
+    memory = MemoryStore(os.path.join(workdir, 'user_data.json'))
+    start = time.perf_counter()
+    for profile, records in payloads:
+        memory.update_profile(profile)
+        budget = BudgetPlannerAgent(profile).generate_budget()
+        memory.save_budget_plan(budget)
+        alerts_job(budget, {"transactions": records})
+        FinancialLiteracyChatBot(memory=memory).ask(QUESTION)
+    return time.perf_counter() - start
+
+
+def run(n_students, n_transactions, executor):
+    payloads = _student_payloads(n_students, n_transactions)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        elapsed, latencies, statuses, health = asyncio.run(serve_load(payloads, executor, workdir))
+        print(f"{n_students} concurrent students x 3 requests ({n_transactions} transactions each), {executor} pool")
+        print(f"service:     {elapsed:6.2f} s, {len(latencies) / elapsed:6.1f} req/s, "
+              f"p50 {_pct(latencies, 0.5):.0f} ms, p95 {_pct(latencies, 0.95):.0f} ms, p99 {_pct(latencies, 0.99):.0f} ms, "
+              f"status counts {statuses}")
+        print(f"/health under load: p50 {_pct(health, 0.5):.1f} ms, max {max(health) * 1000:.1f} ms over {len(health)} probes")
+        sequential = single_file(payloads, workdir)
+        print(f"single user_data.json, sequential: {sequential:6.2f} s ({n_students * 3 / sequential:.1f} req/s)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+        sys.argv[3] if len(sys.argv) > 3 else 'process')
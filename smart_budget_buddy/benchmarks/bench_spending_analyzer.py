@@ -0,0 +1,73 @@
+"""
+Compares the single-pass aggregate cube in SpendingAnalyzerAgent with the
+previous analyze() path (four groupbys) plus the app's extra daily groupby,
+then times a daily incremental sync against re-analyzing the full history.
+
+Run from the repository root (row count is optional, default 10M):
+    python -m smart_budget_buddy.benchmarks.bench_spending_analyzer 10000000
+"""
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.agents.spending_analyzer import SpendingAnalyzerAgent
+from smart_budget_buddy.benchmarks.synthetic_data import make_transactions
+
+SYNC_BATCH_ROWS = 1000
+
+
+def legacy_views(df):
+    """The pre-cube analyze() plus the Streamlit chart's daily groupby."""
+    category_spending = df.groupby('category')['amount'].sum().to_dict()
+    daily_spending = df.groupby(df['date'].dt.date)['amount'].sum()
+    monthly_spending = df.groupby(df['date'].dt.to_period('M'))['amount'].sum()
+    top_categories = df.groupby('category')['amount'].sum().sort_values(ascending=False).head(5).to_dict()
+    chart_daily = df.groupby(df['date'].dt.date)['amount'].sum()
+    return category_spending, daily_spending.mean(), monthly_spending, top_categories, chart_daily
+
+
+def cube_views(df):
+    analyzer = SpendingAnalyzerAgent(df)
+    analysis = analyzer.analyze()
+    return analysis, analyzer.daily_totals(), analyzer.monthly_totals()
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def run(n_rows):
+    warnings.simplefilter('ignore')  # to_period() on tz-aware dates warns on every call
+    df = make_transactions(n_rows)
+    legacy = _timed(legacy_views, df)
+    cube = _timed(cube_views, df)
+    print(f"rows={n_rows:,}")
+    print(f"legacy (5 groupbys): {legacy:.2f}s")
+    print(f"aggregate cube:      {cube:.2f}s  ({legacy / cube:.1f}x faster)")
+
+    # A daily bank sync: append one batch to the existing history.
+    batch = make_transactions(SYNC_BATCH_ROWS, seed=1)
+    analyzer = SpendingAnalyzerAgent(df)
+    analyzer.analyze()
+    start = time.perf_counter()
+    analyzer.ingest(batch)
+    incremental_result = analyzer.analyze()
+    incremental = time.perf_counter() - start
+
+    combined = pd.concat([df, batch], ignore_index=True)
+    start = time.perf_counter()
+    full_result = SpendingAnalyzerAgent(combined).analyze()
+    recompute = time.perf_counter() - start
+    print(f"sync {SYNC_BATCH_ROWS} rows, incremental: {incremental * 1000:.1f}ms")
+    print(f"sync {SYNC_BATCH_ROWS} rows, full recompute: {recompute * 1000:.1f}ms  (identical output: {incremental_result == full_result})")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,87 @@
+"""
+End-to-end latency of the CLI pipeline: the stages one after another vs
+the StageGraph (independent stages overlap, so wall time follows the
+critical path), plus a rerun served from the stage cache and a tip stage
+that overruns its timeout. Stage latencies are simulated; the tip comes
+from a fake model.
+
+Run from the repository root (tip latency in seconds is optional):
+    python -m smart_budget_buddy.benchmarks.bench_stage_graph 0.8
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.pipeline import main_workflow
+from smart_budget_buddy.pipeline.stage_graph import Stage, StageGraph
+from smart_budget_buddy.utils.llm_stream import FakeStreamingModel
+from smart_budget_buddy.utils.result_cache import ResultCache
+
+# Simulated I/O per stage: profile lookup for the budget, a transaction read for the analysis.
+LATENCY = {"budget": 0.15, "analysis": 0.3, "alerts": 0.05, "forecast": 0.2}
+
+
+def _with_latency(func, seconds):
+    def stage(**kwargs):
+        time.sleep(seconds)
+        return func(**kwargs)
+    return stage
+
+
+def build_graph(tip_latency, cache=None, tip_timeout=None):
+    model = FakeStreamingModel("Pay yourself first: move 10% to savings on payday.",
+                               first_token_latency=tip_latency, token_latency=0.0)
+    tip = lambda: model.generate_content(main_workflow.TIP_QUESTION).text
+    return StageGraph([
+        Stage("budget", _with_latency(main_workflow.budget_stage, LATENCY["budget"]), deps=["profile"], cache=True),
+        Stage("analysis", _with_latency(main_workflow.analysis_stage, LATENCY["analysis"]), cache=True),
+        Stage("alerts", _with_latency(main_workflow.alerts_stage, LATENCY["alerts"]), deps=["budget", "analysis"], cache=True),
+        Stage("forecast", _with_latency(main_workflow.forecast_stage, LATENCY["forecast"]), cache=True),
+        Stage("tip", tip, timeout=tip_timeout, fallback=main_workflow.TIP_FALLBACK)
+    ], cache=cache)
+
+
+def sequential(graph, inputs):
+    results = dict(inputs)
+    for name in ("budget", "analysis", "alerts", "forecast", "tip"):
+        stage = graph.stages[name]
+        results[name] = stage.func(**{dep: results[dep] for dep in stage.deps})
+    return results
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def run(tip_latency):
+    inputs = {"profile": main_workflow.manual_profile()}
+    graph = build_graph(tip_latency)
+
+    seq_s, expected = _timed(lambda: sequential(graph, inputs))
+    print(f"sequential:       {seq_s * 1000:7.0f} ms (sum of stage latencies)")
+    for mode in ("thread", "asyncio"):
+        elapsed, results = _timed(lambda: graph.run(inputs, mode=mode))
+        path, path_s = graph.critical_path()
+        same = "same results" if results == expected else "RESULTS DIFFER"
+        print(f"graph ({mode + ')':8} {elapsed * 1000:7.0f} ms  critical path {' -> '.join(path)} "
+              f"{path_s * 1000:.0f} ms, {same}")
+
+    cache = ResultCache()
+    cached_graph = build_graph(tip_latency, cache=cache)
+    cached_graph.run(inputs)
+    elapsed, _ = _timed(lambda: cached_graph.run(inputs))
+    print(f"rerun, cached:    {elapsed * 1000:7.0f} ms  (cache {cache.stats()['hit_rate']:.0%} hits; "
+          f"the tip is never cached)")
+
+    timeout = tip_latency / 2
+    slow_graph = build_graph(tip_latency, tip_timeout=timeout)
+    elapsed, results = _timed(lambda: slow_graph.run(inputs))
+    print(f"tip timeout {timeout:.1f}s: {elapsed * 1000:6.0f} ms  tip -> {results['tip']!r}")
+
+
+if __name__ == "__main__":
+    run(float(sys.argv[1]) if len(sys.argv) > 1 else 0.8)
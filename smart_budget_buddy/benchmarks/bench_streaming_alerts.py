@@ -0,0 +1,77 @@
+"""
+Throughput (events/sec) and per-event latency of StreamingAlertEvaluator on
+a synthetic multi-student transaction feed, plus the asyncio queue path.
+
+Run from the repository root (event count is optional, default 1M):
+    python -m smart_budget_buddy.benchmarks.bench_streaming_alerts 1000000
+"""
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.agents.budget_planner import BudgetPlannerAgent
+from smart_budget_buddy.agents.streaming_alerts import StreamingAlertEvaluator, queue_from_iterable
+from smart_budget_buddy.benchmarks.synthetic_data import CATEGORIES
+
+N_STUDENTS = 1000
+
+
+def make_feed(n_events, seed=0):
+    rng = np.random.default_rng(seed)
+    days = rng.integers(0, 365, n_events)
+    dates = [f"2022-{1 + d // 31 % 12:02d}-{1 + d % 28:02d} 12:00:00 +0000" for d in days.tolist()]
+    return [
+        {"student_id": s, "date": d, "category": c, "amount": a}
+        for s, d, c, a in zip(rng.integers(0, N_STUDENTS, n_events).tolist(), dates,
+                              rng.choice(CATEGORIES, n_events).tolist(),
+                              rng.gamma(2.0, 15.0, n_events).round(2).tolist())
+    ]
+
+
+def _limits():
+    profile = {'monthly_income': 1500, 'housing': 500, 'tuition': 600, 'transportation': 50}
+    return BudgetPlannerAgent(profile).generate_budget()['category_limits']
+
+
+def run(n_events):
+    feed = make_feed(n_events)
+
+    evaluator = StreamingAlertEvaluator(_limits())
+    start = time.perf_counter()
+    alerts = evaluator.push_many(feed)
+    elapsed = time.perf_counter() - start
+    print(f"sync:    {n_events / elapsed:12,.0f} events/sec  {elapsed / n_events * 1e6:.2f} us/event  alerts={len(alerts):,}")
+
+    # Latency from push() to the alert being returned, sampled per event.
+    evaluator = StreamingAlertEvaluator(_limits())
+    samples = []
+    for transaction in feed[:100_000]:
+        t0 = time.perf_counter_ns()
+        evaluator.push(transaction)
+        samples.append(time.perf_counter_ns() - t0)
+    samples = np.array(samples) / 1000
+    print(f"latency: p50 {np.percentile(samples, 50):.2f} us  p99 {np.percentile(samples, 99):.2f} us")
+
+    async def via_queue():
+        queue = asyncio.Queue(maxsize=64)
+        evaluator = StreamingAlertEvaluator(_limits())
+        producer = asyncio.create_task(queue_from_iterable(feed, queue, batch_size=256))
+        count = 0
+        async for _ in evaluator.consume_queue(queue):
+            count += 1
+        await producer
+        return count
+
+    start = time.perf_counter()
+    count = asyncio.run(via_queue())
+    elapsed = time.perf_counter() - start
+    print(f"asyncio: {n_events / elapsed:12,.0f} events/sec  (micro-batches of 256)  alerts={count:,}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,75 @@
+"""
+Cost of a tool-calling loop: the old tools (re-read the CSV, pretty-print
+JSON, parse it back) vs ToolRegistry (memoized native results, batched
+calls, one compact serialization at the edge).
+
+Run from the repository root (CSV size in MB and loop rounds are optional):
+    python -m smart_budget_buddy.benchmarks.bench_tools 20 10
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.agents import tools
+from smart_budget_buddy.benchmarks.synthetic_data import write_export
+from smart_budget_buddy.utils.memory_store import MemoryStore
+
+
+def legacy_round(csv_path, directory):
+    # What the caller did before: every tool returned indent=2 JSON to parse back.
+    analysis = json.loads(json.dumps(tools.expense_classifier_tool(csv_path), indent=2))
+    budget = json.loads(json.dumps(tools.calculate_budget_tool(1500, {"housing": 600, "tuition": 400}), indent=2))
+    files = json.loads(json.dumps(tools.dataset_loader_tool(directory), indent=2))
+    profile = json.loads(json.dumps(tools.memory_lookup_tool("user_profile"), indent=2))
+    return json.dumps([analysis, budget, files, profile], indent=2)
+
+
+def registry_round(registry, csv_path, directory):
+    return registry.call_batch_json([
+        {"name": "expense_classifier", "args": {"transactions_csv_path": csv_path}},
+        {"name": "calculate_budget", "args": {"income": 1500, "fixed_expenses": {"housing": 600, "tuition": 400}}},
+        {"name": "dataset_loader", "args": {"directory_path": directory}},
+        {"name": "memory_lookup", "args": {"key": "user_profile"}}
+    ])
+
+
+def run(size_mb, rounds):
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        tools._memory = MemoryStore(os.path.join(workdir, "user_data.json"))
+        csv_path = os.path.join(workdir, "transactions.csv")
+        write_export(csv_path, size_mb * 1024 * 1024)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            legacy_round(csv_path, workdir)
+        legacy_s = time.perf_counter() - start
+
+        registry = tools.default_registry()
+        start = time.perf_counter()
+        first = registry_round(registry, csv_path, workdir)
+        first_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(rounds - 1):
+            registry_round(registry, csv_path, workdir)
+        rest_s = time.perf_counter() - start
+
+        print(f"{size_mb} MB CSV, {rounds} rounds of 4 tool calls")
+        print(f"legacy tools: {legacy_s / rounds * 1000:9.1f} ms/round")
+        print(f"registry:     {first_s * 1000:9.1f} ms first round, {rest_s / max(rounds - 1, 1) * 1000:.2f} ms/round after"
+              f"  (cache {registry.cache.stats()['hit_rate']:.0%} hits, {len(first):,} bytes of JSON)")
+
+        # Touching the CSV invalidates only the analysis entry.
+        os.utime(csv_path)
+        start = time.perf_counter()
+        registry_round(registry, csv_path, workdir)
+        print(f"after the CSV changes: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10)
@@ -0,0 +1,74 @@
+"""
+Import-time profile of the package entry points, measured in a fresh
+interpreter per module with `python -X importtime`.
+
+Run from the repository root:
+    python -m smart_budget_buddy.benchmarks.import_time_report
+"""
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+ENTRY_MODULES = [
+    'smart_budget_buddy.pipeline.main_workflow',
+    'smart_budget_buddy.pipeline.batch_workflow',
+    'smart_budget_buddy.agents.financial_chat',
+    'smart_budget_buddy.agents.financial_literacy',
+    'smart_budget_buddy.agents.forecasting_agent',
+    'smart_budget_buddy.agents.spending_analyzer',
+    'smart_budget_buddy.utils.data_loader',
+]
+
+
+def measure_import(module):
+    """
+    Imports `module` in a clean interpreter and returns a list of
+    (module, self_us, cumulative_us, depth) rows as reported by -X importtime,
+    where depth 0 is a top-level import and children precede their parent.
+    """
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise ImportError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def import_seconds(module):
+    """Cumulative time to import `module` itself, in seconds."""
+    for name, _, cumulative_us, _ in measure_import(module):
+        if name == module:
+            return cumulative_us / 1e6
+    raise ValueError(f"{module} missing from -X importtime output")
+
+
+def run(top=8):
+    for module in ENTRY_MODULES:
+        try:
+            rows = measure_import(module)
+        except ImportError as e:
+            print(f"\n{module}: failed ({e})")
+            continue
+        index = next(i for i, row in enumerate(rows) if row[0] == module)
+        print(f"\n{module}: {rows[index][2] / 1000:.1f} ms")
+        # The module's own subtree is the run of nested rows printed just before it.
+        start = index
+        while start > 0 and rows[start - 1][3] > 0:
+            start -= 1
+        direct = [row for row in rows[start:index] if row[3] == 1]
+        for name, _, cumulative_us, _ in sorted(direct, key=lambda r: r[2], reverse=True)[:top]:
+            print(f"    {cumulative_us / 1000:8.1f} ms  {name}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,336 @@
+"""
+Benchmark suite over every agent, the memory store and the loaders, on
+seeded synthetic data (see synthetic_data.py). Each case runs in its own
+subprocess and reports best-of-N time, throughput and peak RSS. Results
+can be stored as a baseline; later runs flag regressions against it and
+exit non-zero when any case got slower or bigger.
+
+Run from the repository root:
+    python -m smart_budget_buddy.benchmarks.suite --sizes 10k,1M --save-baseline
+    python -m smart_budget_buddy.benchmarks.suite --sizes 10k,1M
+    python -m smart_budget_buddy.benchmarks.suite --cases spending_analyzer.analyze --sizes 100M
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(REPO_ROOT)
+
+from smart_budget_buddy.benchmarks.synthetic_data import parse_size
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_SIZES = '10k,100k'
+# Relative slack before a change counts, and absolute floors below which
+# differences are timer/allocator noise.
+DEFAULT_TOLERANCE = 0.15
+MIN_SECONDS_DELTA = 0.005
+MIN_RSS_MB_DELTA = 8.0
+
+
+# --- Cases: setup(rows, workdir) -> state (untimed), run(state) (timed) ---
+
+def _transactions_csv(rows, workdir):
+    from smart_budget_buddy.benchmarks.synthetic_data import write_transactions_csv
+    path = os.path.join(workdir, 'transactions.csv')
+    write_transactions_csv(path, rows)
+    return path
+
+
+def _setup_cached_load(rows, workdir):
+    from smart_budget_buddy.utils.data_loader import read_transactions
+    from smart_budget_buddy.utils.dataset_cache import load_cached
+    path = _transactions_csv(rows, workdir)
+    load_cached(path, read_transactions)  # the cold load builds the cache
+    return path
+
+
+def _run_cached_load(path):
+    from smart_budget_buddy.utils.data_loader import read_transactions
+    from smart_budget_buddy.utils.dataset_cache import load_cached
+    load_cached(path, read_transactions)
+
+
+def _setup_profiles_csv(rows, workdir):
+    from smart_budget_buddy.benchmarks.synthetic_data import write_profiles_csv
+    path = os.path.join(workdir, 'profiles.csv')
+    write_profiles_csv(path, rows)
+    return path
+
+
+def _run_read_profiles(path):
+    from smart_budget_buddy.utils.data_loader import PROFILE_SCHEMA, read_csv_typed
+    read_csv_typed(path, PROFILE_SCHEMA)
+
+
+def _run_read_transactions(path):
+    from smart_budget_buddy.utils.data_loader import read_transactions
+    read_transactions(path)
+
+
+def _transactions(rows, workdir):
+    from smart_budget_buddy.benchmarks.synthetic_data import make_transactions
+    return make_transactions(rows)
+
+
+def _run_analyze(df):
+    from smart_budget_buddy.agents.spending_analyzer import SpendingAnalyzerAgent
+    SpendingAnalyzerAgent(df).analyze()
+
+
+def _setup_alerts(rows, workdir):
+    from smart_budget_buddy.agents.budget_planner import BudgetPlannerAgent
+    from smart_budget_buddy.benchmarks.synthetic_data import make_profiles
+    profile = make_profiles(1).iloc[0].to_dict()
+    return BudgetPlannerAgent(profile).generate_budget(), _transactions(rows, workdir)
+
+
+def _run_monthly_alerts(state):
+    from smart_budget_buddy.agents.alerts_agent import AlertsAgent
+    budget, df = state
+    AlertsAgent(budget, {"category_breakdown": {}}).check_monthly_alerts(df)
+
+
+def _run_forecast(df):
+    from smart_budget_buddy.agents.forecasting_agent import ForecastingAgent
+    agent = ForecastingAgent(df)
+    agent.predict_next_month()
+    agent.predict_by_category()
+
+
+def _setup_profiles(rows, workdir):
+    from smart_budget_buddy.benchmarks.synthetic_data import make_profiles
+    return make_profiles(rows)
+
+
+def _run_generate_budgets(df):
+    from smart_budget_buddy.agents.budget_planner import generate_budgets
+    generate_budgets(df)
+
+
+def _setup_memory_store(rows, workdir):
+    from smart_budget_buddy.utils.memory_store import MemoryStore
+    return MemoryStore(os.path.join(workdir, 'user_data.json'), journal=True), rows
+
+
+def _run_memory_store(state):
+    store, rows = state
+    for i in range(rows):
+        store.add_chat_message('user' if i % 2 == 0 else 'assistant', f"message {i} about my grocery budget")
+    store.save_data()
+
+
+# name -> (setup, run, max_rows); a row is one record processed (one chat message for the store).
+CASES = {
+    'loader.read_transactions': (_transactions_csv, _run_read_transactions, 100_000_000),
+    'loader.cached_load': (_setup_cached_load, _run_cached_load, 100_000_000),
+    'loader.read_profiles': (_setup_profiles_csv, _run_read_profiles, 100_000_000),
+    'spending_analyzer.analyze': (_transactions, _run_analyze, 100_000_000),
+    'alerts.check_monthly_alerts': (_setup_alerts, _run_monthly_alerts, 100_000_000),
+    'forecasting.predict': (_transactions, _run_forecast, 100_000_000),
+    'budget_planner.generate_budgets': (_setup_profiles, _run_generate_budgets, 100_000_000),
+    # Every message is a journal write; beyond this the case measures the disk.
+    'memory_store.add_chat_message': (_setup_memory_store, _run_memory_store, 1_000_000)
+}
+
+
+# --- Peak RSS (Linux /proc, then getrusage on Unix, then psutil; None if none work) ---
+
+def _proc_status_mb(field):
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    # Writing 5 to clear_refs resets VmHWM, so setup allocations don't mask the case's peak.
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb():
+    peak = _proc_status_mb('VmHWM')
+    if peak is not None:
+        return peak
+    try:
+        import resource  # Unix only
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / 1024 ** 2 if sys.platform == 'darwin' else maxrss / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    # Windows tracks the peak working set; elsewhere only the current RSS is known.
+    return getattr(info, 'peak_wset', info.rss) / 1024 ** 2
+
+
+def measure(case, rows, repeat):
+    """Runs one case in this process; returns seconds (best of `repeat`), rows/sec and peak RSS."""
+    warnings.simplefilter('ignore')  # to_period() on tz-aware dates warns on every call
+    setup, run, _ = CASES[case]
+    with tempfile.TemporaryDirectory() as workdir:
+        state = setup(rows, workdir)
+        run(state)  # warm-up: imports, caches, first-touch page faults
+        gc.collect()
+        isolated = _reset_peak_rss()
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(state)
+            times.append(time.perf_counter() - start)
+        seconds = min(times)
+        peak = _peak_rss_mb()
+        return {
+            "seconds": round(seconds, 6),
+            "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+            "peak_rss_mb": round(peak, 1) if peak is not None else None,
+            "rss_isolated": isolated
+        }
+
+
+def _run_child(case, rows, repeat):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    proc = subprocess.run(
+        [sys.executable, '-m', 'smart_budget_buddy.benchmarks.suite', '--child', case, str(rows), str(repeat)],
+        capture_output=True, text=True, env=env, cwd=REPO_ROOT)
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _environment():
+    import numpy as np
+    import pandas as pd
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "recorded_at": time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"environment": {}, "results": {}}
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Merges `results` into the baseline file, replacing measured cases only."""
+    baseline = load_baseline(path)
+    baseline["environment"] = _environment()
+    baseline["results"].update({key: r for key, r in results.items() if "error" not in r})
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def compare(result, base, tolerance=DEFAULT_TOLERANCE):
+    """Flags for one case against its baseline entry: slower and/or bigger, or faster."""
+    flags = []
+    if "error" in result or not base:
+        return flags
+    seconds, base_seconds = result["seconds"], base["seconds"]
+    if seconds > base_seconds * (1 + tolerance) and seconds - base_seconds > MIN_SECONDS_DELTA:
+        flags.append(f"REGRESSION time +{seconds / base_seconds - 1:.0%}")
+    elif seconds < base_seconds * (1 - tolerance) and base_seconds - seconds > MIN_SECONDS_DELTA:
+        flags.append(f"faster {1 - seconds / base_seconds:.0%}")
+    rss, base_rss = result.get("peak_rss_mb"), base.get("peak_rss_mb")
+    if rss is None or base_rss is None:
+        return flags  # RSS unavailable on this platform
+    if rss > base_rss * (1 + tolerance) and rss - base_rss > MIN_RSS_MB_DELTA:
+        flags.append(f"REGRESSION memory +{rss / base_rss - 1:.0%}")
+    return flags
+
+
+def _environment_changes(recorded):
+    # Timings only compare on the same machine and library versions.
+    current = _environment()
+    return [f"{key} {recorded[key]} -> {current[key]}" for key in ("python", "pandas", "numpy", "machine", "cpus")
+            if key in recorded and recorded[key] != current[key]]
+
+
+def run(cases, sizes, repeat=3, baseline_path=BASELINE_PATH, save=False, tolerance=DEFAULT_TOLERANCE):
+    """Runs every case at every size; returns (results, number of regressions)."""
+    stored = load_baseline(baseline_path)
+    baseline = stored["results"]
+    changes = _environment_changes(stored["environment"])
+    if baseline and changes:
+        print(f"Note: baseline recorded in a different environment ({', '.join(changes)}); "
+              "re-record it with --save-baseline before trusting regressions.")
+    results = {}
+    regressions = 0
+    print(f"{'case':34} {'rows':>12} {'seconds':>10} {'rows/s':>14} {'peak RSS':>10}  vs baseline")
+    for case in cases:
+        for rows in sizes:
+            if rows > CASES[case][2]:
+                continue
+            key = f"{case}@{rows}"
+            result = results[key] = _run_child(case, rows, repeat)
+            if "error" in result:
+                print(f"{case:34} {rows:>12,} ERROR: {result['error']}")
+                continue
+            flags = compare(result, baseline.get(key), tolerance)
+            regressions += any(flag.startswith("REGRESSION") for flag in flags)
+            note = ", ".join(flags) or ("ok" if key in baseline else "no baseline")
+            rss = result['peak_rss_mb']
+            rss = f"{rss:>8.0f}MB" if rss is not None else f"{'n/a':>10}"
+            print(f"{case:34} {rows:>12,} {result['seconds']:>10.4f} {result['rows_per_sec'] or 0:>14,.0f} "
+                  f"{rss}  {note}")
+    if save:
+        save_baseline(results, baseline_path)
+        print(f"Baseline saved to {baseline_path}")
+    elif regressions:
+        print(f"{regressions} regression(s) against {baseline_path}")
+    return results, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cases', default=','.join(CASES), help="comma-separated case names")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="comma-separated row counts, k/M suffixes allowed")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--child', nargs=3, metavar=('CASE', 'ROWS', 'REPEAT'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        case, rows, repeat = args.child
+        print(json.dumps(measure(case, int(rows), int(repeat))))
+        return 0
+
+    cases = [c.strip() for c in args.cases.split(',') if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s) {unknown}; choose from {list(CASES)}")
+    sizes = [parse_size(s) for s in args.sizes.split(',') if s.strip()]
+    _, regressions = run(cases, sizes, args.repeat, args.baseline, args.save_baseline, args.tolerance)
+    return 1 if regressions and not args.save_baseline else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Seeded synthetic student profiles and transaction exports in the schemas of
+the real datasets, from a thousand to a hundred million rows. Large sizes are
+generated and written in chunks, so memory stays flat.
+
+Write a dataset directory that DataLoader/load_profiles()/load_transactions()
+can read (point SBB_DATASET_DIR at it). Run from the repository root
+(sizes accept k/M suffixes and are optional):
+    python -m smart_budget_buddy.benchmarks.synthetic_data ./synthetic 1k 1M
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from smart_budget_buddy.utils.data_loader import PROFILE_FILE, TRANSACTION_FILE
+
+CHUNK_ROWS = 1_000_000
+DATE_POOL_SIZE = 200_000
+HISTORY_START = '2022-01-01'
+HISTORY_DAYS = 2 * 365
+
+# Category labels as they appear in the bank export (typos included).
+CATEGORIES = ['Market', 'Coffe', 'Restuarant', 'Transport', 'Taxi', 'Travel', 'Rent_Car', 'Clothing',
+              'Phone', 'Learning', 'Events', 'Film/enjoyment', 'Sport', 'Health', 'Communal', 'Other']
+
+GENDERS = ['Male', 'Female', 'Non-binary']
+YEARS_IN_SCHOOL = ['Freshman', 'Sophomore', 'Junior', 'Senior']
+MAJORS = ['Psychology', 'Economics', 'Computer Science', 'Engineering', 'Biology']
+PAYMENT_METHODS = ['Cash', 'Credit/Debit Card', 'Mobile Payment App']
+
+# Uniform integer ranges of the student spending survey, per column, in column order.
+PROFILE_RANGES = {
+    'age': (18, 25),
+    'monthly_income': (500, 1500),
+    'financial_aid': (0, 1500),
+    'tuition': (3000, 10000),
+    'housing': (400, 1500),
+    'food': (100, 500),
+    'transportation': (50, 300),
+    'books_supplies': (50, 300),
+    'entertainment': (20, 150),
+    'personal_care': (20, 150),
+    'technology': (50, 300),
+    'health_wellness': (30, 200),
+    'miscellaneous': (20, 200)
+}
+
+
+def parse_size(text):
+    """'1k' -> 1000, '100M' -> 100000000, '2500' -> 2500."""
+    text = str(text).strip()
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1:].lower(), 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def _categorical(rng, labels, n):
+    # Codes, not strings: 100M labels as Python strings would not fit in memory.
+    return pd.Categorical.from_codes(rng.integers(0, len(labels), n), categories=labels)
+
+
+def make_profiles(n, seed=0):
+    """Student profiles with the normalized columns and dtypes of load_profiles()."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, (low, high) in PROFILE_RANGES.items():
+        columns[name] = rng.integers(low, high + 1, n)
+        if name == 'age':
+            columns['gender'] = _categorical(rng, GENDERS, n)
+            columns['year_in_school'] = _categorical(rng, YEARS_IN_SCHOOL, n)
+            columns['major'] = _categorical(rng, MAJORS, n)
+    columns['preferred_payment_method'] = _categorical(rng, PAYMENT_METHODS, n)
+    return pd.DataFrame(columns)
+
+
+def iter_transactions(n, seed=0, chunk_rows=CHUNK_ROWS):
+    """Yields transactions (UTC `date`, categorical `category`, `amount`) in chunks."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(HISTORY_START, tz='UTC')
+    for offset in range(0, n, chunk_rows):
+        rows = min(chunk_rows, n - offset)
+        seconds = rng.integers(0, HISTORY_DAYS * 24 * 3600, rows)
+        yield pd.DataFrame({
+            'date': start + pd.to_timedelta(seconds, unit='s'),
+            'category': _categorical(rng, CATEGORIES, rows),
+            'amount': rng.gamma(2.0, 15.0, rows).round(2)
+        })
+
+
+def make_transactions(n, seed=0):
+    """Transactions in the normalized schema of read_transactions()."""
+    chunks = list(iter_transactions(n, seed))
+    if not chunks:
+        return next(iter_transactions(1, seed)).iloc[:0]
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+
+def write_profiles_csv(path, n, seed=0):
+    """The profiles in the survey CSV layout (leading unnamed index column)."""
+    make_profiles(n, seed).to_csv(path)
+
+
+def _write_export(path, rng, n=None, target_bytes=None):
+    start = pd.Timestamp(HISTORY_START)
+    # Formatting timestamps dominates writing, so rows sample from a pool of formatted stamps.
+    seconds = np.sort(rng.integers(0, HISTORY_DAYS * 24 * 3600, DATE_POOL_SIZE))
+    pool = np.array((start + pd.to_timedelta(seconds, unit='s')).strftime('%Y-%m-%d %H:%M:%S +0000'), dtype=object)
+    labels = np.array(CATEGORIES, dtype=object)
+    written = 0
+    with open(path, 'w') as f:
+        f.write("Date,Category,Amount\n")
+        while written < n if n is not None else f.tell() < target_bytes:
+            rows = CHUNK_ROWS if n is None else min(CHUNK_ROWS, n - written)
+            pd.DataFrame({
+                'Date': pool[rng.integers(0, DATE_POOL_SIZE, rows)],
+                'Category': labels[rng.integers(0, len(labels), rows)],
+                'Amount': rng.gamma(2.0, 15.0, rows).round(2)
+            }).to_csv(f, header=False, index=False)
+            written += rows
+
+
+def write_transactions_csv(path, n, seed=0):
+    """The transactions in the bank export layout: Date,Category,Amount with '+0000' stamps."""
+    _write_export(path, np.random.default_rng(seed), n=n)
+
+
+def write_export(path, target_bytes, seed=0):
+    """Like write_transactions_csv(), sized in bytes (whole chunks of CHUNK_ROWS rows) rather than rows."""
+    _write_export(path, np.random.default_rng(seed), target_bytes=target_bytes)
+
+
+def write_dataset(directory, n_profiles=1000, n_transactions=100_000, seed=0):
+    """Writes both files under the names load_profiles()/load_transactions() expect."""
+    os.makedirs(directory, exist_ok=True)
+    write_profiles_csv(os.path.join(directory, PROFILE_FILE), n_profiles, seed)
+    write_transactions_csv(os.path.join(directory, TRANSACTION_FILE), n_transactions, seed)
+    return directory
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else 'synthetic_dataset'
+    n_profiles = parse_size(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    n_transactions = parse_size(sys.argv[3]) if len(sys.argv) > 3 else 100_000
+    write_dataset(directory, n_profiles, n_transactions)
+    print(f"Wrote {n_profiles:,} profiles and {n_transactions:,} transactions to {os.path.abspath(directory)}")
+    print(f"Use it with: SBB_DATASET_DIR={os.path.abspath(directory)}")
@@ -7,6 +7,18 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from smart_budget_buddy.pipeline.main_workflow import run_pipeline
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        # python main.py --batch [output.jsonl]
+        from smart_budget_buddy.pipeline.batch_workflow import run_batch
+        run_batch(*sys.argv[2:3])
+        sys.exit(0)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        # python main.py --serve [--port 8080 --data-dir user_data ...]
+        from smart_budget_buddy.service import main as serve_main
+        serve_main(sys.argv[2:])
+        sys.exit(0)
+
     student_id = 0
     if len(sys.argv) > 1:
         try:
@@ -1,35 +1,37 @@
 # from smart_budget_buddy.utils.data_loader import load_profiles, load_transactions, get_student_profile
 from smart_budget_buddy.agents.budget_planner import BudgetPlannerAgent
-from smart_budget_buddy.agents.spending_analyzer import SpendingAnalyzerAgent
-from smart_budget_buddy.agents.forecasting_agent import ForecastingAgent
 from smart_budget_buddy.agents.alerts_agent import AlertsAgent
 from smart_budget_buddy.agents.financial_literacy import FinancialLiteracyAgent
+from smart_budget_buddy.pipeline.stage_graph import Stage, StageGraph
+from smart_budget_buddy.utils.instrumentation import traced
 import json
 
-def run_pipeline(student_id=0):
-    print(f"--- Running Smart Budget Buddy (Manual Mode) ---")
-    
-    # 1. Define Manual Profile (Mock Data for CLI)
-    profile = {
+TIP_QUESTION = "How do I start saving?"
+# The tip is the only network-bound stage; a slow model must not hold up the report.
+TIP_TIMEOUT_SECONDS = 45
+TIP_FALLBACK = "Financial tip unavailable right now. Try again later."
+
+
+def manual_profile():
+    # Manual Profile (Mock Data for CLI)
+    return {
         'monthly_income': 1000,
         'financial_aid': 0,
         'housing': 400,
         'tuition': 200,
         'transportation': 50,
-        'food': 0, 'books_supplies': 0, 'entertainment': 0, 
+        'food': 0, 'books_supplies': 0, 'entertainment': 0,
         'personal_care': 0, 'technology': 0, 'health_wellness': 0, 'miscellaneous': 0
     }
-    
-    # 2. Budget Planner
-    planner = BudgetPlannerAgent(profile)
-    budget = planner.generate_budget()
-    print("\n--- Budget Plan ---")
-    print(json.dumps(budget, indent=2, default=str))
 
-    # 3. Spending Analyzer (Skipped in CLI Manual Mode or Mocked)
-    print("\n--- Spending Analysis ---")
-    print("(Transaction analysis requires CSV upload in Streamlit app)")
-    analysis = {
+
+def budget_stage(profile):
+    return BudgetPlannerAgent(profile).generate_budget()
+
+
+def analysis_stage():
+    # Spending Analyzer (Skipped in CLI Manual Mode or Mocked)
+    return {
         "total_spent": 0,
         "category_breakdown": {},
         "average_daily_spending": 0,
@@ -37,29 +39,61 @@ def run_pipeline(student_id=0):
         "top_categories": {}
     }
 
-    # 4. Alerts
-    alerts_agent = AlertsAgent(budget, analysis)
-    alerts = alerts_agent.check_alerts()
+
+def alerts_stage(budget, analysis):
+    return AlertsAgent(budget, analysis).check_alerts()
+
+
+def forecast_stage():
+    return {}
+
+
+def tip_stage():
+    return FinancialLiteracyAgent().ask(TIP_QUESTION)
+
+
+def build_graph(cache=None):
+    """
+    The CLI pipeline as a stage graph. The tip does not depend on the budget,
+    so the LLM call overlaps with planning and alerts instead of following them.
+    """
+    return StageGraph([
+        Stage("budget", budget_stage, deps=["profile"]),
+        Stage("analysis", analysis_stage),
+        Stage("alerts", alerts_stage, deps=["budget", "analysis"]),
+        Stage("forecast", forecast_stage),
+        Stage("tip", tip_stage, timeout=TIP_TIMEOUT_SECONDS, fallback=TIP_FALLBACK)
+    ], cache=cache)
+
+
+@traced("run_pipeline")
+def run_pipeline(student_id=0, mode='thread'):
+    print(f"--- Running Smart Budget Buddy (Manual Mode) ---")
+
+    graph = build_graph()
+    results = graph.run({"profile": manual_profile()}, mode=mode)
+
+    print("\n--- Budget Plan ---")
+    print(json.dumps(results["budget"], indent=2, default=str))
+
+    print("\n--- Spending Analysis ---")
+    print("(Transaction analysis requires CSV upload in Streamlit app)")
+
     print("\n--- Alerts ---")
-    print(json.dumps(alerts, indent=2))
+    print(json.dumps(results["alerts"], indent=2))
 
-    # 5. Forecasting
     print("\n--- Forecast ---")
     print("(Forecasting requires transaction history)")
-    forecast = {}
 
-    # 6. Financial Literacy
-    literacy = FinancialLiteracyAgent()
-    tip = literacy.ask("How do I start saving?")
     print("\n--- Financial Tip ---")
-    print(tip)
-    
+    print(results["tip"])
+
     return {
-        "budget": budget,
-        "analysis": analysis,
-        "alerts": alerts,
-        "forecast": forecast,
-        "tip": tip
+        "budget": results["budget"],
+        "analysis": results["analysis"],
+        "alerts": results["alerts"],
+        "forecast": results["forecast"],
+        "tip": results["tip"]
     }
 
 
@@ -0,0 +1,240 @@
+import contextvars
+import time
+
+from smart_budget_buddy.utils.instrumentation import span
+
+_NO_FALLBACK = object()
+
+
+class StageError(Exception):
+    def __init__(self, stage, message):
+        super().__init__(f"Stage '{stage}' {message}")
+        self.stage = stage
+
+
+class StageTimeout(StageError):
+    pass
+
+
+def _call_stage(name, func, kwargs):
+    with span("stage." + name):
+        return func(**kwargs)
+
+
+class Stage:
+    """
+    One step of a pipeline: `func(**results_of_deps)`.
+
+    `timeout` (seconds) bounds the stage; when it runs out the stage yields
+    `fallback` if one was given, otherwise the run fails with StageTimeout.
+    With `cache=True` the result is reused from the graph's cache for equal
+    dependency results (which must then be JSON-like).
+    """
+
+    def __init__(self, name, func, deps=(), timeout=None, fallback=_NO_FALLBACK, cache=False):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.timeout = timeout
+        self.fallback = fallback
+        self.cache = cache
+
+
+class StageGraph:
+    """
+    A declarative DAG of Stages run with as much concurrency as the
+    dependencies allow, so wall time follows the critical path.
+
+    Modes: 'thread' (default; best for I/O such as LLM calls), 'process'
+    (CPU-bound stages; functions and results must be picklable) and
+    'asyncio' (coroutine functions are awaited, plain ones run in threads).
+    A timed-out thread or process stage is abandoned, not killed.
+    """
+
+    def __init__(self, stages, cache=None):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+        self.cache = cache
+        self.last_timings = {}
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Cycle in stage graph: {' -> '.join(path + [name])}")
+            state[name] = 'visiting'
+            for dep in self.stages[name].deps if name in self.stages else ():
+                visit(dep, path + [name])
+            state[name] = 'done'
+
+        for name in self.stages:
+            visit(name, [])
+
+    def _cache_key(self, stage, kwargs):
+        # Deferred: hashlib is only needed once a stage is cached.
+        from smart_budget_buddy.utils.result_cache import content_hash
+        return content_hash("stage", stage.name, kwargs)
+
+    def _start(self, stage, results):
+        kwargs = {dep: results[dep] for dep in stage.deps}
+        key = None
+        if stage.cache and self.cache is not None:
+            key = self._cache_key(stage, kwargs)
+            cached = self.cache.get(key, _NO_FALLBACK)
+            if cached is not _NO_FALLBACK:
+                return kwargs, key, cached
+        return kwargs, key, _NO_FALLBACK
+
+    def _finish(self, stage, key, value, results, started, cached=False, timed_out=False):
+        if key is not None and not timed_out:
+            self.cache.put(key, value)
+        results[stage.name] = value
+        self.last_timings[stage.name] = {"start": started, "end": time.perf_counter(),
+                                         "cached": cached, "timed_out": timed_out}
+
+    def _timed_out(self, stage, key, results, started):
+        if stage.fallback is _NO_FALLBACK:
+            raise StageTimeout(stage.name, f"timed out after {stage.timeout}s")
+        self._finish(stage, key, stage.fallback, results, started, timed_out=True)
+
+    def _missing_inputs(self, inputs):
+        needed = {dep for stage in self.stages.values() for dep in stage.deps}
+        missing = needed - set(self.stages) - set(inputs)
+        if missing:
+            raise ValueError(f"Missing pipeline inputs: {sorted(missing)}")
+
+    def run(self, inputs=None, mode='thread', max_workers=None):
+        """Runs every stage and returns {name: result}, including `inputs`."""
+        if mode == 'asyncio':
+            import asyncio
+            return asyncio.run(self.run_async(inputs))
+        if mode not in ('thread', 'process'):
+            raise ValueError(f"Unknown mode: {mode}")
+        # Deferred: concurrent.futures costs several ms at pipeline import.
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+        results = dict(inputs or {})
+        self._missing_inputs(results)
+        self.last_timings = {}
+        remaining = dict(self.stages)
+        running = {}  # future -> (stage, key, started, deadline)
+        executor_cls = ThreadPoolExecutor if mode == 'thread' else ProcessPoolExecutor
+        executor = executor_cls(max_workers=max_workers or max(len(self.stages), 1))
+        try:
+            while remaining or running:
+                for name, stage in list(remaining.items()):
+                    if not all(dep in results for dep in stage.deps):
+                        continue
+                    del remaining[name]
+                    started = time.perf_counter()
+                    kwargs, key, cached = self._start(stage, results)
+                    if cached is not _NO_FALLBACK:
+                        self._finish(stage, None, cached, results, started, cached=True)
+                        continue
+                    deadline = started + stage.timeout if stage.timeout else None
+                    if mode == 'thread':
+                        # Carry the caller's context so stage spans nest under the run's span.
+                        future = executor.submit(contextvars.copy_context().run, _call_stage,
+                                                 stage.name, stage.func, kwargs)
+                    else:
+                        future = executor.submit(stage.func, **kwargs)
+                    running[future] = (stage, key, started, deadline)
+
+                if not running:
+                    continue  # cache hits made more stages ready
+                deadlines = [d for _, _, _, d in running.values() if d is not None]
+                wait_for = max(min(deadlines) - time.perf_counter(), 0) if deadlines else None
+                done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    stage, key, started, _ = running.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        raise StageError(stage.name, f"failed: {e}") from e
+                    self._finish(stage, key, value, results, started)
+
+                now = time.perf_counter()
+                for future, (stage, key, started, deadline) in list(running.items()):
+                    if deadline is not None and now >= deadline:
+                        del running[future]
+                        future.cancel()
+                        self._timed_out(stage, key, results, started)
+        finally:
+            # Don't wait for abandoned (timed-out) stages.
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    async def run_async(self, inputs=None):
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        loop = asyncio.get_running_loop()
+        # A private pool, not asyncio.to_thread: asyncio.run() joins the default
+        # executor on exit, which would wait out every abandoned stage.
+        executor = ThreadPoolExecutor(max_workers=max(len(self.stages), 1))
+        results = dict(inputs or {})
+        self._missing_inputs(results)
+        self.last_timings = {}
+        done_events = {name: asyncio.Event() for name in self.stages}
+
+        async def run_stage(stage):
+            for dep in stage.deps:
+                if dep in done_events:
+                    await done_events[dep].wait()
+            started = time.perf_counter()
+            kwargs, key, cached = self._start(stage, results)
+            if cached is not _NO_FALLBACK:
+                self._finish(stage, None, cached, results, started, cached=True)
+            else:
+                if asyncio.iscoroutinefunction(stage.func):
+                    call = stage.func(**kwargs)
+                else:
+                    call = loop.run_in_executor(executor, contextvars.copy_context().run, _call_stage,
+                                                stage.name, stage.func, kwargs)
+                try:
+                    value = await asyncio.wait_for(call, stage.timeout)
+                except asyncio.TimeoutError:
+                    self._timed_out(stage, key, results, started)
+                except Exception as e:
+                    raise StageError(stage.name, f"failed: {e}") from e
+                else:
+                    self._finish(stage, key, value, results, started)
+            done_events[stage.name].set()
+
+        tasks = [asyncio.ensure_future(run_stage(stage)) for stage in self.stages.values()]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    def critical_path(self):
+        """Stages of the last run on the longest chain of dependencies, by elapsed time."""
+        finish, best_dep = {}, {}
+
+        def longest(name):
+            if name not in finish:
+                timing = self.last_timings.get(name)
+                own = timing["end"] - timing["start"] if timing else 0.0
+                deps = [dep for dep in self.stages[name].deps if dep in self.stages]
+                prior = max(deps, key=longest) if deps else None
+                best_dep[name] = prior
+                finish[name] = own + (longest(prior) if prior else 0.0)
+            return finish[name]
+
+        end = max(self.stages, key=longest)
+        path = []
+        while end is not None:
+            path.append(end)
+            end = best_dep[end]
+        return list(reversed(path)), finish[path[0]]
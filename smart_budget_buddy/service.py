@@ -0,0 +1,454 @@
+"""
+Headless HTTP/JSON API for the agents, for serving many students from one box.
+
+One asyncio event loop handles the connections. Pandas work (analyze, alerts,
+forecast) runs on a process pool and chat and storage I/O on a thread pool,
+so the loop stays responsive. Each user has their own journaled MemoryStore
+partition (see utils/user_stores.py) and their requests that touch it run
+one at a time. A request past its timeout gets a 504, but its work finishes
+in the background, still holding the user's lock. Past `max_pending`
+in-flight requests, new ones get an immediate 503 with Retry-After instead
+of queueing without bound.
+
+    POST /budget    {"user_id", "profile"?}            -> budget plan (saved for the user)
+    POST /analyze   {"transactions": [...]} or {"csv"} -> spending analysis
+    POST /alerts    {"user_id" or "budget", transactions or csv} -> alerts
+    POST /forecast  {"transactions": [...]} or {"csv"} -> next month, overall and by category
+    POST /chat      {"user_id", "message"}             -> {"answer"}
+    GET  /health, GET /metrics (Prometheus text)
+
+Run from the repository root:
+    python -m smart_budget_buddy.service --port 8080 --data-dir user_data
+"""
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import sys
+import weakref
+
+# Add the project root directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_budget_buddy.agents.budget_planner import BudgetPlannerAgent
+from smart_budget_buddy.utils import instrumentation
+from smart_budget_buddy.utils.user_stores import UserStores
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_HEADER_LINES = 100
+IDLE_TIMEOUT_SECONDS = 30
+REQUEST_TIMEOUT_SECONDS = 60
+RETRY_AFTER_SECONDS = 1
+
+STATUS_TEXT = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable',
+    504: 'Gateway Timeout'
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+def _json_default(value):
+    # numpy scalars become plain numbers; Periods, Timestamps and the rest, strings.
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+# --- CPU-bound jobs: module-level so worker processes can unpickle them ---
+
+def transactions_frame(payload):
+    """Transactions from {"csv": "..."} or {"transactions": [{"date", "category", "amount"}, ...]}."""
+    import io
+    import pandas as pd
+    from smart_budget_buddy.utils.data_loader import normalize_column, read_transactions
+
+    if payload.get("csv") is not None:
+        return read_transactions(io.BytesIO(str(payload["csv"]).encode('utf-8')))
+    records = payload.get("transactions")
+    if not isinstance(records, list) or not records:
+        raise ValueError("Send 'transactions' (a non-empty list) or 'csv'.")
+    df = pd.DataFrame.from_records(records)
+    df.columns = [normalize_column(c) for c in df.columns]
+    if 'category' not in df.columns or 'amount' not in df.columns:
+        raise ValueError("Each transaction needs 'category' and 'amount'.")
+    df['category'] = df['category'].astype('category')
+    df['amount'] = pd.to_numeric(df['amount']).astype(float)
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'], utc=True, format='ISO8601')
+    return df
+
+
+def analyze_job(payload):
+    from smart_budget_buddy.agents.spending_analyzer import SpendingAnalyzerAgent
+    return SpendingAnalyzerAgent(transactions_frame(payload)).analyze()
+
+
+def alerts_job(budget, payload):
+    from smart_budget_buddy.agents.alerts_agent import AlertsAgent
+    from smart_budget_buddy.agents.spending_analyzer import SpendingAnalyzerAgent
+    df = transactions_frame(payload)
+    analysis = SpendingAnalyzerAgent(df).analyze()
+    agent = AlertsAgent(budget, analysis)
+    # Limits are monthly, so with dates each calendar month is checked on its own.
+    return agent.check_monthly_alerts(df) if 'date' in df.columns else agent.check_alerts()
+
+
+def forecast_job(payload):
+    from smart_budget_buddy.agents.forecasting_agent import ForecastingAgent
+    from smart_budget_buddy.agents.spending_analyzer import SpendingAnalyzerAgent
+    df = transactions_frame(payload)
+    if 'date' not in df.columns:
+        raise ValueError("Forecasting requires a 'date' on each transaction.")
+    agent = ForecastingAgent(df, monthly_spending=SpendingAnalyzerAgent(df).monthly_totals())
+    return {"next_month": agent.predict_next_month(), "by_category": agent.predict_by_category()}
+
+
+def _warm_worker():
+    # Pays pandas and agent imports once per worker, before the first request.
+    import smart_budget_buddy.agents.alerts_agent
+    import smart_budget_buddy.agents.forecasting_agent
+    import smart_budget_buddy.agents.spending_analyzer
+    return os.getpid()
+
+
+class BudgetService:
+    """
+    The API behind serve(). `executor='process'` (default) runs pandas jobs
+    on `cpu_workers` processes; 'thread' keeps them in-process.
+    """
+
+    def __init__(self, data_dir='user_data', cpu_workers=None, io_workers=32, max_pending=256,
+                 executor='process', api_key=None, max_open_users=1024):
+        self.stores = UserStores(data_dir, max_open=max_open_users)
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.io_workers = io_workers
+        self.max_pending = max_pending
+        self.executor = executor
+        self.api_key = api_key
+        self.pending = 0
+        self.requests = 0
+        self.rejected = 0
+        self.cpu_pool = None
+        self.io_pool = None
+        self.server = None
+        self._cpu_slots = None
+        self._user_locks = weakref.WeakValueDictionary()
+        self._connections = {}  # handler task -> writer
+        self._timed_out = set()  # handler tasks left running after a 504 or a dropped connection
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/metrics'): self.metrics,
+            ('POST', '/budget'): self.budget,
+            ('POST', '/analyze'): self.analyze,
+            ('POST', '/alerts'): self.alerts,
+            ('POST', '/forecast'): self.forecast,
+            ('POST', '/chat'): self.chat
+        }
+
+    async def start(self, host='127.0.0.1', port=8080):
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        self.io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix='sbb-io')
+        if self.executor == 'process':
+            import multiprocessing
+            # spawn, not fork: the loop process already runs I/O threads.
+            self.cpu_pool = ProcessPoolExecutor(max_workers=self.cpu_workers,
+                                                mp_context=multiprocessing.get_context('spawn'))
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[loop.run_in_executor(self.cpu_pool, _warm_worker)
+                                   for _ in range(self.cpu_workers)])
+        else:
+            self.cpu_pool = ThreadPoolExecutor(max_workers=self.cpu_workers, thread_name_prefix='sbb-cpu')
+        # Jobs beyond this wait here, not in the pool's unbounded queue.
+        self._cpu_slots = asyncio.Semaphore(self.cpu_workers * 2)
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            # Idle keep-alive connections see EOF and their handlers return.
+            for writer in list(self._connections.values()):
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self.server.wait_closed()
+        await asyncio.gather(*self._timed_out, return_exceptions=True)
+        for pool in (self.cpu_pool, self.io_pool):
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+        self.stores.close()
+
+    # --- execution helpers ---
+
+    async def _io(self, func, *args):
+        # Copy the context so agent spans nest under the request's span.
+        call = functools.partial(contextvars.copy_context().run, func, *args)
+        return await asyncio.get_running_loop().run_in_executor(self.io_pool, call)
+
+    async def _cpu(self, func, *args):
+        async with self._cpu_slots:
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self.cpu_pool, func, *args)
+            except (ValueError, KeyError, TypeError) as e:
+                raise HTTPError(400, str(e))
+
+    def _user_lock(self, user_id):
+        lock = self._user_locks.get(user_id)
+        if lock is None:
+            lock = self._user_locks[user_id] = asyncio.Lock()
+        return lock
+
+    @contextlib.asynccontextmanager
+    async def _user_store(self, user_id):
+        """The user's store, used under their lock and kept open until done."""
+        async with self._user_lock(user_id):
+            store = await self._io(self.stores.acquire, user_id)
+            try:
+                yield store
+            finally:
+                await self._io(self.stores.release, user_id)
+
+    @staticmethod
+    def _user_id(body, required=True):
+        user_id = body.get("user_id")
+        if user_id is None or user_id == "":
+            if required:
+                raise HTTPError(400, "Missing 'user_id'.")
+            return None
+        return str(user_id)
+
+    # --- handlers: body dict -> JSON-able result ---
+
+    async def health(self, body):
+        return {"status": "ok", "pending": self.pending, "open_users": self.stores.open_count()}
+
+    async def metrics(self, body):
+        lines = [
+            "# HELP sbb_service_requests_total HTTP requests received.",
+            "# TYPE sbb_service_requests_total counter",
+            f"sbb_service_requests_total {self.requests}",
+            "# HELP sbb_service_rejected_total Requests shed with 503 under load.",
+            "# TYPE sbb_service_rejected_total counter",
+            f"sbb_service_rejected_total {self.rejected}",
+            "# HELP sbb_service_pending_requests Requests in flight.",
+            "# TYPE sbb_service_pending_requests gauge",
+            f"sbb_service_pending_requests {self.pending}"
+        ]
+        return instrumentation.prometheus_text() + "\n".join(lines) + "\n"
+
+    async def budget(self, body):
+        user_id = self._user_id(body)
+        profile = body.get("profile")
+        if profile is not None and not isinstance(profile, dict):
+            raise HTTPError(400, "'profile' must be an object.")
+        async with self._user_store(user_id) as store:
+            merged = {**store.get_profile(), **(profile or {})}
+            if not merged:
+                raise HTTPError(400, "No profile saved for this user; send 'profile'.")
+            try:
+                budget = BudgetPlannerAgent(merged).generate_budget()
+            except TypeError as e:
+                raise HTTPError(400, f"Invalid profile: {e}")
+            # Saved only once it produced a budget, so a bad update can't stick.
+            if profile:
+                await self._io(store.update_profile, profile)
+            await self._io(store.save_budget_plan, budget)
+        return budget
+
+    async def analyze(self, body):
+        return await self._cpu(analyze_job, body)
+
+    async def forecast(self, body):
+        return await self._cpu(forecast_job, body)
+
+    async def alerts(self, body):
+        budget = body.get("budget")
+        if budget is None:
+            user_id = self._user_id(body)
+            async with self._user_store(user_id) as store:
+                budget = store.get_latest_budget()
+            if budget is None:
+                raise HTTPError(400, "No budget for this user; call /budget first or send 'budget'.")
+        if not isinstance(budget, dict) or 'category_limits' not in budget:
+            raise HTTPError(400, "'budget' needs 'category_limits'.")
+        return await self._cpu(alerts_job, budget, body)
+
+    async def chat(self, body):
+        from smart_budget_buddy.agents.financial_chat import FinancialLiteracyChatBot
+        user_id = self._user_id(body)
+        message = body.get("message")
+        if not isinstance(message, str) or not message.strip():
+            raise HTTPError(400, "Missing 'message'.")
+        factory = lambda store: FinancialLiteracyChatBot(api_key=self.api_key, memory=store)
+        # One turn at a time per user keeps their history in order.
+        async with self._user_store(user_id):
+            bot = await self._io(self.stores.session, user_id, "chat", factory)
+            answer = await self._io(bot.ask, message)
+        return {"answer": answer}
+
+    # --- HTTP ---
+
+    async def dispatch(self, method, path, body):
+        """Routes one request; returns (status, payload, extra headers)."""
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(p == path for _, p in self.routes):
+                raise HTTPError(405, f"{method} not allowed on {path}")
+            raise HTTPError(404, f"No route for {path}")
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPError(503, "Server busy, retry shortly.", {"Retry-After": str(RETRY_AFTER_SECONDS)})
+
+        self.pending += 1
+        with instrumentation.span("http " + path):
+            task = asyncio.ensure_future(handler(body))
+            task.add_done_callback(self._handler_done)
+            # Not wait_for: cancelling the handler would free the user's lock
+            # while its executor work is still writing to their store.
+            try:
+                done, _ = await asyncio.wait([task], timeout=REQUEST_TIMEOUT_SECONDS)
+            except asyncio.CancelledError:
+                self._timed_out.add(task)
+                raise
+        if not done:
+            self._timed_out.add(task)
+            raise HTTPError(504, f"Request took longer than {REQUEST_TIMEOUT_SECONDS}s")
+        return 200, task.result(), {}
+
+    def _handler_done(self, task):
+        # Pending counts handlers until they finish, including timed-out ones.
+        self.pending -= 1
+        if task in self._timed_out:
+            self._timed_out.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                print(f"Warning: timed-out request failed: {task.exception()!r}")
+
+    @staticmethod
+    async def _read_request(reader):
+        line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT_SECONDS)
+        if not line:
+            return None
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3:
+            raise HTTPError(400, "Malformed request line")
+        method, target, version = parts
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            header = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT_SECONDS)
+            if header in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = header.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(400, "Too many headers")
+        if 'transfer-encoding' in headers:
+            raise HTTPError(400, "Chunked bodies are not supported; send Content-Length.")
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, f"Body over {MAX_BODY_BYTES} bytes")
+        raw = await asyncio.wait_for(reader.readexactly(length), IDLE_TIMEOUT_SECONDS) if length else b''
+        return method.upper(), target.split('?', 1)[0], version, headers, raw
+
+    @staticmethod
+    def _parse_body(raw):
+        if not raw:
+            return {}
+        try:
+            body = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise HTTPError(400, "Body is not valid JSON")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        return body
+
+    @staticmethod
+    def _encode_response(status, payload, headers, keep_alive):
+        if isinstance(payload, str):
+            data = payload.encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            data = json.dumps(payload, default=_json_default).encode('utf-8')
+            content_type = 'application/json'
+        head = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(data)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(head) + "\r\n\r\n").encode('latin-1') + data
+
+    async def handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, version, headers, raw = request
+                    self.requests += 1
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+                    status, payload, extra = await self.dispatch(method, path, self._parse_body(raw))
+                except HTTPError as e:
+                    status, payload, extra = e.status, {"error": e.message}, e.headers
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, payload, extra = 500, {"error": f"{type(e).__name__}: {e}"}, {}
+                writer.write(self._encode_response(status, payload, extra, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+
+async def serve(host='127.0.0.1', port=8080, **options):
+    service = BudgetService(**options)
+    server = await service.start(host, port)
+    print(f"Smart Budget Buddy API on http://{host}:{port} "
+          f"({service.cpu_workers} CPU workers, max {service.max_pending} pending requests)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Smart Budget Buddy HTTP API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--data-dir', default='user_data', help="one MemoryStore partition per user")
+    parser.add_argument('--cpu-workers', type=int, default=None)
+    parser.add_argument('--max-pending', type=int, default=256)
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, data_dir=args.data_dir, cpu_workers=args.cpu_workers,
+                          max_pending=args.max_pending, executor=args.executor,
+                          api_key=os.environ.get('GOOGLE_API_KEY')))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,78 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import sys
 import os
+import io
 import json
+import time
 
 # Add the project root directory to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+# Agents and plotly only needed once a CSV is uploaded are imported where
+# they are used, so a cold worker renders the first page sooner.
 from smart_budget_buddy.agents.budget_planner import BudgetPlannerAgent
-from smart_budget_buddy.agents.spending_analyzer import SpendingAnalyzerAgent
-from smart_budget_buddy.agents.forecasting_agent import ForecastingAgent
-from smart_budget_buddy.agents.alerts_agent import AlertsAgent
 from smart_budget_buddy.agents.financial_chat import FinancialLiteracyChatBot
 from smart_budget_buddy.utils.memory_store import MemoryStore
+from smart_budget_buddy.utils.data_loader import read_transactions
+from smart_budget_buddy.utils.result_cache import ResultCache, content_hash
+from smart_budget_buddy.utils.response_cache import ResponseCache
+from smart_budget_buddy.utils import instrumentation
 
 # Initialize Memory
 memory = MemoryStore()
 
+
+@st.cache_resource
+def get_result_cache():
+    # Shared by all sessions of this server process.
+    return ResultCache(max_entries=32, max_bytes=256 * 1024 * 1024)
+
+
+@st.cache_resource
+def get_response_cache():
+    # Chat answers persist on disk so repeats are free across sessions and restarts.
+    return ResponseCache(max_entries=512, ttl_seconds=24 * 3600, persist_path='response_cache.sqlite')
+
+
+@st.cache_resource
+def get_tracing_sessions():
+    # Sessions with debug tracing checked; the last one to leave turns it off.
+    return set()
+
+
+@instrumentation.traced("streamlit.analyze_upload")
+def analyze_upload(data):
+    """Parses an uploaded CSV and runs the budget-independent agents on it."""
+    from smart_budget_buddy.agents.spending_analyzer import SpendingAnalyzerAgent
+    from smart_budget_buddy.agents.forecasting_agent import ForecastingAgent
+
+    transactions = read_transactions(io.BytesIO(data))
+    has_date = 'date' in transactions.columns
+
+    analyzer = SpendingAnalyzerAgent(transactions)
+    analysis = analyzer.analyze()
+    cat_df = pd.DataFrame(list(analysis['category_breakdown'].items()), columns=['Category', 'Amount'])
+
+    daily_df = None
+    forecast = None
+    spending_rows = None
+    if has_date:
+        # Day x category totals are enough for per-month alerting.
+        spending_rows = analyzer.aggregate().reset_index().rename(columns={'day': 'date', 'sum': 'amount'})
+        # Chart and forecast are projections of the analyzer's aggregate cube.
+        daily_series = analyzer.daily_totals()
+        daily_df = pd.DataFrame({'Date': daily_series.index.date, 'Amount': daily_series.values})
+        forecast = ForecastingAgent(transactions, monthly_spending=analyzer.monthly_totals()).predict_next_month()
+
+    return {
+        "analysis": analysis,
+        "cat_df": cat_df,
+        "daily_df": daily_df,
+        "spending_rows": spending_rows,
+        "forecast": forecast
+    }
+
 # Page Config
 st.set_page_config(page_title="Smart Budget Buddy", page_icon="🎓", layout="wide")
 
@@ -25,6 +80,22 @@ st.set_page_config(page_title="Smart Budget Buddy", page_icon="🎓", layout="wi
 st.title("🎓 Smart Budget Buddy")
 st.markdown("### Your AI-Powered Financial Assistant")
 
+# Instrumentation is process-wide: while on, every session's agent calls are traced.
+# It stays on while any session has debug mode checked, and tracing turned on
+# from the environment (SBB_TRACE) is never switched by the checkbox.
+debug_mode = st.sidebar.checkbox("🔧 Debug: trace agent timings", help="Records wall/CPU time, peak memory and rows per agent call.")
+if not instrumentation.is_enabled_by_env():
+    tracing_sessions = get_tracing_sessions()
+    session_token = st.session_state.setdefault('trace_token', object())
+    if debug_mode and session_token not in tracing_sessions:
+        tracing_sessions.add(session_token)
+        instrumentation.enable(trace_memory=True)
+    elif not debug_mode and session_token in tracing_sessions:
+        tracing_sessions.discard(session_token)
+        if not tracing_sessions:
+            instrumentation.disable()
+rerun_started = time.time()
+
 # Sidebar for User Input
 st.sidebar.header("📝 Your Financial Profile")
 
@@ -93,17 +164,17 @@ if submit_button or profile:
     uploaded_file = st.file_uploader("Upload CSV (Columns: date, category, amount)", type=["csv"])
     
     if uploaded_file is not None:
+        import plotly.express as px
+        from smart_budget_buddy.agents.alerts_agent import AlertsAgent
+
         try:
-            # Load and preprocess uploaded file
-            transactions = pd.read_csv(uploaded_file)
-            # Basic cleaning to match expected format
-            transactions.columns = [c.strip().lower().replace(" ", "_") for c in transactions.columns]
-            if 'date' in transactions.columns:
-                transactions['date'] = pd.to_datetime(transactions['date'])
-            
-            # Run Agents
-            analyzer = SpendingAnalyzerAgent(transactions)
-            analysis = analyzer.analyze()
+            # Reruns with the same file (chat messages, widget changes) reuse
+            # the cached parse and agent results instead of redoing pandas work.
+            result_cache = get_result_cache()
+            upload_bytes = uploaded_file.getvalue()
+            upload_key = content_hash(upload_bytes)
+            results = result_cache.get_or_compute(("upload", upload_key), lambda: analyze_upload(upload_bytes))
+            analysis = results['analysis']
             
             st.subheader("Spending Overview")
             st.metric("Total Spent (Period)", f"${analysis['total_spent']:.2f}")
@@ -112,24 +183,25 @@ if submit_button or profile:
             tab1, tab2 = st.tabs(["Category Breakdown", "Daily Spending Trend"])
             
             with tab1:
-                cat_df = pd.DataFrame(list(analysis['category_breakdown'].items()), columns=['Category', 'Amount'])
-                fig_pie = px.pie(cat_df, values='Amount', names='Category', title="Spending by Category")
+                fig_pie = px.pie(results['cat_df'], values='Amount', names='Category', title="Spending by Category")
                 st.plotly_chart(fig_pie, use_container_width=True)
                 
             with tab2:
-                if 'date' in transactions.columns:
-                    daily_series = transactions.groupby(transactions['date'].dt.date)['amount'].sum()
-                    daily_df = daily_series.reset_index()
-                    daily_df.columns = ['Date', 'Amount']
-                    fig_line = px.line(daily_df, x='Date', y='Amount', title="Daily Spending Trend")
+                if results['daily_df'] is not None:
+                    fig_line = px.line(results['daily_df'], x='Date', y='Amount', title="Daily Spending Trend")
                     st.plotly_chart(fig_line, use_container_width=True)
                 else:
                     st.warning("No 'date' column found for trend analysis.")
 
             # 3. Alerts Agent
             st.header("3. 🚨 Risk Alerts")
+            # Limits are monthly, so each calendar month is checked on its own.
+            alerts_key = ("alerts", upload_key, content_hash(budget['category_limits']))
             alerts_agent = AlertsAgent(budget, analysis)
-            alerts_result = alerts_agent.check_alerts()
+            if results['spending_rows'] is not None:
+                alerts_result = result_cache.get_or_compute(alerts_key, lambda: alerts_agent.check_monthly_alerts(results['spending_rows']))
+            else:
+                alerts_result = result_cache.get_or_compute(alerts_key, alerts_agent.check_alerts)
             
             if alerts_result['alerts']:
                 for alert in alerts_result['alerts']:
@@ -139,9 +211,8 @@ if submit_button or profile:
 
             # 4. Forecasting Agent
             st.header("4. 🔮 Future Forecast")
-            if 'date' in transactions.columns:
-                forecaster = ForecastingAgent(transactions)
-                forecast = forecaster.predict_next_month()
+            if results['forecast'] is not None:
+                forecast = results['forecast']
                 
                 col_f1, col_f2 = st.columns(2)
                 col_f1.metric("Predicted Next Month Spending", f"${forecast['predicted_spending']:.2f}")
@@ -161,16 +232,20 @@ st.markdown("Ask me about **budgeting, saving, or expense tracking**! (I cannot
 
 # Initialize Agent in Session State if not present
 if 'literacy_agent' not in st.session_state:
-    st.session_state.literacy_agent = FinancialLiteracyChatBot()
+    st.session_state.literacy_agent = FinancialLiteracyChatBot(response_cache=get_response_cache())
 
 # API Key Input (Optional)
 api_key = st.sidebar.text_input("🔑 Google Gemini API Key (Optional)", type="password", help="Enter your API key for smarter AI responses.")
 
 # Re-initialize agent if API key is provided and not yet set
 if api_key and (st.session_state.literacy_agent.api_key != api_key):
-    st.session_state.literacy_agent = FinancialLiteracyChatBot(api_key=api_key)
+    st.session_state.literacy_agent = FinancialLiteracyChatBot(api_key=api_key, response_cache=get_response_cache())
     st.sidebar.success("API Key set! AI mode enabled.")
 
+if api_key:
+    cache_stats = get_response_cache().stats()
+    st.sidebar.caption(f"Response cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%})")
+
 # Chat Interface
 # Display chat history
 history = st.session_state.literacy_agent.get_history()
@@ -184,14 +259,29 @@ if prompt := st.chat_input("Ask a question..."):
     with st.chat_message("user"):
         st.write(prompt)
     
-    # Get response
-    response = st.session_state.literacy_agent.ask(prompt)
-    
-    # Display assistant response
-    with st.chat_message("assistant"):
-        st.write(response)
+    # Stream the assistant response as it arrives
+    with st.chat_message("assistant"), instrumentation.span("streamlit.chat_stream"):
+        st.write_stream(st.session_state.literacy_agent.ask_stream(prompt))
 
 # Clear History Button
 if st.button("Clear Chat History"):
     st.session_state.literacy_agent.clear_history()
     st.rerun()
+
+# Debug Panel: where this rerun spent its time
+if debug_mode:
+    with st.expander("🔧 Debug: agent timings for this run", expanded=True):
+        spans = instrumentation.span_tree(instrumentation.recent_spans(since=rerun_started))
+        if spans:
+            st.dataframe(pd.DataFrame([{
+                "Span": "  " * s["depth"] + s["name"],
+                "Wall (ms)": s["wall_ms"],
+                "CPU (ms)": s["cpu_ms"],
+                "Peak memory (KB)": round(s["peak_bytes"] / 1024, 1) if s["peak_bytes"] is not None else None,
+                "Rows": s["rows"],
+                "Error": s["error"]
+            } for s in spans]), use_container_width=True)
+        else:
+            st.caption("No agent calls in this run (cached results are not re-traced).")
+        st.download_button("Download Prometheus metrics", instrumentation.prometheus_text(),
+                           file_name="smart_budget_buddy.prom", mime="text/plain")
@@ -0,0 +1,93 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+
+from smart_budget_buddy.agents.alerts_agent import AlertsAgent, evaluate_period_alerts
+from smart_budget_buddy.agents.budget_planner import generate_budgets
+from smart_budget_buddy.benchmarks.synthetic_data import make_profiles
+
+LIMITS = {'food': 100.0, 'entertainment': 50.0, 'miscellaneous': 40.0}
+
+
+def _spending(rows, **extra):
+    dates, categories, amounts = zip(*rows) if rows else ((), (), ())
+    return pd.DataFrame({
+        'date': pd.to_datetime(list(dates), utc=True),
+        'category': pd.Categorical(list(categories)),
+        'amount': np.array(amounts, dtype=float),
+        **extra
+    })
+
+
+def _alerts(records):
+    return [(r['period'], r['category'], r['level']) for r in records.to_dict('records')]
+
+
+def test_levels_per_category():
+    spending = _spending([
+        ('2022-07-01 10:00:00', 'Market', 60.0),
+        ('2022-07-02 10:00:00', 'Coffe', 50.0),       # food: 110 > 100
+        ('2022-07-03 10:00:00', 'Events', 46.0),      # entertainment: 46 > 45
+        ('2022-07-04 10:00:00', 'Sport', 1.0),        # 47, still near
+    ])
+    records = evaluate_period_alerts(spending, LIMITS)
+    assert _alerts(records) == [('2022-07', 'food', 'over_limit'), ('2022-07', 'entertainment', 'near_limit')]
+    assert records['spent'].tolist() == [110.0, 47.0]
+    assert records['limit'].tolist() == [100.0, 50.0]
+
+
+def test_unmapped_and_missing_categories():
+    spending = _spending([
+        ('2022-07-01', 'Transport', 500.0),   # a fixed cost: no variable limit
+        ('2022-07-01', 'Lottery', 45.0),      # unknown: counts as miscellaneous
+        ('2022-07-01', None, 500.0),          # no category: dropped
+        ('2022-07-01', 'Market', np.nan),     # no amount: adds nothing
+    ])
+    assert _alerts(evaluate_period_alerts(spending, LIMITS)) == [('2022-07', 'miscellaneous', 'over_limit')]
+
+
+def test_months_split_at_the_boundary():
+    spending = _spending([
+        ('2022-07-31 23:59:59', 'Market', 95.0),
+        ('2022-08-01 00:00:00', 'Market', 95.0),
+        ('2022-08-15 12:00:00', 'Market', 10.0),
+    ])
+    assert _alerts(evaluate_period_alerts(spending, LIMITS)) == [
+        ('2022-07', 'food', 'near_limit'), ('2022-08', 'food', 'over_limit')]
+    # Longer periods add the months up.
+    assert _alerts(evaluate_period_alerts(spending, LIMITS, freq='Y')) == [('2022', 'food', 'over_limit')]
+
+
+def test_empty_input_gives_no_alerts():
+    records = evaluate_period_alerts(_spending([]), LIMITS)
+    assert len(records) == 0
+    assert list(records.columns) == ['period', 'category', 'spent', 'limit', 'level']
+    assert AlertsAgent({'category_limits': LIMITS}, {}).check_monthly_alerts(_spending([])) == \
+        {"alerts": [], "records": []}
+
+
+def test_each_student_is_checked_against_their_own_budget():
+    profiles = make_profiles(3, seed=4).set_index(pd.Index(['s0', 's1', 's2']))
+    limits = generate_budgets(profiles)
+    food = limits['limit_food']
+    spending = _spending([
+        ('2022-07-01', 'Market', food['s0'] + 1),          # over for s0
+        ('2022-07-01', 'Market', food['s1'] * 0.95),       # near for s1
+        ('2022-07-01', 'Market', food['s2'] * 0.5),        # fine for s2
+    ], student_id=['s0', 's1', 's2'])
+    records = evaluate_period_alerts(spending, limits)
+    assert list(zip(records['student_id'], records['category'], records['level'])) == [
+        ('s0', 'food', 'over_limit'), ('s1', 'food', 'near_limit')]
+    assert records['limit'].tolist() == [food['s0'], food['s1']]
+
+
+def test_check_monthly_alerts_formats_each_record():
+    spending = _spending([('2022-07-01', 'Market', 120.0)])
+    result = AlertsAgent({'category_limits': LIMITS}, {}).check_monthly_alerts(spending)
+    assert result["alerts"] == ["⚠️ Overspending in food (2022-07): Spent $120.00 vs Limit $100.00"]
+    assert result["records"][0]["level"] == 'over_limit'
@@ -0,0 +1,36 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from smart_budget_buddy.agents.budget_planner import BudgetPlannerAgent, budget_plan_from_row, generate_budgets
+from smart_budget_buddy.benchmarks.synthetic_data import make_profiles
+
+# One profile per branch, plus the disposable == current spending boundary.
+EDGE_PROFILES = [
+    {'monthly_income': 300, 'housing': 900, 'tuition': 6000, 'food': 200},  # deficit
+    {'monthly_income': 1500, 'housing': 400, 'food': 150, 'entertainment': 40},  # saving
+    {'monthly_income': 900, 'housing': 500, 'tuition': 1200, 'food': 400, 'technology': 133.335},  # overspending
+    {'monthly_income': 1000, 'financial_aid': 250.5, 'housing': 450},  # standard: no spending history
+    {'monthly_income': 1000, 'housing': 500, 'food': 300, 'miscellaneous': 200},  # boundary
+]
+
+
+def _assert_rows_match(df):
+    budgets = generate_budgets(df)
+    for profile, (_, row) in zip(df.to_dict('records'), budgets.iterrows()):
+        assert budget_plan_from_row(row) == BudgetPlannerAgent(profile).generate_budget()
+
+
+def test_generate_budgets_matches_generate_budget_on_synthetic_profiles():
+    _assert_rows_match(make_profiles(500, seed=7))
+
+
+def test_generate_budgets_matches_generate_budget_on_each_branch():
+    # Fields a profile leaves out count as 0 in generate_budget().
+    df = pd.DataFrame(EDGE_PROFILES).fillna(0)
+    assert list(generate_budgets(df)['plan']) == ['deficit', 'saving', 'overspending', 'standard', 'overspending']
+    _assert_rows_match(df)
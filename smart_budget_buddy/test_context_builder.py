@@ -0,0 +1,76 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy.utils.context_builder import ConversationContext, estimate_tokens
+
+
+def test_evicted_turns_leave_the_index_and_topics():
+    context = ConversationContext(max_turns=4)
+    context.add_turn("user", "How should I budget for textbooks?")
+    context.add_turn("assistant", "Buy used textbooks where you can.")
+    for i in range(4):
+        context.add_turn("user", f"Tips for saving on groceries, week {i}?")
+
+    assert len(context) == 4
+    assert "textbook" not in context._doc_freq
+    assert "textbook" not in context._postings
+    assert "textbooks" not in context._topics
+    assert "textbooks" not in context.summary()
+    assert context._topics["groceries"] == 4
+
+
+def test_index_stays_bounded_over_a_long_conversation():
+    context = ConversationContext(max_turns=10)
+    for i in range(1000):
+        context.add_turn("user", f"question about expense{i}")
+    assert len(context._doc_freq) <= 10 + 2
+    assert len(context._postings) == len(context._doc_freq)
+    assert len(context._topics) <= 10 + 2
+
+
+def _conversation(turns):
+    context = ConversationContext()
+    for i in range(turns):
+        context.add_turn("user", f"How do I cut spending on groceries and rent, week {i}? " + "Details. " * (i % 5 * 6))
+        context.add_turn("assistant", "Cook at home and compare prices. " * (i % 3 + 1))
+    return context
+
+
+@pytest.mark.parametrize("budget", [20, 40, 75, 150, 600])
+def test_context_stays_within_the_token_budget(budget):
+    context = _conversation(30)
+    context.token_budget = budget
+    query = "How do I cut spending on groceries?"
+    built = context.build(query, profile={"name": "Sam", "monthly_income": 1200, "major": "Biology"})
+    assert estimate_tokens(built) <= budget
+    assert context.last_token_estimate == estimate_tokens(built)
+
+
+def test_the_query_turn_is_not_repeated():
+    context = _conversation(3)
+    query = "What about my phone bill this month?"
+    turn = context.add_turn("user", query)
+    built = context.build(query, exclude_turn=turn)
+    assert query not in built
+    assert "week 2" in built  # the turns before it still are included
+
+
+def test_relevant_older_turn_beats_the_rest_of_the_recent_window():
+    context = ConversationContext(token_budget=70, recent_turns=4)
+    context.add_turn("user", "Where can I find cheap textbooks for chemistry?")
+    context.add_turn("assistant", "Rent textbooks or buy used copies from seniors.")
+    for i in range(3):
+        context.add_turn("user", f"Is my coffee habit too expensive, day {i}?")
+        context.add_turn("assistant", f"Brewing at home saves money, day {i}.")
+    query = "Any more ideas for textbooks?"
+    turn = context.add_turn("user", query)
+    built = context.build(query, exclude_turn=turn)
+    assert "Rent textbooks or buy used copies" in built
+    # The last exchange is always kept; older recent turns lost their place.
+    assert "saves money, day 2" in built and "day 2?" in built
+    assert "day 1" not in built
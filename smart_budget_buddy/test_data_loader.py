@@ -0,0 +1,41 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pytest
+
+from smart_budget_buddy.agents.alerts_agent import evaluate_period_alerts
+from smart_budget_buddy.agents.forecasting_agent import ForecastingAgent
+from smart_budget_buddy.benchmarks.synthetic_data import write_transactions_csv
+from smart_budget_buddy.utils.data_loader import TRANSACTION_SCHEMA, read_csv_typed, read_transactions
+
+pytestmark = pytest.mark.filterwarnings("ignore:Converting to PeriodArray")
+
+LIMITS = {'food': 20_000.0, 'entertainment': 9_000.0, 'personal_care': 3_000.0}
+
+
+def _loads(tmp_path, rows=200_000):
+    path = tmp_path / 'export.csv'
+    write_transactions_csv(path, rows)
+    return read_transactions(str(path)), read_csv_typed(str(path), TRANSACTION_SCHEMA, float32_amounts=True)
+
+
+def test_amounts_stay_float64_by_default(tmp_path):
+    wide, narrow = _loads(tmp_path, rows=1000)
+    assert wide['amount'].dtype == np.float64
+    assert narrow['amount'].dtype == np.float32
+
+
+def test_float32_load_gives_the_same_forecasts_and_alerts(tmp_path):
+    wide, narrow = _loads(tmp_path)
+    # Summed as raw float32 -> float64 casts, these would drift by cents.
+    assert wide['amount'].sum() != narrow['amount'].astype(float).sum()
+
+    assert ForecastingAgent(narrow).predict_next_month() == ForecastingAgent(wide).predict_next_month()
+    assert ForecastingAgent(narrow).predict_by_category() == ForecastingAgent(wide).predict_by_category()
+    expected = evaluate_period_alerts(wide, LIMITS)
+    assert len(expected) > 0
+    assert evaluate_period_alerts(narrow, LIMITS).equals(expected)
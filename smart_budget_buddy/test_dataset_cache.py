@@ -0,0 +1,76 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+
+from smart_budget_buddy.utils.data_loader import read_transactions
+from smart_budget_buddy.utils.dataset_cache import load_cached, reader_fingerprint
+
+CSV = "Date,Category,Amount\n2024-01-05,Food,12.5\n2024-01-06,Rent,400.0\n2024-01-09,Food,7.25\n"
+
+
+def _write_csv(tmp_path):
+    path = tmp_path / "transactions.csv"
+    path.write_text(CSV)
+    return str(path)
+
+
+def test_cache_written_by_another_reader_is_rebuilt(tmp_path):
+    path = _write_csv(tmp_path)
+    raw = load_cached(path, pd.read_csv)
+    assert list(raw.columns) == ["Date", "Category", "Amount"]
+
+    typed = load_cached(path, read_transactions)
+    assert list(typed.columns) == ["date", "category", "amount"]
+    assert isinstance(typed["category"].dtype, pd.CategoricalDtype)
+    # And the typed result is now the one served from the cache.
+    assert load_cached(path, read_transactions)["amount"].tolist() == [12.5, 400.0, 7.25]
+
+
+def test_reader_fingerprint_tells_schemas_apart():
+    assert reader_fingerprint(lambda p: pd.read_csv(p, dtype={"a": "int64"})) != \
+        reader_fingerprint(lambda p: pd.read_csv(p, dtype={"a": "float64"}))
+    assert reader_fingerprint(read_transactions) == reader_fingerprint(read_transactions)
+
+
+def test_editing_the_shared_parser_invalidates_the_cache(tmp_path, monkeypatch):
+    from smart_budget_buddy.utils import dataset_cache
+
+    parser = tmp_path / "parser.py"
+    parser.write_text("VERSION = 1\n")
+    monkeypatch.setattr(dataset_cache, "PARSER_SOURCES", (str(parser),))
+    before = reader_fingerprint(read_transactions)
+    parser.write_text("VERSION = 22\n")
+    assert reader_fingerprint(read_transactions) != before
+
+    path = _write_csv(tmp_path)
+    load_cached(path, read_transactions)
+    calls = []
+    reader = lambda p: calls.append(p) or read_transactions(p)
+    load_cached(path, reader)
+    parser.write_text("VERSION = 333\n")
+    load_cached(path, reader)
+    assert len(calls) == 2
+
+
+def test_cached_columns_share_memory_with_the_maps(tmp_path, monkeypatch):
+    path = _write_csv(tmp_path)
+    load_cached(path, read_transactions)
+
+    maps = []
+    real_load = np.load
+
+    def recording_load(*args, **kwargs):
+        maps.append(real_load(*args, **kwargs))
+        return maps[-1]
+
+    monkeypatch.setattr(np, "load", recording_load)
+    df = load_cached(path, read_transactions)
+    assert all(isinstance(m, np.memmap) for m in maps)
+    # Numeric columns and category codes are views of the maps, not copies.
+    assert any(np.shares_memory(df["amount"].to_numpy(), m) for m in maps)
+    assert any(np.shares_memory(df["category"].array.codes, m) for m in maps)
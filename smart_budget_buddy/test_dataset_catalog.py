@@ -0,0 +1,112 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+import pytest
+
+from smart_budget_buddy.utils import dataset_catalog
+from smart_budget_buddy.utils.dataset_catalog import DatasetCatalog, _date_bounds, scan_csv
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    """Counts the scan_csv and file_sha256 calls the catalog makes."""
+    calls = {"scan": 0, "hash": 0}
+
+    def counting(kind, func):
+        def wrapper(path):
+            calls[kind] += 1
+            return func(path)
+        return wrapper
+
+    monkeypatch.setattr(dataset_catalog, "scan_csv", counting("scan", dataset_catalog.scan_csv))
+    monkeypatch.setattr(dataset_catalog, "file_sha256", counting("hash", dataset_catalog.file_sha256))
+    return calls
+
+
+def _write_export(path, rows, seed=0):
+    # Small exports in the bank layout, seven hours apart.
+    dates = pd.Timestamp('2022-01-01') + pd.to_timedelta([i * 7 * 3600 for i in range(rows)], unit='s')
+    pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d %H:%M:%S +0000'),
+        'Category': ['Market', 'Coffe', 'Taxi'][seed % 3],
+        'Amount': [round(1.25 * (i + seed), 2) for i in range(rows)]
+    }).to_csv(path, index=False)
+
+
+def _touch(path, seconds=10):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10 ** 9))
+
+
+def test_refresh_skips_unchanged_files(tmp_path, counted):
+    _write_export(tmp_path / "a.csv", 100, seed=1)
+    _write_export(tmp_path / "b.csv", 100, seed=2)
+    catalog = DatasetCatalog(str(tmp_path))
+    assert catalog.refresh() == {"scanned": ["a.csv", "b.csv"], "unchanged": 0, "removed": []}
+    assert counted == {"scan": 2, "hash": 2}
+
+    # A fresh instance reads the saved index and opens nothing.
+    assert DatasetCatalog(str(tmp_path)).refresh() == {"scanned": [], "unchanged": 2, "removed": []}
+    assert counted == {"scan": 2, "hash": 2}
+    assert DatasetCatalog(str(tmp_path)).get("a.csv")["rows"] == 100
+
+
+def test_touched_file_is_rehashed_but_not_rescanned(tmp_path, counted):
+    path = tmp_path / "a.csv"
+    _write_export(path, 100)
+    catalog = DatasetCatalog(str(tmp_path))
+    catalog.refresh()
+    _touch(path)
+    assert catalog.refresh() == {"scanned": [], "unchanged": 1, "removed": []}
+    assert counted == {"scan": 1, "hash": 2}
+    # The new mtime was saved, so the next refresh doesn't hash again.
+    assert DatasetCatalog(str(tmp_path)).refresh()["unchanged"] == 1
+    assert counted["hash"] == 2
+
+
+def test_changed_and_removed_files(tmp_path, counted):
+    same_size, grown, gone = tmp_path / "a.csv", tmp_path / "b.csv", tmp_path / "c.csv"
+    for i, path in enumerate((same_size, grown, gone)):
+        _write_export(path, 100, seed=i)
+    catalog = DatasetCatalog(str(tmp_path))
+    catalog.refresh()
+
+    text = same_size.read_text()
+    same_size.write_text(text.replace("Market", "Marke7"))
+    _touch(same_size)
+    _write_export(grown, 150, seed=1)
+    os.remove(gone)
+    assert catalog.refresh() == {"scanned": ["a.csv", "b.csv"], "unchanged": 0, "removed": ["c.csv"]}
+    assert catalog.get("b.csv")["rows"] == 150
+    assert catalog.get("c.csv") is None
+    assert [e["name"] for e in DatasetCatalog(str(tmp_path)).entries()] == ["a.csv", "b.csv"]
+
+
+def test_scan_csv_reports_schema_rows_and_dates(tmp_path):
+    path = tmp_path / "export.csv"
+    _write_export(path, 500)
+    scanned = scan_csv(str(path))
+    dates = pd.to_datetime(pd.read_csv(path)["Date"], utc=True)
+    assert scanned["rows"] == 500
+    assert scanned["columns"] == {"date": "datetime", "category": "str", "amount": "float64"}
+    assert scanned["date_min"] == dates.min().isoformat()
+    assert scanned["date_max"] == dates.max().isoformat()
+
+
+@pytest.mark.parametrize("values", [
+    ["2022-07-06 05:57:10 +0000", "2021-12-31 23:59:59 +0000", None, "2022-01-01 00:00:00 +0000"],
+    ["2022-07-06 05:57:10 +0200", "2022-07-06 04:00:00 +0200"],
+    # Mixed offsets and layouts don't sort as strings: the full parse decides.
+    ["2022-07-06 05:57:10 +0200", "2022-07-06 04:00:00 +0000"],
+    ["07/06/2022", "2022-01-05", "12/31/2021"],
+    ["not a date", None],
+])
+def test_date_bounds_match_a_full_parse(values):
+    chunk = pd.Series(values, dtype=object)
+    parsed = pd.to_datetime(chunk, utc=True, errors='coerce', format='mixed').dropna()
+    expected = (parsed.min(), parsed.max()) if len(parsed) else (None, None)
+    assert _date_bounds(chunk) == expected
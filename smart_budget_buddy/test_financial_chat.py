@@ -0,0 +1,114 @@
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy.agents.financial_chat import REFUSAL_MESSAGE, FinancialLiteracyChatBot
+from smart_budget_buddy.utils.llm_stream import FakeStreamingModel
+from smart_budget_buddy.utils.memory_store import MemoryStore
+from smart_budget_buddy.utils.response_cache import ResponseCache
+
+ANSWER = "Compare a few plans before renewing."
+# Benign questions that still mention a restricted term.
+FLAGGED_QUESTIONS = (
+    "Tips for a stock of groceries?",
+    "Should our club host a casino night fundraiser?",
+)
+
+
+def _bot(tmp_path, online=True):
+    bot = FinancialLiteracyChatBot(memory=MemoryStore(str(tmp_path / "user_data.json")),
+                                   response_cache=ResponseCache())
+    if online:
+        bot.model = FakeStreamingModel(ANSWER, first_token_latency=0, token_latency=0)
+    return bot
+
+
+@pytest.mark.parametrize("question", FLAGGED_QUESTIONS)
+def test_flagged_questions_reach_the_model_online(tmp_path, question):
+    bot = _bot(tmp_path)
+    assert bot.ask(question) == ANSWER
+    assert "".join(bot.ask_stream(question)) == ANSWER
+
+
+def test_flagged_questions_skip_the_cache(tmp_path):
+    bot = _bot(tmp_path)
+    bot.ask(FLAGGED_QUESTIONS[0])
+    bot.ask("How do I start saving?")
+    assert len(bot.response_cache._entries) == 1
+
+
+def test_offline_mode_still_refuses(tmp_path):
+    assert _bot(tmp_path, online=False).ask("Should I invest in crypto?") == REFUSAL_MESSAGE
+
+
+def test_offline_mode_answers_words_that_only_start_with_a_topic(tmp_path):
+    bot = _bot(tmp_path, online=False)
+    assert bot.ask("Should I investigate cheaper phone plans to save money?") != REFUSAL_MESSAGE
+    assert bot.ask("How do I budget for legal fees?") != REFUSAL_MESSAGE
+
+
+def _contents(bot):
+    return [(m["role"], m["content"]) for m in bot.memory.get_history()]
+
+
+def test_stream_records_the_exchange_once_after_the_last_chunk(tmp_path):
+    bot = _bot(tmp_path)
+    question = "How do I start saving?"
+
+    async def consume():
+        chunks = []
+        async for chunk in bot.ask_stream_async(question):
+            assert _contents(bot) == []  # nothing written mid-stream
+            chunks.append(chunk)
+        return chunks
+
+    chunks = asyncio.run(consume())
+    assert len(chunks) > 1 and "".join(chunks) == ANSWER
+    assert _contents(bot) == [("user", question), ("assistant", ANSWER)]
+    # A cached repeat is recorded once too.
+    assert "".join(bot.ask_stream(question)) == ANSWER
+    assert len(_contents(bot)) == 4
+
+
+def test_stream_records_nothing_when_the_consumer_stops(tmp_path):
+    bot = _bot(tmp_path)
+    bot.model.token_latency = 0.05
+
+    async def close_early():
+        stream = bot.ask_stream_async("How do I start saving?")
+        await stream.__anext__()
+        await stream.aclose()
+
+    async def cancel_midway():
+        async def consume():
+            async for _ in bot.ask_stream_async("How do I stop overspending?"):
+                pass
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.015)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(close_early())
+    asyncio.run(cancel_midway())
+    assert _contents(bot) == []
+    assert len(bot.context) == 0
+    assert len(bot.response_cache._entries) == 0
+
+
+def test_stream_timeout_keeps_the_partial_answer_with_a_notice(tmp_path):
+    bot = _bot(tmp_path)
+    bot.model.token_latency = 0.05
+    question = "How do I start saving?"
+    chunks = list(bot.ask_stream(question, timeout=0.12))
+    assert chunks[-1].startswith("\n\n⏱️")
+    partial = "".join(chunks[:-1])
+    assert partial and ANSWER.startswith(partial) and partial != ANSWER
+    assert _contents(bot) == [("user", question), ("assistant", "".join(chunks))]
+    # A cut-short answer isn't cached.
+    assert len(bot.response_cache._entries) == 0
@@ -0,0 +1,28 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from smart_budget_buddy.agents.forecasting_agent import predict_many
+
+NAN = float('nan')
+
+
+def test_single_value_uses_the_first_real_point():
+    assert predict_many([[NAN, 5.0, NAN]])[0]["prediction"] == 5.0
+    assert predict_many(np.array([[NAN, NAN, 7.5]]))[0]["prediction"] == 7.5
+
+
+def test_prediction_follows_the_last_real_point():
+    rising, padded, gapped = predict_many(np.array([[NAN, 5.0, 6.0], [1.0, 2.0, NAN], [1.0, NAN, 3.0]]))
+    assert rising["predicted_spending"] == 7.0
+    assert padded["predicted_spending"] == 3.0
+    assert gapped["predicted_spending"] == 4.0
+
+
+def test_empty_series():
+    assert predict_many([[]]) == [{"prediction": 0, "note": "Not enough data for regression"}]
+    assert predict_many([[4.0], [1.0, 2.0]])[1] == {"predicted_spending": 3.0, "trend": "increasing"}
@@ -0,0 +1,47 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy.agents.guardrails import DEFAULT_MATCHER, TopicMatcher
+
+
+@pytest.mark.parametrize("query, topics", [
+    ("Should I invest in crypto?", ["invest", "crypto"]),
+    ("Are index funds good investments for investors?", ["invest"]),
+    ("Is investing in BONDS safe?", ["invest", "bond"]),
+    ("How many credit\n cards should I have?", ["credit card"]),
+    ("I keep borrowing to pay old debts", ["borrow", "debt"]),
+    ("Who are you voting for in the elections?", ["election", "vote"]),
+    ("Can you give me legal advice?", ["legal advice"]),
+])
+def test_restricted_topics_and_their_inflections_match(query, topics):
+    assert DEFAULT_MATCHER.match(query)["restricted"] == topics
+
+
+@pytest.mark.parametrize("query", [
+    "Should I investigate cheaper phone plans?",
+    "How do I budget for legal fees?",
+    "A vagabond's guide to cheap travel",
+    "Is the bonding activity at orientation free?",
+    "My debtor owes me twenty dollars",
+])
+def test_words_that_only_start_with_a_topic_do_not_match(query):
+    assert DEFAULT_MATCHER.match(query)["restricted"] == []
+
+
+def test_knowledge_keys_match_their_inflections_in_priority_order():
+    assert DEFAULT_MATCHER.match("Students saving on textbooks")["knowledge"] == ["saving", "student"]
+    assert DEFAULT_MATCHER.match("Tracking expenses against my budgets")["knowledge"] == ["budget", "expense"]
+    assert DEFAULT_MATCHER.match("I want to save for emergencies")["knowledge"] == ["saving", "emergency"]
+    assert DEFAULT_MATCHER.match("budgetary")["knowledge"] == []
+
+
+def test_custom_terms_match_whole_words_only():
+    matcher = TopicMatcher(["bet", "bet big"], ["plan"], inflections={"plan": ("plans",)})
+    assert matcher.match("I bet big on plans")["restricted"] == ["bet big"]
+    assert matcher.match("a better planner")["restricted"] == []
+    assert matcher.match("a better planner")["knowledge"] == []
@@ -0,0 +1,23 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_budget_buddy.benchmarks.import_time_report import import_seconds
+
+# The CLI pipeline must not pull in pandas, the Gemini SDK or plotly at import.
+PIPELINE_IMPORT_BUDGET_SECONDS = 0.25
+
+
+def test_pipeline_import_within_budget():
+    elapsed = import_seconds('smart_budget_buddy.pipeline.main_workflow')
+    assert elapsed < PIPELINE_IMPORT_BUDGET_SECONDS, (
+        f"importing main_workflow took {elapsed:.3f}s (budget {PIPELINE_IMPORT_BUDGET_SECONDS}s); "
+        "run benchmarks/import_time_report.py to find the new heavy import"
+    )
+
+
+if __name__ == "__main__":
+    test_pipeline_import_within_budget()
+    print("Import time within budget.")
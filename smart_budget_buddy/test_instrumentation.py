@@ -0,0 +1,60 @@
+import os
+import sys
+import threading
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy.utils import instrumentation
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def tracing():
+    instrumentation.reset()
+    instrumentation.enable(trace_memory=True)
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def _peaks():
+    return {s["name"]: s["peak_bytes"] for s in instrumentation.recent_spans()}
+
+
+def test_serial_spans_measure_their_own_peak(tracing):
+    with instrumentation.span("big"):
+        block = bytearray(8 * MB)
+        del block
+    with instrumentation.span("small"):
+        block = bytearray(MB)
+        del block
+    peaks = _peaks()
+    assert peaks["big"] > 7 * MB
+    assert MB // 2 < peaks["small"] < 2 * MB
+
+
+def test_overlapping_span_does_not_reset_a_running_ones_peak(tracing):
+    allocated, sibling_started = threading.Event(), threading.Event()
+
+    def first():
+        with instrumentation.span("first"):
+            block = bytearray(8 * MB)
+            del block
+            allocated.set()
+            sibling_started.wait()
+
+    def sibling():
+        allocated.wait()
+        with instrumentation.span("sibling"):
+            sibling_started.set()
+
+    threads = [threading.Thread(target=first), threading.Thread(target=sibling)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert _peaks()["first"] > 7 * MB
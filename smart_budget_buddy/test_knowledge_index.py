@@ -0,0 +1,69 @@
+import json
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy.utils.knowledge_index import BM25Index, build_index, get_default_index, load_index, tokenize
+
+# Core questions and the hand-written tip that should answer each.
+CORE_QUESTIONS = {
+    "How do I save money?": "saving",
+    "How do I start saving?": "saving",
+    "How do I budget?": "budget",
+    "How do I make a budget?": "budget",
+    "How do I track my expenses?": "expense",
+    "What is an emergency fund?": "emergency",
+    "How can I build an emergency fund?": "emergency",
+    "How do I set savings goals?": "goal-setting",
+    "What is the 50/30/20 rule?": "50-30-20",
+    "How do I save on groceries?": "groceries",
+    "Where can I get cheap textbooks?": "textbooks",
+    "How should I save for a laptop?": "laptop",
+    "Should I get a student discount?": "student",
+}
+
+
+@pytest.mark.parametrize("question, tip", CORE_QUESTIONS.items())
+def test_core_questions_rank_their_tip_first(question, tip):
+    [(_, best)] = get_default_index().search(question, k=1)
+    assert best["id"] == tip
+
+
+def test_inflections_share_a_stem():
+    assert len({*tokenize("save saves saved saving")}) == 1
+    assert tokenize("budgets budgeting budgeted") == ["budget"] * 3
+    assert tokenize("setting planned shopping") == ["set", "plan", "shop"]
+    assert tokenize("How do I make the best of it?") == []
+
+
+DOCS = [
+    {"id": "heading", "title": "Saving basics", "tags": ["save"], "text": "Put a little aside each week."},
+    {"id": "body", "title": "Groceries", "tags": ["food"], "text": "Shop with a list; it saves money and saves time."},
+    {"id": "other", "title": "Rent", "tags": ["housing"], "text": "Split rent with roommates to save."},
+]
+
+
+def test_heading_matches_outrank_passing_mentions():
+    index = BM25Index.build(DOCS)
+    assert [doc["id"] for _, doc in index.search("how do I save?")] == ["heading", "body", "other"]
+    assert index.search("unrelated words") == []
+
+
+def test_stale_index_is_rebuilt_from_the_corpus(tmp_path, capsys):
+    corpus = tmp_path / "tips.jsonl"
+    corpus.write_text("".join(json.dumps(doc) + "\n" for doc in DOCS))
+    index_path = str(tmp_path / "index.json")
+    BM25Index.build(DOCS[:1]).save(index_path, corpus_sha256="outdated")
+
+    index = load_index([str(corpus)], index_path)
+    assert "stale" in capsys.readouterr().out
+    assert len(index.docs) == 3
+    # A fresh save round-trips without a rebuild.
+    built = build_index([str(corpus)], index_path)
+    loaded = load_index([str(corpus)], index_path)
+    assert capsys.readouterr().out == ""
+    assert loaded.postings == built.postings and loaded.search("rent") == built.search("rent")
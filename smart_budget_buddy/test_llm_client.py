@@ -0,0 +1,95 @@
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy.utils.llm_client import ModelPool
+from smart_budget_buddy.utils.llm_stream import FakeStreamingModel, stream_text
+
+
+class HangingModel(FakeStreamingModel):
+    """Opens a stream that never answers."""
+
+    async def generate_content_async(self, prompt, stream=False):
+        await asyncio.sleep(3600)
+
+
+def _pooled(model, max_concurrency):
+    pool = ModelPool(requests_per_second=1000, burst=1000, max_concurrency=max_concurrency,
+                     model_factory=lambda api_key, model_name: model)
+    return pool, pool.get("key", "fake-model")
+
+
+async def _consume(model, prompt, timeout):
+    return "".join([text async for text in stream_text(model, prompt, timeout=timeout)])
+
+
+def test_timed_out_stream_open_releases_its_slot():
+    pool, pooled = _pooled(HangingModel(), max_concurrency=2)
+    for _ in range(3):
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(_consume(pooled, "hi", timeout=0.05))
+    assert pool.slots._value == 2
+
+
+def test_slots_are_usable_after_timeouts():
+    model = HangingModel("Save a little every week.", first_token_latency=0, token_latency=0)
+    pool, pooled = _pooled(model, max_concurrency=1)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(_consume(pooled, "hi", timeout=0.05))
+    # The blocking path needs the same slot; it would hang if the slot leaked.
+    assert pooled.generate_content("hi").text == "Save a little every week."
+
+
+def test_finished_stream_releases_its_slot():
+    pool, pooled = _pooled(FakeStreamingModel("Pay yourself first.", first_token_latency=0, token_latency=0), 1)
+    assert asyncio.run(_consume(pooled, "hi", timeout=1)) == "Pay yourself first."
+    assert pool.slots._value == 1
+
+
+def test_stream_waits_for_a_free_slot_without_polling(monkeypatch):
+    model = FakeStreamingModel("Pay yourself first.", first_token_latency=0, token_latency=0)
+    pool, pooled = _pooled(model, max_concurrency=1)
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def counting_sleep(delay, *args):
+        sleeps.append(delay)
+        return await real_sleep(delay, *args)
+
+    async def scenario():
+        pool.slots.acquire()  # held by a blocking call elsewhere
+        waiter = asyncio.create_task(_consume(pooled, "hi", timeout=5))
+        await real_sleep(0.2)
+        assert not waiter.done()
+        waited = len(sleeps)
+        pool.slots.release()
+        return await waiter, waited
+
+    monkeypatch.setattr(asyncio, "sleep", counting_sleep)
+    text, waited = asyncio.run(scenario())
+    assert text == "Pay yourself first."
+    assert waited <= 1  # just the rate limiter's zero wait, no 10 ms polling
+    assert pool.slots._value == 1
+
+
+def test_cancelled_slot_wait_gives_the_slot_back():
+    pool, pooled = _pooled(FakeStreamingModel("Hi.", first_token_latency=0, token_latency=0), max_concurrency=1)
+
+    async def scenario():
+        pool.slots.acquire()
+        waiter = asyncio.create_task(_consume(pooled, "hi", timeout=5))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        pool.slots.release()
+        await asyncio.sleep(0.05)  # the abandoned waiter takes and returns the slot
+
+    asyncio.run(scenario())
+    assert pool.slots._value == 1
+    assert pooled.generate_content("hi").text == "Hi."
@@ -0,0 +1,150 @@
+import json
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy.utils.memory_store import ARCHIVE_SUFFIX, DEFAULT_LIMITS, MemoryStore
+
+
+def _fill(store):
+    store.update_profile({"name": "Sam", "monthly_income": 1200})
+    for i in range(5):
+        store.add_chat_message("user", f"question {i}")
+    store.save_budget_plan({"category_limits": {"Food": 300}})
+
+
+def _state(store):
+    history = [(m["role"], m["content"]) for m in store.get_history()]
+    return store.get_profile(), history, store.get_latest_budget()["category_limits"]
+
+
+def test_journal_replays_into_the_same_state(tmp_path):
+    path = str(tmp_path / "user_data.json")
+    store = MemoryStore(path, journal=True, compact_every=0)
+    _fill(store)
+    expected = _state(store)
+    store.close()
+
+    assert not os.path.exists(path)  # nothing compacted yet: all state is in the journal
+    assert _state(MemoryStore(path, journal=True)) == expected
+
+
+def test_compact_round_trip(tmp_path):
+    path = str(tmp_path / "user_data.json")
+    store = MemoryStore(path, journal=True, compact_every=0)
+    _fill(store)
+    store.compact()
+    store.add_chat_message("assistant", "after compact")
+    expected = _state(store)
+    store.close()
+
+    with open(path) as f:
+        assert json.load(f)["_meta"]["journal_seq"] == 7
+    with open(path + ".journal") as f:
+        assert len(f.readlines()) == 1
+    reopened = MemoryStore(path, journal=True)
+    assert _state(reopened) == expected
+    # The compacted snapshot alone is still readable by a non-journaled store.
+    assert MemoryStore(path).get_profile() == expected[0]
+
+
+def test_entries_already_in_the_snapshot_are_not_replayed_twice(tmp_path):
+    path = str(tmp_path / "user_data.json")
+    store = MemoryStore(path, journal=True, compact_every=0)
+    _fill(store)
+    with open(path + ".journal") as f:
+        journal = f.read()
+    store.compact()
+    store.close()
+    # As if the process died after the snapshot swap but before the truncation.
+    with open(path + ".journal", "w") as f:
+        f.write(journal)
+    assert len(MemoryStore(path, journal=True).get_history()) == 5
+
+
+def test_torn_trailing_line_is_dropped(tmp_path):
+    path = str(tmp_path / "user_data.json")
+    store = MemoryStore(path, journal=True, compact_every=0)
+    _fill(store)
+    store.close()
+    with open(path + ".journal", "a") as f:
+        f.write('{"seq": 8, "op": "chat", "data": {"role": "user", "con')
+
+    reopened = MemoryStore(path, journal=True, compact_every=0)
+    assert len(reopened.get_history()) == 5
+    # The partial line is truncated away, so new entries follow whole lines.
+    reopened.add_chat_message("user", "next question")
+    reopened.close()
+    with open(path + ".journal") as f:
+        assert all(json.loads(line) for line in f)
+    assert MemoryStore(path, journal=True).get_history()[-1]["content"] == "next question"
+
+
+def test_identical_budget_plans_are_saved_once(tmp_path):
+    path = str(tmp_path / "user_data.json")
+    store = MemoryStore(path)
+    assert store.save_budget_plan({"category_limits": {"Food": 300}})
+    # Only the timestamp would differ: not a new plan.
+    assert not store.save_budget_plan({"category_limits": {"Food": 300}})
+    assert store.save_budget_plan({"category_limits": {"Food": 250}})
+    assert not MemoryStore(path).save_budget_plan({"category_limits": {"Food": 250}})
+    assert len(MemoryStore(path).data["budget_plans"]) == 2
+
+
+def test_recent_history(tmp_path):
+    store = MemoryStore(str(tmp_path / "user_data.json"))
+    assert store.get_recent_history() == []
+    for i in range(7):
+        store.add_chat_message("user", f"question {i}")
+    assert [m["content"] for m in store.get_recent_history(3)] == ["question 4", "question 5", "question 6"]
+    assert len(store.get_recent_history()) == 5
+    assert store.get_recent_history(0) == []
+    assert len(store.get_recent_history(100)) == 7
+
+
+def test_default_limits_bound_the_live_document(tmp_path):
+    store = MemoryStore(str(tmp_path / "user_data.json"))
+    assert store.limits == DEFAULT_LIMITS
+    for i in range(DEFAULT_LIMITS["budget_plans"] + 3):
+        store.save_budget_plan({"category_limits": {"Food": i}})
+    plans = store.data["budget_plans"]
+    assert len(plans) == DEFAULT_LIMITS["budget_plans"]
+    assert plans[0]["category_limits"] == {"Food": 3}
+    assert [p["category_limits"]["Food"] for p in store.iter_archive("budget_plans")] == [0, 1, 2]
+
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_overflow_moves_to_the_archive_and_survives_reload(tmp_path, journal):
+    path = str(tmp_path / "user_data.json")
+    store = MemoryStore(path, journal=journal, compact_every=0, limits={"conversation_history": 3})
+    for i in range(8):
+        store.add_chat_message("user", f"question {i}")
+    store.save_budget_plan({"category_limits": {"Food": 300}})
+    live = [m["content"] for m in store.get_history()]
+    assert live == ["question 5", "question 6", "question 7"]
+    assert [m["content"] for m in store.iter_archive("conversation_history")] == [f"question {i}" for i in range(5)]
+    assert list(store.iter_archive("budget_plans")) == []
+    assert os.path.exists(path + ARCHIVE_SUFFIX)
+    store.close()
+    if journal:
+        assert not os.path.exists(path)  # the trims are replayed from the journal
+
+    reloaded = MemoryStore(path, journal=journal, limits={"conversation_history": 3})
+    assert [m["content"] for m in reloaded.get_history()] == live
+    reloaded.add_chat_message("assistant", "answer")
+    assert [m["content"] for m in reloaded.get_history()] == ["question 6", "question 7", "answer"]
+    assert len(list(reloaded.iter_archive())) == 6
+
+
+def test_tighter_limits_trim_on_load(tmp_path):
+    path = str(tmp_path / "user_data.json")
+    store = MemoryStore(path)
+    for i in range(6):
+        store.add_chat_message("user", f"question {i}")
+    trimmed = MemoryStore(path, limits={"conversation_history": 2})
+    assert [m["content"] for m in trimmed.get_history()] == ["question 4", "question 5"]
+    assert len(MemoryStore(path).get_history()) == 2
@@ -0,0 +1,74 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy.utils import response_cache
+from smart_budget_buddy.utils.response_cache import ResponseCache, normalize_query
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache.time, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = ResponseCache(ttl_seconds=60)
+    cache.put("q", "answer")
+    clock.now += 59
+    assert cache.get("q") == "answer"
+    clock.now += 2
+    assert cache.get("q") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("c", "3")
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == ("1", None, "3")
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_sqlite_tier_is_shared_between_instances(tmp_path, clock):
+    path = str(tmp_path / "responses.sqlite")
+    ResponseCache(ttl_seconds=60, persist_path=path).put("q", "answer")
+
+    other = ResponseCache(ttl_seconds=60, persist_path=path)
+    assert other.get("q") == "answer"
+    assert other.stats()["disk_hits"] == 1
+    assert other.get("q") == "answer"  # now served from memory
+    assert other.stats()["disk_hits"] == 1
+
+    clock.now += 61
+    assert ResponseCache(ttl_seconds=60, persist_path=path).get("q") is None
+
+
+def test_sqlite_tier_survives_memory_eviction_and_clear(tmp_path, clock):
+    path = str(tmp_path / "responses.sqlite")
+    cache = ResponseCache(max_entries=1, persist_path=path)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    assert cache.stats()["disk_hits"] == 1
+    cache.clear()
+    assert cache.get("b") is None
+
+
+def test_normalize_query():
+    assert normalize_query("  How do I SAVE money?? ") == normalize_query("how do i save money")
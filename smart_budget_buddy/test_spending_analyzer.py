@@ -0,0 +1,54 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from smart_budget_buddy.agents.spending_analyzer import SpendingAnalyzerAgent
+from smart_budget_buddy.benchmarks.synthetic_data import make_transactions
+
+pytestmark = pytest.mark.filterwarnings("ignore:Converting to PeriodArray")
+
+
+def _batches(df, n_batches):
+    return np.array_split(np.arange(len(df)), n_batches)
+
+
+def _incremental(df, n_batches):
+    analyzer = SpendingAnalyzerAgent()
+    for rows in _batches(df, n_batches):
+        analyzer.ingest(df.iloc[rows])
+    return analyzer
+
+
+def test_batches_give_the_single_pass_analysis_exactly():
+    df = make_transactions(5000, seed=3)
+    single = SpendingAnalyzerAgent(df)
+    incremental = _incremental(df, 7)
+
+    assert incremental.analyze() == single.analyze()
+    pd.testing.assert_series_equal(incremental.daily_totals(), single.daily_totals())
+    pd.testing.assert_series_equal(incremental.monthly_totals(), single.monthly_totals())
+
+
+def test_ingest_after_the_initial_frame():
+    df = make_transactions(3000, seed=4)
+    analyzer = SpendingAnalyzerAgent(df.iloc[:1000])
+    analyzer.analyze()
+    analyzer.ingest(df.iloc[1000:])
+    assert analyzer.analyze() == SpendingAnalyzerAgent(df).analyze()
+
+
+def test_sub_cent_amounts_fall_back_to_float_sums():
+    df = make_transactions(2000, seed=5)
+    df['amount'] = df['amount'] + 0.001
+    single = SpendingAnalyzerAgent(df).analyze()
+    incremental = _incremental(df, 5).analyze()
+    assert incremental.keys() == single.keys()
+    assert incremental["total_spent"] == pytest.approx(single["total_spent"])
+    assert incremental["category_breakdown"] == pytest.approx(single["category_breakdown"])
+    assert incremental["monthly_spending"] == pytest.approx(single["monthly_spending"])
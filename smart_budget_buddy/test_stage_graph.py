@@ -0,0 +1,137 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy.pipeline.stage_graph import Stage, StageError, StageGraph, StageTimeout
+from smart_budget_buddy.utils.result_cache import ResultCache
+
+MODES = ['thread', 'asyncio']
+
+
+@pytest.fixture
+def release():
+    # Abandoned stages block on this until the test ends, instead of lingering.
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_stages_run_after_their_dependencies():
+    order = []
+
+    def stage(name, value):
+        def func(**deps):
+            order.append(name)
+            return value + sum(deps.values())
+        return func
+
+    graph = StageGraph([
+        Stage('total', stage('total', 100), deps=['left', 'right']),
+        Stage('left', stage('left', 1), deps=['seed']),
+        Stage('right', stage('right', 10), deps=['seed']),
+    ])
+    for mode in MODES:
+        order.clear()
+        results = graph.run({'seed': 1000}, mode=mode)
+        assert results == {'seed': 1000, 'left': 1001, 'right': 1010, 'total': 2111}
+        assert order[-1] == 'total' and sorted(order[:2]) == ['left', 'right']
+
+
+async def _double(x):
+    return 2 * x
+
+
+def test_asyncio_mode_awaits_coroutine_stages():
+    graph = StageGraph([Stage('doubled', _double, deps=['x'])])
+    assert graph.run({'x': 21}, mode='asyncio')['doubled'] == 42
+
+
+def test_cycles_and_missing_inputs_are_rejected():
+    with pytest.raises(ValueError, match="Cycle"):
+        StageGraph([Stage('a', dict, deps=['c']), Stage('b', dict, deps=['a']), Stage('c', dict, deps=['b'])])
+    with pytest.raises(ValueError, match="Duplicate"):
+        StageGraph([Stage('a', dict), Stage('a', dict)])
+    with pytest.raises(ValueError, match="Missing pipeline inputs"):
+        StageGraph([Stage('a', dict, deps=['x'])]).run()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_timeout_yields_the_fallback_without_waiting(mode, release):
+    graph = StageGraph([
+        Stage('slow', lambda: release.wait(5), timeout=0.1, fallback='fallback'),
+        Stage('after', lambda slow: slow.upper(), deps=['slow']),
+    ])
+    started = time.perf_counter()
+    results = graph.run(mode=mode)
+    assert time.perf_counter() - started < 1.0
+    assert results['after'] == 'FALLBACK'
+    assert graph.last_timings['slow']['timed_out']
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_timeout_without_fallback_fails_the_run(mode, release):
+    graph = StageGraph([Stage('slow', lambda: release.wait(5), timeout=0.1)])
+    started = time.perf_counter()
+    with pytest.raises(StageTimeout) as error:
+        graph.run(mode=mode)
+    assert error.value.stage == 'slow'
+    assert time.perf_counter() - started < 1.0
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_failure_propagates_without_waiting_for_other_stages(mode, release):
+    def broken():
+        raise KeyError('amount')
+
+    graph = StageGraph([Stage('slow', lambda: release.wait(5)), Stage('broken', broken)])
+    started = time.perf_counter()
+    with pytest.raises(StageError, match="Stage 'broken' failed") as error:
+        graph.run(mode=mode)
+    assert isinstance(error.value.__cause__, KeyError)
+    assert time.perf_counter() - started < 1.0
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_cached_stages_are_reused_for_equal_inputs(mode):
+    calls = []
+
+    def total(amounts):
+        calls.append(amounts)
+        return sum(amounts)
+
+    graph = StageGraph([Stage('total', total, deps=['amounts'], cache=True)], cache=ResultCache())
+    assert graph.run({'amounts': [1, 2]}, mode=mode)['total'] == 3
+    assert graph.run({'amounts': [1, 2]}, mode=mode)['total'] == 3
+    assert graph.last_timings['total']['cached']
+    assert graph.run({'amounts': [1, 3]}, mode=mode)['total'] == 4
+    assert calls == [[1, 2], [1, 3]]
+
+
+def test_timed_out_fallbacks_are_not_cached(release):
+    graph = StageGraph([Stage('slow', lambda: release.wait(5), timeout=0.05, fallback=None, cache=True)],
+                       cache=ResultCache())
+    assert graph.run()['slow'] is None
+    assert graph.cache.stats()['entries'] == 0
+    release.set()
+    assert graph.run()['slow'] is True
+    assert not graph.last_timings['slow']['cached']
+
+
+def test_critical_path_follows_the_slowest_chain():
+    graph = StageGraph([
+        Stage('load', lambda: time.sleep(0.05)),
+        Stage('slow', lambda load: time.sleep(0.2), deps=['load']),
+        Stage('fast', lambda load: None, deps=['load']),
+        Stage('report', lambda slow, fast: None, deps=['slow', 'fast']),
+    ])
+    graph.run()
+    path, elapsed = graph.critical_path()
+    assert path == ['load', 'slow', 'report']
+    assert elapsed >= 0.25
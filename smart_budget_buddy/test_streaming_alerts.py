@@ -0,0 +1,86 @@
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy.agents.streaming_alerts import (StreamingAlertEvaluator, period_key, queue_from_iterable,
+                                                        tail_csv)
+
+LIMITS = {'food': 100.0, 'entertainment': 50.0}
+
+
+def _spend(day, category, amount, student=None):
+    return {"date": f"2022-{day} 12:00:00 +0000", "category": category, "amount": amount, "student_id": student}
+
+
+def test_period_key_accepts_iso_stamps_only():
+    assert period_key("2022-07-06 05:57:10 +0000") == "2022-07"
+    assert period_key("2022-12-31T23:59:59") == "2022-12"
+    assert period_key(datetime(2022, 1, 5)) == "2022-01"
+    for value in ("07/06/2022", "2022-13-01", "", "July 2022"):
+        with pytest.raises(ValueError):
+            period_key(value)
+
+
+def test_each_level_fires_once_per_month():
+    evaluator = StreamingAlertEvaluator(LIMITS)
+    feed = [
+        _spend("07-01", "Market", 80),      # 80 of 100: below 90%
+        _spend("07-02", "Coffe", 15),       # 95: near limit
+        _spend("07-03", "Restuarant", 2),   # still near: no repeat
+        _spend("07-04", "Market", 10),      # 107: over limit
+        _spend("07-05", "Market", 10),      # still over: no repeat
+        _spend("07-06", "Transport", 500),  # no variable limit
+        _spend("08-01", "Market", 101),     # a new month starts from zero
+    ]
+    alerts = evaluator.push_many(feed)
+    assert [(a["period"], a["category"], a["level"]) for a in alerts] == [
+        ("2022-07", "food", "near_limit"), ("2022-07", "food", "over_limit"), ("2022-08", "food", "over_limit")]
+    assert alerts[1]["spent"] == pytest.approx(107) and alerts[1]["limit"] == 100.0
+    assert evaluator.spent(period="2022-07") == {"food": pytest.approx(117)}
+    assert evaluator.events == len(feed)
+
+
+def test_users_are_tracked_separately_with_their_own_limits():
+    evaluator = StreamingAlertEvaluator(LIMITS, user_limits={"s2": {"food": 10.0}})
+    assert evaluator.push(_spend("07-01", "Market", 50, student="s1")) == []
+    [alert] = evaluator.push(_spend("07-01", "Market", 50, student="s2"))
+    assert (alert["user"], alert["level"]) == ("s2", "over_limit")
+
+    evaluator.drop_periods_before("2022-08")
+    assert evaluator.spent("s1", "2022-07") == {}
+
+
+def test_consume_queue_handles_single_events_and_micro_batches():
+    feed = [_spend(f"07-{d:02d}", "Events", 20) for d in range(1, 6)]
+
+    async def drain(batch_size):
+        queue = asyncio.Queue(maxsize=2)
+        evaluator = StreamingAlertEvaluator(LIMITS)
+        producer = asyncio.create_task(queue_from_iterable(feed, queue, batch_size=batch_size))
+        alerts = [alert async for alert in evaluator.consume_queue(queue)]
+        await producer
+        return [(a["spent"], a["level"]) for a in alerts]
+
+    # 60 > 50 is over the limit straight from 40 (below 45).
+    assert asyncio.run(drain(1)) == asyncio.run(drain(2)) == [(60.0, "over_limit")]
+
+
+def test_tail_csv_skips_and_reports_bad_rows(tmp_path):
+    path = tmp_path / "live.csv"
+    path.write_text("Date,Category,Amount\n"
+                    "2022-07-01 10:00:00 +0000,Market,12.50\n"
+                    "2022-07-02 10:00:00 +0000,Market,\n"
+                    "07/03/2022,Market,4\n"
+                    "2022-07-04 10:00:00 +0000,Coffe,abc\n"
+                    "2022-07-05 10:00:00 +0000,Coffe,3\n"
+                    "2022-07-06 10:00:00 +0000,Coffe,7")  # no newline yet: held back
+    bad_rows = []
+    rows = list(tail_csv(str(path), follow=False, bad_rows=bad_rows))
+    assert [(r["category"], r["amount"]) for r in rows] == [("Market", 12.5), ("Coffe", 3.0)]
+    assert len(bad_rows) == 3 and bad_rows[1].startswith("07/03/2022")
@@ -0,0 +1,87 @@
+import os
+import sys
+import threading
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy.agents.tools import ToolRegistry, default_registry
+from smart_budget_buddy.benchmarks.synthetic_data import write_transactions_csv
+
+pytestmark = pytest.mark.filterwarnings("ignore:Converting to PeriodArray")
+
+
+def test_cacheable_tools_run_once_per_argument_set():
+    calls = []
+
+    def totals(amounts):
+        calls.append(amounts)
+        return {"total_spent": sum(amounts), "amounts": list(amounts)}
+
+    registry = ToolRegistry()
+    registry.register("totals", totals)
+    first = registry.call("totals", amounts=[1, 2])
+    first["total_spent"] = 0
+    first["amounts"].append(99)
+    # Mutating a result doesn't reach the cached copy.
+    assert registry.call("totals", amounts=[1, 2]) == {"total_spent": 3, "amounts": [1, 2]}
+    assert registry.call("totals", amounts=[5]) == {"total_spent": 5, "amounts": [5]}
+    assert calls == [[1, 2], [5]]
+
+
+def test_path_arguments_key_on_the_file_stamp(tmp_path):
+    path = str(tmp_path / 'export.csv')
+    registry = default_registry()
+    missing = registry.call("expense_classifier", transactions_csv_path=path)
+    assert "error" in missing
+
+    # The error wasn't cached: once the file exists, it is read.
+    write_transactions_csv(path, 200, seed=1)
+    first = registry.call("expense_classifier", transactions_csv_path=path)
+    assert "error" not in first
+    hits = registry.cache.hits
+    assert registry.call("expense_classifier", transactions_csv_path=path) == first
+    assert registry.cache.hits == hits + 1
+
+    write_transactions_csv(path, 300, seed=2)
+    changed = registry.call("expense_classifier", transactions_csv_path=path)
+    assert changed["total_spent"] != first["total_spent"]
+
+
+def test_batches_keep_reads_on_either_side_of_a_write():
+    state = {"value": 0}
+    lock = threading.Lock()
+
+    def write(value):
+        with lock:
+            state["value"] = value
+        return {"status": "ok"}
+
+    def read(tag):
+        with lock:
+            return {"tag": tag, "value": state["value"]}
+
+    registry = ToolRegistry()
+    registry.register("read", read, cacheable=False)
+    registry.register("write", write, cacheable=False, mutates=True)
+    results = registry.call_batch([
+        {"name": "read", "args": {"tag": "a"}},
+        {"name": "read", "args": {"tag": "b"}},
+        {"name": "write", "args": {"value": 7}},
+        {"name": "read", "args": {"tag": "c"}},
+        {"name": "missing"},
+    ])
+    assert results == [{"tag": "a", "value": 0}, {"tag": "b", "value": 0}, {"status": "ok"},
+                       {"tag": "c", "value": 7}, {"error": "Unknown tool: missing"}]
+
+
+def test_unknown_tools_and_failures_become_errors():
+    def broken():
+        raise RuntimeError("boom")
+
+    registry = ToolRegistry()
+    registry.register("broken", broken)
+    assert registry.call("nope") == {"error": "Unknown tool: nope"}
+    assert registry.call_batch([{"name": "broken"}]) == [{"error": "boom"}]
@@ -0,0 +1,109 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from smart_budget_buddy import service
+from smart_budget_buddy.service import BudgetService, HTTPError
+from smart_budget_buddy.utils.user_stores import UserStores
+
+
+def test_pinned_store_is_not_evicted(tmp_path):
+    stores = UserStores(str(tmp_path), max_open=1)
+    alice = stores.acquire("alice")
+    stores.acquire("bob")
+    # Both are in use, so neither is closed to honour max_open.
+    assert stores.open_count() == 2
+    alice.update_profile({"name": "Alice"})
+    stores.release("alice")
+    assert stores.open_count() == 1
+    stores.release("bob")
+    assert stores.acquire("alice").get_profile() == {"name": "Alice"}
+    stores.close()
+
+
+def test_user_file_is_not_reopened_while_its_store_closes(tmp_path, monkeypatch):
+    stores = UserStores(str(tmp_path), max_open=1)
+    stores.acquire("alice").update_profile({"name": "Alice"})
+    stores.release("alice")
+
+    compacting = threading.Event()
+    real_close = UserStores._close
+
+    def slow_close(store):
+        compacting.set()
+        time.sleep(0.2)
+        real_close(store)
+
+    monkeypatch.setattr(UserStores, "_close", staticmethod(slow_close))
+    evictor = threading.Thread(target=lambda: (stores.acquire("bob"), stores.release("bob")))
+    evictor.start()
+    compacting.wait()
+    started = time.perf_counter()
+    store = stores.acquire("alice")
+    # Waited for the old store to finish closing instead of opening a second one.
+    assert time.perf_counter() - started > 0.1
+    assert store.get_profile() == {"name": "Alice"}
+    evictor.join()
+    stores.release("alice")
+    stores.close()
+
+
+def test_session_requires_a_pinned_store(tmp_path):
+    stores = UserStores(str(tmp_path))
+    with pytest.raises(RuntimeError):
+        stores.session("alice", "chat", lambda store: object())
+    stores.close()
+
+
+def test_timed_out_request_keeps_the_user_lock_until_its_work_ends(tmp_path, monkeypatch):
+    monkeypatch.setattr(service, "REQUEST_TIMEOUT_SECONDS", 0.05)
+
+    async def scenario():
+        svc = BudgetService(data_dir=str(tmp_path), executor='thread')
+        await svc.start('127.0.0.1', 0)
+
+        async def slow_write(body):
+            async with svc._user_store("alice") as store:
+                await svc._io(time.sleep, 0.3)
+                await svc._io(store.update_profile, {"name": "Alice"})
+
+        svc.routes[('POST', '/slow')] = slow_write
+        with pytest.raises(HTTPError) as timeout:
+            await svc.dispatch('POST', '/slow', {})
+        assert timeout.value.status == 504
+        assert svc._user_lock("alice").locked()
+        # The next request for the user waits and then sees the finished write.
+        async with svc._user_store("alice") as store:
+            assert store.get_profile() == {"name": "Alice"}
+        await svc.close()
+        assert svc.pending == 0
+
+    asyncio.run(scenario())
+
+
+def test_rejected_profile_is_not_saved(tmp_path):
+    async def scenario():
+        svc = BudgetService(data_dir=str(tmp_path), executor='thread')
+        await svc.start('127.0.0.1', 0)
+        profile = {'monthly_income': 1200, 'housing': 500, 'food': 200}
+        status, first, _ = await svc.dispatch('POST', '/budget', {"user_id": "u2", "profile": profile})
+        assert status == 200
+        with pytest.raises(HTTPError) as rejected:
+            await svc.dispatch('POST', '/budget', {"user_id": "u2", "profile": {"housing": "abc"}})
+        assert rejected.value.status == 400
+        # The saved profile is untouched and still produces the same budget.
+        status, again, _ = await svc.dispatch('POST', '/budget', {"user_id": "u2"})
+        assert status == 200 and again["category_limits"] == first["category_limits"]
+        # A partial update is merged into the saved profile.
+        status, updated, _ = await svc.dispatch('POST', '/budget', {"user_id": "u2", "profile": {"housing": 600}})
+        assert updated["fixed_costs"]["housing"] == 600 and updated["total_income"] == 1200
+        await svc.close()
+
+    asyncio.run(scenario())
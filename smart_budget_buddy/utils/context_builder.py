@@ -0,0 +1,200 @@
+import heapq
+import itertools
+import json
+import math
+import re
+from collections import Counter, deque
+
+from .knowledge_index import STOPWORDS, tokenize
+
+_WORD = re.compile(r"[a-z][a-z0-9]{3,}")
+
+RELEVANT_HEADER = "Relevant Earlier Messages:"
+RECENT_HEADER = "Recent History:"
+
+
+def estimate_tokens(text):
+    # Roughly four characters per token for English text.
+    return len(text) // 4 + 1
+
+
+def _clip(text, max_tokens):
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[:max(max_tokens * 4 - 4, 0)] + "…"
+
+
+def _topic_words(content):
+    return [w for w in _WORD.findall(content.lower()) if w not in STOPWORDS]
+
+
+def compact_profile(profile):
+    """`key=value` pairs for the filled-in profile fields, far smaller than json.dumps."""
+    parts = []
+    for key, value in (profile or {}).items():
+        if value in (None, "", [], {}):
+            continue
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, separators=(',', ':'), default=str)
+        parts.append(f"{key}={value}")
+    return ", ".join(parts)
+
+
+class ConversationContext:
+    """
+    Incremental index over a conversation for building compact LLM prompts.
+
+    Every turn is indexed once when added. build() then picks the latest
+    turns, the older turns most relevant to the query (idf-weighted term
+    overlap) and a rolling topic summary, and packs them under
+    `token_budget`. Posting lists are capped per term, so building context
+    costs the same after ten turns or ten thousand.
+    """
+
+    def __init__(self, token_budget=600, recent_turns=4, relevant_turns=3, turn_token_cap=120,
+                 max_turns=2000, postings_per_term=64, summary_topics=8):
+        self.token_budget = token_budget
+        self.recent_turns = recent_turns
+        self.relevant_turns = relevant_turns
+        self.turn_token_cap = turn_token_cap
+        self.max_turns = max_turns
+        self.postings_per_term = postings_per_term
+        self.summary_topics = summary_topics
+        self.last_token_estimate = 0
+        self.clear()
+
+    def clear(self):
+        self._turns = {}  # turn id -> (role, content, terms)
+        self._order = deque()
+        self._postings = {}  # term -> deque of turn ids, newest last
+        self._doc_freq = Counter()
+        self._topics = Counter()
+        self._summary = None
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._turns)
+
+    def add_turn(self, role, content):
+        """Indexes one message and returns its turn id."""
+        turn_id = self._next_id
+        self._next_id += 1
+        terms = set(tokenize(content))
+        self._turns[turn_id] = (role, content, terms)
+        self._order.append(turn_id)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = deque(maxlen=self.postings_per_term)
+            postings.append(turn_id)
+            self._doc_freq[term] += 1
+        if role == "user":
+            self._topics.update(_topic_words(content))
+            self._summary = None
+
+        if len(self._order) > self.max_turns:
+            self._evict(self._order.popleft())
+        return turn_id
+
+    def _evict(self, turn_id):
+        # Forget the turn everywhere, so the index and topics cover only the
+        # last max_turns turns and don't grow with the conversation.
+        role, content, terms = self._turns.pop(turn_id)
+        for term in terms:
+            self._doc_freq[term] -= 1
+            if self._doc_freq[term] <= 0:
+                del self._doc_freq[term]
+                del self._postings[term]
+        if role == "user":
+            for word in _topic_words(content):
+                self._topics[word] -= 1
+                if self._topics[word] <= 0:
+                    del self._topics[word]
+            self._summary = None
+
+    def summary(self):
+        """One line naming the topics the user has raised most often."""
+        if self._summary is None:
+            topics = [word for word, _ in self._topics.most_common(self.summary_topics)]
+            self._summary = f"Topics the student has asked about: {', '.join(topics)}." if topics else ""
+        return self._summary
+
+    def _recent_ids(self, exclude):
+        recent = [i for i in itertools.islice(reversed(self._order), self.recent_turns + 1) if i != exclude]
+        return recent[:self.recent_turns]
+
+    def _relevant_ids(self, query, skip):
+        n_turns = len(self._turns)
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings or self._doc_freq[term] <= 0:
+                continue
+            idf = math.log(1 + n_turns / self._doc_freq[term])
+            for turn_id in postings:
+                if turn_id not in skip and turn_id in self._turns:
+                    scores[turn_id] = scores.get(turn_id, 0.0) + idf
+        best = heapq.nlargest(self.relevant_turns, scores.items(), key=lambda item: item[1])
+        return [turn_id for turn_id, _ in best]
+
+    def _format_turn(self, turn_id):
+        role, content, _ = self._turns[turn_id]
+        return f"{role}: {_clip(' '.join(content.split()), self.turn_token_cap)}"
+
+    def build(self, query, profile=None, exclude_turn=None):
+        """
+        Context block for a prompt about `query`, at most ~token_budget tokens.
+
+        Pass the id of the turn holding the query itself as `exclude_turn`
+        so it is not repeated. Space is handed out in priority order:
+        profile, the last exchange, relevant older turns, the rest of the
+        recent turns, then the summary.
+        """
+        remaining = self.token_budget
+
+        def take(*lines):
+            # Lines are charged separately: their per-line rounding covers
+            # the newlines joining them, so the total stays within budget.
+            nonlocal remaining
+            cost = sum(estimate_tokens(line) for line in lines)
+            if cost > remaining:
+                return False
+            remaining -= cost
+            return True
+
+        profile_line = ""
+        if profile:
+            profile_line = "User Profile: " + _clip(compact_profile(profile), self.token_budget // 4)
+            if not take(profile_line):
+                profile_line = ""
+
+        recent_ids = self._recent_ids(exclude_turn)  # newest first
+        skip = set(recent_ids)
+        skip.add(exclude_turn)
+        # The last exchange always comes first; relevant older turns outrank
+        # the rest of the recent window.
+        candidates = recent_ids[:2] + self._relevant_ids(query, skip) + recent_ids[2:]
+        chosen, opened = [], set()
+        for turn_id in candidates:
+            # The first turn of a section also pays for its header.
+            header = RECENT_HEADER if turn_id in skip else RELEVANT_HEADER
+            lines = [self._format_turn(turn_id)] + ([header] if header not in opened else [])
+            if take(*lines):
+                chosen.append(turn_id)
+                opened.add(header)
+        recent = [self._format_turn(i) for i in sorted(chosen) if i in skip]
+        relevant = [self._format_turn(i) for i in sorted(chosen) if i not in skip]
+
+        summary = self.summary()
+        summary_line = f"Conversation Summary: {summary}" if summary else ""
+        if summary_line and not take(summary_line):
+            summary_line = ""
+
+        sections = [profile_line, summary_line]
+        if relevant:
+            sections.append(RELEVANT_HEADER + "\n" + "\n".join(relevant))
+        if recent:
+            sections.append(RECENT_HEADER + "\n" + "\n".join(recent))
+        context = "\n".join(section for section in sections if section)
+        self.last_token_estimate = estimate_tokens(context)
+        return context
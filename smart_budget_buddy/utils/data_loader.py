@@ -1,10 +1,122 @@
 import pandas as pd
+import numpy as np
 import os
+from .dataset_cache import load_cached
 
-DATASET_DIR = r"c:\Users\housh\Desktop\5-Day AI Agents Intensive Course with Google\dataset"
+# SBB_DATASET_DIR points the loaders elsewhere, e.g. at a synthetic dataset.
+DATASET_DIR = os.environ.get('SBB_DATASET_DIR', r"c:\Users\housh\Desktop\5-Day AI Agents Intensive Course with Google\dataset")
 PROFILE_FILE = "student_spending (1).csv"
 TRANSACTION_FILE = "budjet (2).csv"
 
+# The format in the transaction export is '2022-07-06 05:57:10 +0000'
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S %z"
+
+# Explicit dtypes by normalized column name; columns not listed are inferred.
+TRANSACTION_SCHEMA = {
+    'category': 'category',
+    'amount': 'float64'
+}
+PROFILE_SCHEMA = {
+    'gender': 'category',
+    'year_in_school': 'category',
+    'major': 'category',
+    'preferred_payment_method': 'category'
+}
+
+_DATE_CHUNK_ROWS = 1_000_000
+
+# float32 holds every whole-cent amount below this exactly enough to round-trip.
+_FLOAT32_CENTS_LIMIT = 2 ** 24 / 100
+
+
+def normalize_column(name):
+    return name.strip().lower().replace(" ", "_")
+
+
+def _default_engine():
+    try:
+        import pyarrow  # noqa: F401
+        return 'pyarrow'
+    except ImportError:
+        return 'c'
+
+
+def _parse_date_chunk(values, date_format):
+    if date_format.endswith(" %z") and values.str.endswith(" +0000").all():
+        # All stamps are UTC: parsing the naive part and localizing once is
+        # several times faster than pandas' per-row %z handling.
+        naive = pd.to_datetime(values.str.slice(0, -6), format=date_format[:-3])
+        return naive.dt.tz_localize('UTC')
+    return pd.to_datetime(values, format=date_format)
+
+
+def _parse_dates(values, date_format):
+    try:
+        # Chunked so the temporary sliced strings never cost more than one
+        # chunk's worth of memory on multi-GB exports.
+        chunks = [_parse_date_chunk(values.iloc[i:i + _DATE_CHUNK_ROWS], date_format)
+                  for i in range(0, len(values), _DATE_CHUNK_ROWS)]
+        return pd.concat(chunks) if len(chunks) != 1 else chunks[0]
+    except (ValueError, TypeError, AttributeError):
+        # Uploads from other banks use other layouts; fall back to inference.
+        return pd.to_datetime(values)
+
+
+def _maybe_float32(amounts):
+    """Downcasts to float32 only if every amount survives the round trip to the cent."""
+    values = amounts.to_numpy(dtype=np.float64)
+    finite = values[~np.isnan(values)]
+    if len(finite) == 0 or np.abs(finite).max() >= _FLOAT32_CENTS_LIMIT:
+        return amounts
+    if not np.array_equal(np.round(finite, 2), finite):
+        return amounts
+    narrowed = values.astype(np.float32)
+    restored = np.round(narrowed.astype(np.float64), 2)
+    if not np.array_equal(restored, values, equal_nan=True):
+        return amounts
+    return pd.Series(narrowed, index=amounts.index, name=amounts.name)
+
+
+def amounts_float64(amounts):
+    """
+    `amounts` as float64 for summing. float32 columns (see `float32_amounts`)
+    are rounded back to the cent first, so their totals match a float64 load.
+    """
+    if amounts.dtype == np.float32:
+        return amounts.astype(np.float64).round(2)
+    return amounts.astype(np.float64)
+
+
+def read_csv_typed(source, schema=None, date_format=DATE_FORMAT, engine=None, float32_amounts=False):
+    """
+    Shared CSV ingestion: normalizes column names, applies `schema` dtypes at
+    parse time and parses `date` with an explicit format. With
+    `float32_amounts`, `amount` is stored as float32 when that is lossless;
+    sum such columns through `amounts_float64`. `source` is a path or a
+    file-like object. `engine` defaults to the multithreaded pyarrow parser
+    when installed.
+    """
+    schema = schema or {}
+    header = pd.read_csv(source, nrows=0)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    dtype = {raw: schema[normalize_column(raw)] for raw in header.columns if normalize_column(raw) in schema}
+
+    df = pd.read_csv(source, dtype=dtype, engine=engine or _default_engine())
+    df.columns = [normalize_column(c) for c in df.columns]
+
+    if 'date' in df.columns:
+        df['date'] = _parse_dates(df['date'], date_format)
+    if float32_amounts and 'amount' in df.columns:
+        df['amount'] = _maybe_float32(df['amount'])
+    return df
+
+
+def read_transactions(source, engine=None):
+    """Reads a transaction export (path or uploaded file) with the transaction schema."""
+    return read_csv_typed(source, TRANSACTION_SCHEMA, engine=engine)
+
+
 class DataLoader:
     def __init__(self, directory_path=None):
         self.directory_path = directory_path or DATASET_DIR
@@ -14,35 +126,36 @@ class DataLoader:
             return os.listdir(self.directory_path)
         return []
 
-    def load_csv(self, filename):
+    def describe(self, refresh=True):
+        """Catalog entries (size, hash, schema, rows, date range) for each dataset file."""
+        # Imported here: the catalog module builds on this one.
+        from .dataset_catalog import DatasetCatalog
+        catalog = DatasetCatalog(self.directory_path)
+        if refresh:
+            catalog.refresh()
+        return catalog.entries()
+
+    def load_csv(self, filename, use_cache=True):
         path = os.path.join(self.directory_path, filename)
         if os.path.exists(path):
-            return pd.read_csv(path)
+            reader = lambda p: read_csv_typed(p, {**PROFILE_SCHEMA, **TRANSACTION_SCHEMA})
+            return load_cached(path, reader) if use_cache else reader(path)
         return None
 
-def load_profiles():
+def load_profiles(use_cache=True):
     path = os.path.join(DATASET_DIR, PROFILE_FILE)
     if not os.path.exists(path):
         print(f"Warning: Dataset not found at {path}")
         return pd.DataFrame() # Return empty DataFrame
-    df = pd.read_csv(path)
-    # Clean column names
-    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-    return df
+    reader = lambda p: read_csv_typed(p, PROFILE_SCHEMA)
+    return load_cached(path, reader) if use_cache else reader(path)
 
-def load_transactions():
+def load_transactions(use_cache=True):
     path = os.path.join(DATASET_DIR, TRANSACTION_FILE)
     if not os.path.exists(path):
         print(f"Warning: Dataset not found at {path}")
         return pd.DataFrame()
-    df = pd.read_csv(path)
-    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
-    
-    # Convert date
-    # The format in file is '2022-07-06 05:57:10 +0000'
-    if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'])
-    return df
+    return load_cached(path, read_transactions) if use_cache else read_transactions(path)
 
 def get_student_profile(df_profiles, student_id=0):
     """Returns a single student profile as a dictionary (or Series)."""
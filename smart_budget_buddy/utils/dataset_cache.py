@@ -0,0 +1,199 @@
+import functools
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR_NAME = '.sbb_cache'
+CACHE_FORMAT_VERSION = 2
+# The shared parsing code (read_csv_typed and friends) every reader calls into.
+PARSER_SOURCES = (os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data_loader.py'),)
+
+
+class _UncacheableColumn(Exception):
+    pass
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=64)
+def _source_digest(path, mtime_ns, size):
+    try:
+        return file_sha256(path)
+    except OSError:
+        return None
+
+
+def _source_files_digest(paths):
+    digests = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            continue
+        digests.append(f"{path}:{_source_digest(path, stat.st_mtime_ns, stat.st_size)}")
+    return digests
+
+
+def reader_fingerprint(reader):
+    """
+    Hash of what `reader` produces: its code, bound arguments and the plain
+    data (e.g. schema dicts) it reads from globals or closures, plus the
+    source of its module and of the shared parsers in PARSER_SOURCES, so
+    editing read_csv_typed invalidates caches too. Two readers with the same
+    fingerprint are assumed to parse a file the same way.
+    """
+    parts = []
+    while isinstance(reader, functools.partial):
+        parts.append(repr((reader.args, sorted(reader.keywords.items()))))
+        reader = reader.func
+    parts.append(f"{getattr(reader, '__module__', '')}.{getattr(reader, '__qualname__', repr(reader))}")
+    code = getattr(reader, '__code__', None)
+    if code is not None:
+        parts += [code.co_code.hex(), repr(code.co_consts), repr(reader.__defaults__)]
+        values = [cell.cell_contents for cell in reader.__closure__ or ()]
+        values += [reader.__globals__.get(name) for name in code.co_names]
+        parts += [repr(v) for v in values if isinstance(v, (dict, list, tuple, str, int, float))]
+    module = sys.modules.get(getattr(reader, '__module__', None) or '')
+    parts += _source_files_digest((getattr(module, '__file__', None),) + PARSER_SOURCES)
+    return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()
+
+
+def cache_dir_for(path):
+    """The cache for `dir/name.csv` lives in `dir/.sbb_cache/name.csv/`."""
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, CACHE_DIR_NAME, name)
+
+
+def _encode_column(series):
+    """Returns (array to save, metadata needed to rebuild the column)."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), {"kind": "category", "categories": series.cat.categories.tolist()}
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        tz = str(dtype.tz)
+        try:
+            pd.Timestamp(0, tz=tz)
+        except (ValueError, TypeError):
+            raise _UncacheableColumn(f"timezone {tz!r} can't be restored by name")
+        values = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+        return values, {"kind": "datetime_tz", "tz": tz}
+    if dtype.kind in 'biufM':
+        return series.to_numpy(), {"kind": "numpy"}
+    # Strings/objects: store factorized codes plus the unique values.
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    uniques = uniques.tolist()
+    if not all(isinstance(u, str) for u in uniques):
+        raise _UncacheableColumn(f"column {series.name!r} holds non-string objects")
+    return codes, {"kind": "strings", "values": uniques, "dtype": str(dtype)}
+
+
+def _decode_column(array, meta):
+    kind = meta["kind"]
+    if kind == "category":
+        return pd.Categorical.from_codes(array, categories=meta["categories"])
+    if kind == "datetime_tz":
+        return pd.Series(array).dt.tz_localize('UTC').dt.tz_convert(meta["tz"])
+    if kind == "strings":
+        values = np.array(meta["values"] + [np.nan], dtype=object)
+        # Code -1 (missing) picks the trailing NaN.
+        return pd.array(values[array], dtype=meta["dtype"])
+    return array
+
+
+def _write_cache(cache_dir, df, source_meta):
+    encoded = {}
+    for i, column in enumerate(df.columns):
+        array, meta = _encode_column(df[column])
+        encoded[column] = (f"col{i}.npy", array, meta)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Columns go into a fresh version directory; meta.json is swapped in last,
+    # so readers only ever see a complete cache.
+    version_dir = tempfile.mkdtemp(dir=cache_dir, prefix='v-')
+    for filename, array, _ in encoded.values():
+        np.save(os.path.join(version_dir, filename), array, allow_pickle=False)
+
+    meta = dict(source_meta)
+    meta["format"] = CACHE_FORMAT_VERSION
+    meta["version_dir"] = os.path.basename(version_dir)
+    meta["columns"] = [{"name": name, "file": f, **m} for name, (f, _, m) in encoded.items()]
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.json')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(cache_dir, 'meta.json'))
+
+    for entry in os.listdir(cache_dir):
+        if entry.startswith('v-') and entry != meta["version_dir"]:
+            shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+
+
+def _read_cache(cache_dir, meta):
+    version_dir = os.path.join(cache_dir, meta["version_dir"])
+    columns = {}
+    for column in meta["columns"]:
+        # mmap_mode='c': pages are shared with the OS file cache and copied
+        # privately only if the caller writes to them.
+        array = np.load(os.path.join(version_dir, column["file"]), mmap_mode='c', allow_pickle=False)
+        columns[column["name"]] = _decode_column(array, column)
+    # copy=False keeps one block per column, so numeric columns stay views of
+    # the maps instead of being consolidated into a fresh 2-D copy.
+    return pd.DataFrame(columns, copy=False)
+
+
+def _load_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), 'r') as f:
+            meta = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return meta if meta.get("format") == CACHE_FORMAT_VERSION else None
+
+
+def load_cached(path, reader):
+    """
+    Returns `reader(path)`, caching the parsed frame as memory-mapped NumPy
+    columns beside the source. The cache is reused while the source's size and
+    mtime are unchanged; if only the mtime moved, the content hash decides.
+    A cache written by a different reader (see `reader_fingerprint`) is
+    rebuilt. Falls back to a plain `reader(path)` if the cache can't be written.
+    """
+    cache_dir = cache_dir_for(path)
+    stat = os.stat(path)
+    meta = _load_meta(cache_dir)
+    reader_key = reader_fingerprint(reader)
+
+    if meta and meta.get("reader") == reader_key and meta["size"] == stat.st_size:
+        try:
+            if meta["mtime_ns"] == stat.st_mtime_ns:
+                return _read_cache(cache_dir, meta)
+            if meta["sha256"] == file_sha256(path):
+                # Touched but unchanged (e.g. re-copied): refresh the mtime only.
+                meta["mtime_ns"] = stat.st_mtime_ns
+                fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.json')
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(meta, f)
+                os.replace(tmp_path, os.path.join(cache_dir, 'meta.json'))
+                return _read_cache(cache_dir, meta)
+        except (OSError, ValueError, KeyError):
+            pass  # damaged cache: rebuild below
+
+    df = reader(path)
+    source_meta = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_sha256(path),
+                   "reader": reader_key}
+    try:
+        _write_cache(cache_dir, df, source_meta)
+    except (OSError, TypeError, _UncacheableColumn) as e:
+        print(f"Warning: not caching {path}: {e}")
+    return df
@@ -0,0 +1,337 @@
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Opt in from the environment: SBB_TRACE=trace.jsonl (or 1 for in-memory only),
+# SBB_TRACE_MEMORY=1 to also measure peak memory with tracemalloc, and
+# SBB_METRICS=metrics.prom to write the Prometheus text file at exit.
+TRACE_ENV = 'SBB_TRACE'
+TRACE_MEMORY_ENV = 'SBB_TRACE_MEMORY'
+METRICS_ENV = 'SBB_METRICS'
+METRIC_PREFIX = 'sbb_span'
+
+_current = contextvars.ContextVar('sbb_current_span', default=None)
+_ids = itertools.count(1)
+
+
+class _State:
+    def __init__(self):
+        self.enabled = False
+        self.enabled_by_env = False
+        self.trace_memory = False
+        self.owns_tracemalloc = False
+        self.memory_spans = 0  # spans measuring memory right now, in any thread
+        self.trace_path = None
+        self.recent = deque(maxlen=2000)
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self.trace_file = None
+
+
+_state = _State()
+
+
+class _NoopSpan:
+    """Returned by span() while instrumentation is off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+    rows = property(lambda self: None, lambda self, value: None)
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """
+    One timed section. Spans opened inside it (same thread or asyncio task,
+    or a thread started with the caller's context) become its children.
+    Set `rows` to the number of rows processed.
+
+    tracemalloc keeps one process-wide peak, so a span's peak memory is exact
+    only while the spans running are itself and its ancestors. A span that
+    starts while an unrelated one (e.g. a sibling in another thread) is
+    running can't reset the peak without corrupting the other's; it leaves
+    it alone and reports an upper bound that may include the other's memory.
+    """
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.rows = None
+        self.span_id = next(_ids)
+        self.parent = None
+        self._token = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.parent = _current.get()
+        self.trace_id = self.parent.trace_id if self.parent else self.span_id
+        self.depth = self.parent.depth + 1 if self.parent else 0
+        self._token = _current.set(self)
+        self._mem_start = None
+        if _state.trace_memory:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                measured_parent = self.parent is not None and self.parent._mem_start is not None
+                self._mem_depth = self.parent._mem_depth + 1 if measured_parent else 0
+                with _state.lock:
+                    current, peak = tracemalloc.get_traced_memory()
+                    if measured_parent:
+                        self.parent._mem_max = max(self.parent._mem_max, peak)
+                    # Only ancestors running: they have just taken the peak so far.
+                    if _state.memory_spans == self._mem_depth:
+                        tracemalloc.reset_peak()
+                    _state.memory_spans += 1
+                self._mem_start = self._mem_max = current
+        self.start = time.time()
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        peak = None
+        if self._mem_start is not None:
+            import tracemalloc
+            with _state.lock:
+                _state.memory_spans -= 1
+            if tracemalloc.is_tracing():
+                self._mem_max = max(self._mem_max, tracemalloc.get_traced_memory()[1])
+                if self.parent is not None and self.parent._mem_start is not None:
+                    self.parent._mem_max = max(self.parent._mem_max, self._mem_max)
+                peak = self._mem_max - self._mem_start
+        _current.reset(self._token)
+        _record({
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "depth": self.depth,
+            "name": self.name,
+            "start": self.start,
+            "wall_ms": round(wall * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+            "peak_bytes": peak,
+            "rows": self.rows,
+            "thread": threading.current_thread().name,
+            "error": exc_type.__name__ if exc_type else None,
+            "attrs": self.attrs
+        })
+        return False
+
+
+def _record(record):
+    with _state.lock:
+        _state.recent.append(record)
+        m = _state.metrics.get(record["name"])
+        if m is None:
+            m = _state.metrics[record["name"]] = {"count": 0, "errors": 0, "wall_seconds": 0.0,
+                                                 "cpu_seconds": 0.0, "rows": 0, "peak_bytes": 0}
+        m["count"] += 1
+        m["errors"] += record["error"] is not None
+        m["wall_seconds"] += record["wall_ms"] / 1000
+        m["cpu_seconds"] += record["cpu_ms"] / 1000
+        m["rows"] += record["rows"] or 0
+        m["peak_bytes"] = max(m["peak_bytes"], record["peak_bytes"] or 0)
+        if _state.trace_file is not None:
+            _state.trace_file.write(json.dumps(record, default=str) + "\n")
+            _state.trace_file.flush()
+
+
+def enable(trace_path=None, trace_memory=False, buffer_size=2000):
+    """
+    Starts recording spans: always to an in-memory buffer and metrics table,
+    and as JSON lines to `trace_path` when given. `trace_memory` turns on
+    tracemalloc for peak memory per span, which slows allocations noticeably.
+    """
+    with _state.lock:
+        if _state.trace_file is not None and trace_path != _state.trace_path:
+            _state.trace_file.close()
+            _state.trace_file = None
+        if trace_path and _state.trace_file is None:
+            _state.trace_file = open(trace_path, 'a')
+        _state.trace_path = trace_path
+        if buffer_size != _state.recent.maxlen:
+            _state.recent = deque(_state.recent, maxlen=buffer_size)
+    if trace_memory:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _state.owns_tracemalloc = True
+    _state.trace_memory = trace_memory
+    _state.enabled = True
+
+
+def disable():
+    """Stops recording. Recorded spans and metrics are kept until reset()."""
+    _state.enabled = False
+    if _state.owns_tracemalloc:
+        import tracemalloc
+        tracemalloc.stop()
+        _state.owns_tracemalloc = False
+    _state.trace_memory = False
+    with _state.lock:
+        if _state.trace_file is not None:
+            _state.trace_file.close()
+            _state.trace_file = None
+
+
+def is_enabled():
+    return _state.enabled
+
+
+def is_enabled_by_env():
+    """True if SBB_TRACE turned instrumentation on at import."""
+    return _state.enabled_by_env
+
+
+def reset():
+    with _state.lock:
+        _state.recent.clear()
+        _state.metrics.clear()
+
+
+def span(name, **attrs):
+    """Context manager timing a section; a shared no-op while disabled."""
+    if not _state.enabled:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def traced(name=None, rows=None):
+    """
+    Decorator wrapping each call in a span. `rows(result, *args, **kwargs)`
+    returns how many rows the call processed. Disabled, it costs one flag check.
+    """
+    def decorate(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            with Span(span_name, {}) as s:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    try:
+                        s.rows = rows(result, *args, **kwargs)
+                    except Exception:
+                        pass  # a row count must never break the call
+                return result
+        return wrapper
+    return decorate
+
+
+def recent_spans(since=None):
+    """Finished spans, oldest first, optionally only those started at or after `since` (epoch seconds)."""
+    with _state.lock:
+        spans = list(_state.recent)
+    if since is not None:
+        spans = [s for s in spans if s["start"] >= since]
+    return spans
+
+
+def span_tree(spans):
+    """Orders spans depth-first (parents before children, by start time) for display."""
+    children = {}
+    ids = {s["span_id"] for s in spans}
+    for s in sorted(spans, key=lambda s: s["start"]):
+        parent = s["parent_id"] if s["parent_id"] in ids else None
+        children.setdefault(parent, []).append(s)
+    ordered = []
+    stack = list(reversed(children.get(None, [])))
+    while stack:
+        s = stack.pop()
+        ordered.append(s)
+        stack.extend(reversed(children.get(s["span_id"], [])))
+    return ordered
+
+
+def metrics():
+    """Per span name: count, errors, wall/CPU seconds, rows and the largest peak memory."""
+    with _state.lock:
+        return {name: dict(m) for name, m in _state.metrics.items()}
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text():
+    """The metrics in the Prometheus text exposition format."""
+    series = [
+        ("calls_total", "count", "counter", "Finished spans."),
+        ("errors_total", "errors", "counter", "Spans that raised."),
+        ("wall_seconds_total", "wall_seconds", "counter", "Wall-clock time inside spans."),
+        ("cpu_seconds_total", "cpu_seconds", "counter", "CPU time of the span's thread inside spans."),
+        ("rows_total", "rows", "counter", "Rows processed inside spans."),
+        ("peak_memory_bytes", "peak_bytes", "gauge", "Largest traced allocation peak of one span.")
+    ]
+    snapshot = metrics()
+    lines = []
+    for suffix, key, kind, help_text in series:
+        metric = f"{METRIC_PREFIX}_{suffix}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name in sorted(snapshot):
+            lines.append(f'{metric}{{span="{_label(name)}"}} {snapshot[name][key]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """Writes prometheus_text() atomically, e.g. for node_exporter's textfile collector."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+
+def serve_metrics(port=9108, host='127.0.0.1'):
+    """Serves prometheus_text() at /metrics from a daemon thread; returns the server."""
+    # Deferred: http.server is only needed when metrics are scraped.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='sbb-metrics', daemon=True).start()
+    return server
+
+
+if os.environ.get(TRACE_ENV):
+    _path = os.environ[TRACE_ENV]
+    enable(trace_path=None if _path == '1' else _path,
+           trace_memory=os.environ.get(TRACE_MEMORY_ENV) == '1')
+    _state.enabled_by_env = True
+    if os.environ.get(METRICS_ENV):
+        import atexit
+        atexit.register(write_prometheus, os.environ[METRICS_ENV])
@@ -0,0 +1,188 @@
+"""
+BM25 retrieval over the offline financial tips corpus.
+
+The index (per-posting BM25 weights) is precomputed from the hand-written
+data/financial_tips.jsonl plus the generated data/financial_tips_generated.jsonl
+(see utils/tips_corpus.py) and serialized to data/knowledge_index.json.
+Rebuild it after editing either corpus:
+    python -m smart_budget_buddy.utils.knowledge_index
+"""
+import heapq
+import json
+import math
+import os
+import re
+import threading
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+CORPUS_PATH = os.path.join(DATA_DIR, 'financial_tips.jsonl')
+GENERATED_CORPUS_PATH = os.path.join(DATA_DIR, 'financial_tips_generated.jsonl')
+CORPUS_PATHS = (CORPUS_PATH, GENERATED_CORPUS_PATH)
+INDEX_PATH = os.path.join(DATA_DIR, 'knowledge_index.json')
+INDEX_FORMAT_VERSION = 2
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a about advice am an and any are as at be best but by can do does don for from get good has have help "
+    "how i idea ideas if in is it just make making me much my no not of on or should so some t that the "
+    "their them there they this tip tips to too want was way ways what when where which who why will with "
+    "won you your".split()
+)
+
+
+def _stem(word):
+    # Deliberately crude: enough to map "savings"/"saving"/"save" together.
+    if len(word) > 4 and word.endswith('ies'):
+        word = word[:-3] + 'y'
+    elif len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+    for suffix in ('ing', 'ed'):
+        if len(word) >= len(suffix) + 3 and word.endswith(suffix):
+            word = word[:-len(suffix)]
+            # "setting" -> "set", "planned" -> "plan", but "rolling" stays "roll".
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'aeiouls':
+                word = word[:-1]
+            return word
+    if len(word) > 3 and word.endswith('e'):
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    return [_stem(t) for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _document_fields(doc):
+    """(heading, body) of a tip: its title plus tags, and its text."""
+    return " ".join([doc.get("title", "")] + doc.get("tags", [])), doc["text"]
+
+
+def read_corpus(path=CORPUS_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def read_corpora(paths=CORPUS_PATHS):
+    return [doc for path in paths for doc in read_corpus(path)]
+
+
+def _sha256(paths):
+    # Deferred: hashlib is a noticeable share of this module's import time.
+    import hashlib
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """
+    Inverted index with precomputed BM25 weights.
+
+    Headings (title and tags) and bodies are scored as separate fields, each
+    with its own idf and length normalization, and the heading score counts
+    `heading_weight` times. The generated tips all mention saving in their
+    bodies; a shared idf would make "save" worthless even where it is what
+    a tip is about. Each posting stores the combined weight for its
+    document, so a query only sums weights over the postings of its terms.
+    """
+
+    def __init__(self, docs, postings, meta=None):
+        self.docs = docs
+        self.postings = postings  # term -> [[doc_index, weight], ...]
+        self.meta = meta or {}
+
+    @classmethod
+    def build(cls, docs, k1=1.5, b=0.75, heading_weight=2.0):
+        n_docs = len(docs)
+        fields = zip(*(_document_fields(doc) for doc in docs)) if docs else ()
+        weights = {}  # term -> {doc_index: weight}
+        for field_weight, texts in zip((heading_weight, 1.0), fields):
+            doc_terms = [tokenize(text) for text in texts]
+            avg_len = sum(len(terms) for terms in doc_terms) / n_docs or 1
+
+            frequencies = {}  # term -> {doc_index: tf}
+            for i, terms in enumerate(doc_terms):
+                for term in terms:
+                    tf = frequencies.setdefault(term, {})
+                    tf[i] = tf.get(i, 0) + 1
+
+            for term, tf in frequencies.items():
+                idf = math.log(1 + (n_docs - len(tf) + 0.5) / (len(tf) + 0.5))
+                doc_weights = weights.setdefault(term, {})
+                for i, f in tf.items():
+                    norm = k1 * (1 - b + b * len(doc_terms[i]) / avg_len)
+                    doc_weights[i] = doc_weights.get(i, 0.0) + field_weight * idf * f * (k1 + 1) / (f + norm)
+
+        postings = {term: [[i, round(w, 6)] for i, w in sorted(doc_weights.items())]
+                    for term, doc_weights in weights.items()}
+        return cls(docs, postings, {"k1": k1, "b": b, "heading_weight": heading_weight, "n_docs": n_docs})
+
+    def search(self, query, k=3):
+        """Returns up to k (score, doc) pairs, best first."""
+        scores = {}
+        for term in set(tokenize(query)):
+            for i, weight in self.postings.get(term, ()):
+                scores[i] = scores.get(i, 0.0) + weight
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(score, self.docs[i]) for i, score in best]
+
+    def save(self, path, corpus_sha256=None):
+        data = {
+            "version": INDEX_FORMAT_VERSION,
+            "corpus_sha256": corpus_sha256,
+            "meta": self.meta,
+            "docs": self.docs,
+            "postings": self.postings
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported knowledge index version: {data.get('version')}")
+        index = cls(data["docs"], data["postings"], data["meta"])
+        index.meta["corpus_sha256"] = data.get("corpus_sha256")
+        return index
+
+
+def build_index(corpus_paths=CORPUS_PATHS, index_path=INDEX_PATH):
+    index = BM25Index.build(read_corpora(corpus_paths))
+    index.save(index_path, corpus_sha256=_sha256(corpus_paths))
+    return index
+
+
+def load_index(corpus_paths=CORPUS_PATHS, index_path=INDEX_PATH):
+    """Loads the serialized index, rebuilding it in memory if a corpus changed."""
+    try:
+        index = BM25Index.load(index_path)
+        if index.meta.get("corpus_sha256") == _sha256(corpus_paths):
+            return index
+        print("Warning: knowledge index is stale; rebuilding from the tips corpus.")
+    except (OSError, ValueError) as e:
+        print(f"Warning: could not load knowledge index ({e}); rebuilding from the tips corpus.")
+    return BM25Index.build(read_corpora(corpus_paths))
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_default_index():
+    """The bundled tips index, loaded on first use."""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = load_index()
+        return _default_index
+
+
+if __name__ == "__main__":
+    built = build_index()
+    print(f"Indexed {len(built.docs)} tips ({len(built.postings)} terms) -> {INDEX_PATH}")
@@ -0,0 +1,293 @@
+import random
+import threading
+import time
+
+# Exception class names (google.api_core and builtins) worth retrying.
+TRANSIENT_ERRORS = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "TimeoutError", "ConnectionError"
+}
+TRANSIENT_CODES = {429, 500, 502, 503, 504}
+
+
+def is_transient(error):
+    if type(error).__name__ in TRANSIENT_ERRORS:
+        return True
+    return getattr(error, 'code', None) in TRANSIENT_CODES
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests/sec with bursts of `capacity`.
+
+    Callers reserve a token up front and then sleep for their turn, so
+    waiting callers are served in arrival order without busy polling.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Takes a token and returns how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        time.sleep(self.reserve())
+
+
+def _gemini_model(api_key, model_name):
+    # Deferred: the Gemini SDK is slow to import and only needed online.
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
+
+
+class _SlotStream:
+    """Async stream that holds a concurrency slot until it is read to the end or closed."""
+
+    def __init__(self, response, slots):
+        self._chunks = response.__aiter__()
+        self._slots = slots
+        self._held = True
+
+    def _release(self):
+        if self._held:
+            self._held = False
+            self._slots.release()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._chunks.__anext__()
+        except BaseException:
+            # Includes StopAsyncIteration and cancellation.
+            self._release()
+            raise
+
+    async def aclose(self):
+        self._release()
+        if hasattr(self._chunks, 'aclose'):
+            await self._chunks.aclose()
+
+
+class _InFlight:
+    """Result slot shared by callers waiting on the same prompt."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def finish(self, result=None, error=None):
+        self._result, self._error = result, error
+        self._done.set()
+
+    def wait(self):
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+async def _single_chunk(response):
+    yield response
+
+
+_slot_waiter_pool = None
+_slot_waiter_lock = threading.Lock()
+
+
+def _slot_waiters():
+    # Threads that block on a slot for coroutines. Kept apart from the
+    # default executor so waiting streams can't starve asyncio.to_thread.
+    global _slot_waiter_pool
+    with _slot_waiter_lock:
+        if _slot_waiter_pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _slot_waiter_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix='llm-slot')
+        return _slot_waiter_pool
+
+
+class PooledModel:
+    """
+    A shared model client that rate-limits, bounds concurrency, retries
+    transient errors with jittered backoff and coalesces identical
+    in-flight prompts. Drop-in for a Gemini GenerativeModel in this app.
+    """
+
+    def __init__(self, model, limiter, slots, max_retries=3, base_delay=0.5, max_delay=8.0):
+        self.model = model
+        self.limiter = limiter
+        self.slots = slots
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._in_flight = {}  # prompt -> _InFlight
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "calls": 0, "coalesced": 0, "retries": 0, "failures": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _backoff(self, attempt):
+        # "Full jitter": spreads retries from many sessions apart.
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _call_with_retries(self, call):
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            with self.slots:
+                self._count("calls")
+                try:
+                    return call()
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_transient(e):
+                        self._count("failures")
+                        raise
+            attempt += 1
+            self._count("retries")
+            time.sleep(self._backoff(attempt))
+
+    def generate_content(self, prompt, stream=False):
+        self._count("requests")
+        if stream:
+            # Streams are consumed incrementally, so they are not shared.
+            return self._call_with_retries(lambda: self.model.generate_content(prompt, stream=True))
+
+        with self._lock:
+            pending = self._in_flight.get(prompt)
+            if pending is None:
+                pending = self._in_flight[prompt] = _InFlight()
+                owner = True
+            else:
+                self.stats["coalesced"] += 1
+                owner = False
+        if not owner:
+            return pending.wait()
+
+        try:
+            result = self._call_with_retries(lambda: self.model.generate_content(prompt))
+            pending.finish(result=result)
+            return result
+        except Exception as e:
+            pending.finish(error=e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[prompt]
+
+    async def _acquire_slot(self):
+        """Waits for a concurrency slot without blocking the event loop."""
+        import asyncio
+
+        if self.slots.acquire(blocking=False):
+            return
+        # The slots are shared with the blocking path, so they are threading
+        # primitives: a worker thread waits and is woken by the release itself.
+        waiting = _slot_waiters().submit(self.slots.acquire)
+        try:
+            await asyncio.wrap_future(waiting)
+        except asyncio.CancelledError:
+            # A wait that hasn't started is dropped; one already under way
+            # hands its slot straight back once it gets it.
+            if not waiting.cancel():
+                waiting.add_done_callback(lambda _: self.slots.release())
+            raise
+
+    async def generate_content_async(self, prompt, stream=False):
+        import asyncio
+
+        if not stream:
+            return await asyncio.to_thread(self.generate_content, prompt)
+        if not hasattr(self.model, 'generate_content_async'):
+            # No async streaming underneath: deliver the whole answer as one chunk.
+            return _single_chunk(await asyncio.to_thread(self.generate_content, prompt))
+
+        self._count("requests")
+        attempt = 0
+        while True:
+            await asyncio.sleep(self.limiter.reserve())
+            await self._acquire_slot()
+            self._count("calls")
+            try:
+                response = await self.model.generate_content_async(prompt, stream=True)
+                # From here the stream owns the slot and releases it when done.
+                return _SlotStream(response, self.slots)
+            except BaseException as e:
+                # Includes cancellation, e.g. stream_text's timeout on a hung open.
+                self.slots.release()
+                if not isinstance(e, Exception):
+                    raise
+                if attempt >= self.max_retries or not is_transient(e):
+                    self._count("failures")
+                    raise
+            attempt += 1
+            self._count("retries")
+            await asyncio.sleep(self._backoff(attempt))
+
+
+class ModelPool:
+    """
+    Process-wide PooledModel instances keyed by (api_key, model_name).
+
+    Rate limits are per API key, because quotas are; the concurrency bound is
+    shared by every model in the pool. Note the Gemini SDK holds a single
+    global configuration, so only one API key can be active per process.
+    """
+
+    def __init__(self, requests_per_second=1.0, burst=5, max_concurrency=4, max_retries=3,
+                 base_delay=0.5, max_delay=8.0, model_factory=_gemini_model):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.model_factory = model_factory
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self._limiters = {}
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def get(self, api_key, model_name):
+        with self._lock:
+            key = (api_key, model_name)
+            pooled = self._models.get(key)
+            if pooled is None:
+                if self._limiters and api_key not in self._limiters:
+                    print("Warning: configuring a second Gemini API key; the SDK uses the latest one process-wide.")
+                limiter = self._limiters.get(api_key)
+                if limiter is None:
+                    limiter = self._limiters[api_key] = TokenBucket(self.requests_per_second, self.burst)
+                pooled = PooledModel(self.model_factory(api_key, model_name), limiter, self.slots,
+                                     self.max_retries, self.base_delay, self.max_delay)
+                self._models[key] = pooled
+            return pooled
+
+    def stats(self):
+        with self._lock:
+            return {name: dict(pooled.stats) for (_, name), pooled in self._models.items()}
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_model_pool():
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = ModelPool()
+        return _shared_pool
@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+
+async def stream_text(model, prompt, timeout=None):
+    """
+    Yields text chunks from a Gemini-style model as they arrive.
+
+    Uses the model's async streaming API when it has one and falls back to a
+    single blocking call in a worker thread otherwise. `timeout` bounds the
+    whole response in seconds; asyncio.TimeoutError is raised when it runs out.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    def remaining():
+        if deadline is None:
+            return None
+        left = deadline - time.monotonic()
+        if left <= 0:
+            raise asyncio.TimeoutError()
+        return left
+
+    if not hasattr(model, 'generate_content_async'):
+        response = await asyncio.wait_for(asyncio.to_thread(model.generate_content, prompt), remaining())
+        yield response.text
+        return
+
+    response = await asyncio.wait_for(model.generate_content_async(prompt, stream=True), remaining())
+    chunks = response.__aiter__()
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), remaining())
+            except StopAsyncIteration:
+                return
+            if chunk.text:
+                yield chunk.text
+    finally:
+        # Stop the underlying stream promptly when cancelled or abandoned.
+        if hasattr(chunks, 'aclose'):
+            await chunks.aclose()
+
+
+def iterate_sync(async_gen):
+    """
+    Drives an async generator from synchronous code (e.g. st.write_stream).
+
+    Closing the returned generator early cancels the async one, so its
+    cleanup runs exactly as it would under asyncio cancellation.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(async_gen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(async_gen.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeStream:
+    def __init__(self, model, text):
+        self._model = model
+        self._text = text
+
+    async def __aiter__(self):
+        await asyncio.sleep(self._model.first_token_latency)
+        for i, token in enumerate(self._model.tokenize(self._text)):
+            if i:
+                await asyncio.sleep(self._model.token_latency)
+            yield _Chunk(token)
+
+
+class FakeStreamingModel:
+    """
+    Offline stand-in for a Gemini GenerativeModel.
+
+    Emits `response` (or `response(prompt)` when callable) word by word after
+    `first_token_latency` seconds, then one word every `token_latency`
+    seconds. The blocking generate_content waits for the whole answer, which
+    makes time-to-first-token measurable without network access.
+    """
+
+    def __init__(self, response="Start small: save a little every week. 💰", first_token_latency=0.3, token_latency=0.02):
+        self.response = response
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.calls = 0
+
+    def _text_for(self, prompt):
+        self.calls += 1
+        return self.response(prompt) if callable(self.response) else self.response
+
+    @staticmethod
+    def tokenize(text):
+        words = text.split(' ')
+        return [word + ' ' for word in words[:-1]] + words[-1:]
+
+    def generate_content(self, prompt, stream=False):
+        text = self._text_for(prompt)
+        tokens = self.tokenize(text)
+        time.sleep(self.first_token_latency + self.token_latency * max(len(tokens) - 1, 0))
+        if stream:
+            return [_Chunk(token) for token in tokens]
+        return _Chunk(text)
+
+    async def generate_content_async(self, prompt, stream=False):
+        text = self._text_for(prompt)
+        if stream:
+            return _FakeStream(self, text)
+        tokens = self.tokenize(text)
+        await asyncio.sleep(self.first_token_latency + self.token_latency * max(len(tokens) - 1, 0))
+        return _Chunk(text)
@@ -1,19 +1,90 @@
+import hashlib
 import json
 import os
+import tempfile
 from datetime import datetime
+from .instrumentation import traced
+
+JOURNAL_SUFFIX = '.journal'
+ARCHIVE_SUFFIX = '.archive.jsonl'
+
+# Most recent entries kept in the live document per collection (None = unbounded).
+# Older entries are moved to the archive file rather than dropped.
+DEFAULT_LIMITS = {
+    "conversation_history": 500,
+    "budget_plans": 20
+}
+
+# Journal operations that append to a bounded collection.
+_COLLECTION_OPS = {
+    "chat": "conversation_history",
+    "budget": "budget_plans"
+}
+
+
+def _atomic_write_json(path, data, fsync=False):
+    """Writes JSON to a temp file beside `path` and atomically swaps it in."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=4)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
 class MemoryStore:
-    def __init__(self, file_path='user_data.json'):
+    """
+    JSON-backed store for the user profile, chat history and budget plans.
+
+    With journal=True every mutation is appended as one JSON line to
+    `<file_path>.journal` instead of rewriting the whole document, so a write
+    costs the same no matter how long the history is. Every `compact_every`
+    entries the journal is folded into the snapshot (`file_path`, same format
+    as before) with an atomic replace. The snapshot records the last journal
+    sequence number it contains, so a crash between the replace and the
+    journal truncation never replays an entry twice.
+
+    `conversation_history` and `budget_plans` are ring buffers bounded by
+    `limits`; entries pushed out are appended to `<file_path>.archive.jsonl`.
+    Saving a budget plan identical to the latest one is skipped.
+    """
+
+    def __init__(self, file_path='user_data.json', journal=False, compact_every=1000, fsync=False, limits=None):
         self.file_path = file_path
+        self.journal = journal
+        self.journal_path = file_path + JOURNAL_SUFFIX
+        self.archive_path = file_path + ARCHIVE_SUFFIX
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.limits = dict(DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self._seq = 0
+        self._pending = 0
+        self._journal_file = None
+        self._latest_plan_hash = None
         self.data = self._load_data()
+        if self.journal:
+            self._replay_journal()
+        self._enforce_limits()
 
     def _load_data(self):
         if os.path.exists(self.file_path):
             try:
                 with open(self.file_path, 'r') as f:
-                    return json.load(f)
+                    data = json.load(f)
             except json.JSONDecodeError:
                 return self._init_structure()
+            meta = data.pop("_meta", {})
+            self._seq = meta.get("journal_seq", 0)
+            return data
         else:
             return self._init_structure()
 
@@ -25,13 +96,130 @@ class MemoryStore:
             "goals": []
         }
 
+    def _replay_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        good_offset = 0
+        torn = False
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # A crash mid-append leaves a partial last line; drop it.
+                    torn = True
+                    break
+                good_offset += len(line)
+                if entry["seq"] <= self._seq:
+                    continue
+                self._apply(entry["op"], entry.get("data"))
+                self._seq = entry["seq"]
+                self._pending += 1
+        if torn:
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(good_offset)
+
+    def _apply(self, op, payload):
+        if op == "profile":
+            self.data["user_profile"].update(payload)
+        elif op == "chat":
+            self.data["conversation_history"].append(payload)
+        elif op == "clear_history":
+            self.data["conversation_history"] = []
+        elif op == "budget":
+            self.data["budget_plans"].append(payload)
+            self._latest_plan_hash = None
+        elif op == "trim":
+            del self.data[payload["collection"]][:payload["count"]]
+        else:
+            raise ValueError(f"Unknown journal operation: {op}")
+
+    def _archive_overflow(self, collection):
+        """Moves entries beyond the collection's limit to the archive file."""
+        limit = self.limits.get(collection)
+        entries = self.data.get(collection, [])
+        if limit is None or len(entries) <= limit:
+            return None
+        count = len(entries) - limit
+        with open(self.archive_path, 'a') as f:
+            for entry in entries[:count]:
+                f.write(json.dumps({"collection": collection, "entry": entry}) + "\n")
+        return {"collection": collection, "count": count}
+
+    def _enforce_limits(self):
+        trims = [t for t in (self._archive_overflow(c) for c in self.limits) if t]
+        for trim in trims:
+            self._apply("trim", trim)
+        if not trims:
+            return
+        if self.journal:
+            for trim in trims:
+                self._append_journal("trim", trim)
+            self._maybe_compact()
+        else:
+            self.save_data()
+
+    def _commit(self, op, payload=None):
+        self._apply(op, payload)
+        entries = [(op, payload)]
+        # Archive before the trim is recorded, so a crash in between can only
+        # duplicate an archived entry, never lose one.
+        trim = self._archive_overflow(_COLLECTION_OPS.get(op))
+        if trim:
+            self._apply("trim", trim)
+            entries.append(("trim", trim))
+
+        if not self.journal:
+            self.save_data()
+            return
+        for entry_op, entry_payload in entries:
+            self._append_journal(entry_op, entry_payload)
+        self._maybe_compact()
+
+    def _append_journal(self, op, payload):
+        self._seq += 1
+        line = json.dumps({"seq": self._seq, "op": op, "data": payload}) + "\n"
+        if self._journal_file is None:
+            self._journal_file = open(self.journal_path, 'a')
+        self._journal_file.write(line)
+        self._journal_file.flush()
+        if self.fsync:
+            os.fsync(self._journal_file.fileno())
+
+        self._pending += 1
+
+    def _maybe_compact(self):
+        # Only called once all journal entries for an in-memory change are
+        # written, so a snapshot never runs ahead of its recorded sequence.
+        if self.compact_every and self._pending >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Folds the journal into the snapshot file and truncates the journal."""
+        snapshot = dict(self.data)
+        snapshot["_meta"] = {"journal_seq": self._seq}
+        _atomic_write_json(self.file_path, snapshot, fsync=self.fsync)
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+        if os.path.exists(self.journal_path):
+            open(self.journal_path, 'w').close()
+        self._pending = 0
+
+    def close(self):
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+    @traced("MemoryStore.save_data")
     def save_data(self):
-        with open(self.file_path, 'w') as f:
-            json.dump(self.data, f, indent=4)
+        if self.journal:
+            self.compact()
+        else:
+            _atomic_write_json(self.file_path, self.data, fsync=self.fsync)
 
     def update_profile(self, profile_data):
-        self.data["user_profile"].update(profile_data)
-        self.save_data()
+        self._commit("profile", dict(profile_data))
 
     def get_profile(self):
         return self.data.get("user_profile", {})
@@ -42,20 +230,49 @@ class MemoryStore:
             "content": content,
             "timestamp": datetime.now().isoformat()
         }
-        self.data["conversation_history"].append(message)
-        self.save_data()
+        self._commit("chat", message)
 
     def get_history(self):
         return self.data.get("conversation_history", [])
 
+    def get_recent_history(self, n=5):
+        """Returns the last `n` messages without copying the whole history."""
+        history = self.data.get("conversation_history", [])
+        return history[-n:] if n > 0 else []
+
+    def iter_archive(self, collection=None):
+        """Yields archived entries, oldest first, optionally for one collection."""
+        if not os.path.exists(self.archive_path):
+            return
+        with open(self.archive_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if collection is None or record["collection"] == collection:
+                    yield record["entry"]
+
     def clear_history(self):
-        self.data["conversation_history"] = []
-        self.save_data()
+        self._commit("clear_history")
+
+    @staticmethod
+    def _plan_hash(plan):
+        content = {k: v for k, v in plan.items() if k != 'timestamp'}
+        encoded = json.dumps(content, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
 
     def save_budget_plan(self, plan):
+        """Saves a budget plan. Returns False if it matches the latest saved plan."""
+        plan_hash = self._plan_hash(plan)
+        if self._latest_plan_hash is None and self.data["budget_plans"]:
+            self._latest_plan_hash = self._plan_hash(self.data["budget_plans"][-1])
+        if plan_hash == self._latest_plan_hash:
+            return False
         plan['timestamp'] = datetime.now().isoformat()
-        self.data["budget_plans"].append(plan)
-        self.save_data()
+        self._commit("budget", plan)
+        self._latest_plan_hash = plan_hash
+        return True
 
     def get_latest_budget(self):
         if self.data["budget_plans"]:
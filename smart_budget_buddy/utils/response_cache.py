@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text):
+    """Case-, punctuation- and spacing-insensitive form of a chat query."""
+    text = _PUNCTUATION.sub(" ", text.lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def context_hash(*parts):
+    """Stable hash of JSON-serializable context (profile, model name, ...)."""
+    encoded = json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache for LLM responses with an optional SQLite tier on disk.
+
+    The memory tier is per process (share one instance between sessions);
+    the disk tier at `persist_path` is shared by every process using the same
+    file. Entries older than `ttl_seconds` are never served.
+    """
+
+    def __init__(self, max_entries=512, ttl_seconds=24 * 3600, persist_path=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = persist_path
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if persist_path:
+            self._execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _execute(self, *statements):
+        """Runs (sql, params) statements in one transaction; returns the last row fetched."""
+        # A short-lived connection per call keeps this safe across threads and processes.
+        conn = sqlite3.connect(self.persist_path, timeout=5)
+        try:
+            with conn:
+                row = None
+                for statement in statements:
+                    sql, params = statement if isinstance(statement, tuple) else (statement, ())
+                    row = conn.execute(sql, params).fetchone()
+                return row
+        finally:
+            conn.close()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+
+        if self.persist_path:
+            try:
+                row = self._execute(
+                    ("SELECT value, expires_at FROM responses WHERE key = ? AND expires_at > ?", (key, now))
+                )
+            except sqlite3.Error:
+                row = None
+            if row is not None:
+                self._remember(key, row[0], row[1])
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return row[0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _remember(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put(self, key, value):
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, value, expires_at)
+        if self.persist_path:
+            try:
+                self._execute(
+                    ("INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                     (key, value, expires_at)),
+                    ("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+                )
+            except sqlite3.Error as e:
+                print(f"Warning: response cache write failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.persist_path and os.path.exists(self.persist_path):
+            self._execute("DELETE FROM responses")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
+# Process-wide default so every chat session in one server shares answers.
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_response_cache():
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
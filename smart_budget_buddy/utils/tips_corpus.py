@@ -0,0 +1,212 @@
+"""
+Generates the extended offline tips corpus, data/financial_tips_generated.jsonl.
+
+Each tip pairs one concrete saving action for a spending area with a student
+situation and a worked example at a typical monthly spend, which gives the
+BM25 index a realistically sized corpus (a few thousand tips) next to the
+hand-written data/financial_tips.jsonl. Output is deterministic; regenerate
+it and then the index after editing the tables below:
+    python -m smart_budget_buddy.utils.tips_corpus
+    python -m smart_budget_buddy.utils.knowledge_index
+"""
+import json
+import os
+
+from .knowledge_index import GENERATED_CORPUS_PATH
+
+SEMESTER_MONTHS = 4
+
+# area -> (title, tags, typical monthly spends, actions)
+# Each action is (key, title, advice, share of the area's spending it saves).
+AREAS = {
+    "groceries": ("Groceries", ["food", "groceries", "grocery", "supermarket"], (150, 250, 400), [
+        ("list", "Shop with a list", "Write a list from the week's meals before you go and buy only what is on it.", 0.15),
+        ("store-brands", "Buy store brands", "Swap name brands for the store's own label on staples like rice, pasta, cereal and canned goods.", 0.20),
+        ("unit-price", "Compare unit prices", "Check the price per kilo or per litre on the shelf tag instead of the package price.", 0.10),
+        ("bulk", "Buy staples in bulk", "Buy long-lasting staples such as oats, beans and frozen vegetables in larger packs.", 0.10),
+        ("seasonal", "Buy seasonal produce", "Choose fruit and vegetables that are in season, or frozen ones, which cost less and keep longer.", 0.10),
+        ("full-stomach", "Never shop hungry", "Eat before you shop; hungry shoppers add snacks and ready meals they didn't plan.", 0.08),
+        ("waste", "Waste less food", "Check the fridge before shopping and plan a leftovers night each week so food isn't thrown away.", 0.12),
+        ("loyalty", "Use loyalty apps", "Use the supermarket's free loyalty app or card for member prices and weekly coupons.", 0.07),
+    ]),
+    "eating-out": ("Eating out", ["food", "eating out", "restaurant", "takeaway", "delivery"], (60, 120, 250), [
+        ("cook-more", "Cook two more nights a week", "Replace two takeaway nights a week with simple home-cooked meals.", 0.35),
+        ("delivery", "Skip delivery apps", "Pick up food yourself instead of paying delivery fees, service charges and tips.", 0.25),
+        ("lunch", "Pack lunch", "Bring lunch from home on your longest campus days instead of buying it.", 0.30),
+        ("drinks", "Order water", "Order tap water instead of drinks when you do eat out; drinks are the biggest markup.", 0.15),
+        ("student-deals", "Use student deals", "Ask restaurants near campus about student discounts and set lunch menus.", 0.10),
+        ("limit", "Set an eating-out limit", "Give eating out a fixed weekly amount in cash or a separate card and stop when it's gone.", 0.20),
+        ("potluck", "Host potlucks", "Swap restaurant meals with friends for potlucks where everyone brings a dish.", 0.20),
+        ("happy-hour", "Eat at off-peak times", "Go at lunch or early-bird times when the same dishes are cheaper than at dinner.", 0.10),
+    ]),
+    "coffee-snacks": ("Coffee and snacks", ["coffee", "snacks", "cafe", "vending"], (25, 50, 90), [
+        ("brew", "Make coffee at home", "Brew coffee at home and carry it in a reusable cup.", 0.60),
+        ("cup-discount", "Bring your own cup", "Many cafes take a little off when you bring your own cup.", 0.05),
+        ("snack-box", "Carry snacks", "Keep a bag of fruit, nuts or granola bars so you don't buy vending-machine snacks.", 0.40),
+        ("treat-day", "Pick a treat day", "Keep cafe visits for one planned day a week instead of every day.", 0.50),
+        ("water-bottle", "Carry a water bottle", "Refill a water bottle on campus instead of buying bottled drinks.", 0.15),
+        ("loyalty-card", "Use a loyalty card", "If you do buy coffee, stick to one cafe with a free-drink loyalty card.", 0.10),
+        ("smaller", "Order smaller", "Order the small size without extras; syrups and milk swaps add up.", 0.20),
+        ("track", "Track every purchase", "Log each coffee and snack for two weeks; seeing the total is often enough to cut back.", 0.25),
+    ]),
+    "rent": ("Rent and housing", ["housing", "rent", "apartment", "dorm", "lease"], (400, 650, 950), [
+        ("roommate", "Add a roommate", "Share a larger place with one more roommate to split rent and bills further.", 0.25),
+        ("location", "Live a little farther out", "Compare rents one or two transit stops from campus, counting the extra commute cost.", 0.15),
+        ("negotiate", "Negotiate at renewal", "Ask for a smaller increase or a longer lease at renewal, pointing to comparable listings.", 0.05),
+        ("utilities-included", "Compare with bills included", "Compare listings on total monthly cost, including utilities and internet, not rent alone.", 0.08),
+        ("summer", "Sublet over the summer", "Sublet your room while you're away for the summer, if your lease allows it.", 0.10),
+        ("deposit", "Protect your deposit", "Photograph the place at move-in and move-out so no deposit is lost to old damage.", 0.03),
+        ("ra", "Look at housing jobs", "Ask about resident assistant or caretaker roles that come with reduced or free rent.", 0.40),
+        ("furniture", "Furnish second-hand", "Furnish from second-hand groups and end-of-year sales instead of new stores.", 0.05),
+    ]),
+    "utilities": ("Utilities", ["utilities", "electricity", "heating", "water", "bills"], (40, 80, 140), [
+        ("thermostat", "Turn the heating down", "Lower the heating by a degree or two and wear a sweater at home.", 0.10),
+        ("led", "Switch to LED bulbs", "Replace the bulbs you use most with LEDs.", 0.05),
+        ("standby", "Switch off at the wall", "Turn off chargers, consoles and TVs at the wall instead of leaving them on standby.", 0.05),
+        ("laundry", "Wash cold and full", "Run full loads of laundry on cold and air-dry when you can.", 0.08),
+        ("showers", "Take shorter showers", "Keep showers to about five minutes to cut both water and heating costs.", 0.07),
+        ("tariff", "Compare tariffs", "Compare energy and internet tariffs once a year and switch if a cheaper plan exists.", 0.15),
+        ("drafts", "Block drafts", "Seal drafty windows and doors with cheap draft stoppers before winter.", 0.06),
+        ("split-app", "Split bills fairly", "Split shared bills in an app so everyone pays on time and no one covers late fees.", 0.03),
+    ]),
+    "transport": ("Transport", ["transport", "transportation", "bus", "train", "commute"], (50, 100, 200), [
+        ("pass", "Get a student pass", "Buy the student or monthly transit pass if you ride more than a few times a week.", 0.30),
+        ("bike", "Bike short trips", "Cycle or walk trips under about five kilometres.", 0.25),
+        ("carpool", "Carpool", "Share rides to campus or work with classmates who live nearby and split fuel.", 0.30),
+        ("off-peak", "Travel off-peak", "Book longer train or bus trips off-peak and in advance for lower fares.", 0.20),
+        ("rideshare", "Cut back on rideshares", "Keep rideshares for late nights and emergencies, and take transit otherwise.", 0.35),
+        ("railcard", "Use a student railcard", "Get a student railcard or discount card if you travel by train a few times a year.", 0.15),
+        ("plan-trips", "Combine errands", "Combine errands into one trip instead of several separate journeys.", 0.10),
+        ("campus-shuttle", "Use the campus shuttle", "Check whether your campus runs a free shuttle on your route.", 0.20),
+    ]),
+    "car": ("Car costs", ["car", "fuel", "insurance", "parking", "gas"], (150, 300, 500), [
+        ("insurance", "Shop around for insurance", "Compare car insurance quotes every year and ask about good-student discounts.", 0.10),
+        ("fuel", "Drive for fuel economy", "Keep tyres inflated, drive smoothly and use a fuel price app to find cheaper stations.", 0.08),
+        ("parking", "Rethink campus parking", "Compare a campus parking permit with parking farther out and taking the shuttle.", 0.10),
+        ("maintenance", "Keep up maintenance", "Keep up oil changes and tyre checks; small maintenance prevents big repair bills.", 0.05),
+        ("share", "Share the car", "Share rides and split fuel with friends going the same way.", 0.15),
+        ("sell", "Consider going car-free", "Add up fuel, insurance, parking and repairs; if transit covers most trips, selling may pay.", 0.60),
+        ("repair-fund", "Save for repairs", "Put a small amount aside each month for repairs so a breakdown isn't an emergency.", 0.00),
+        ("registration", "Plan annual fees", "Spread registration, inspection and insurance payments over the year in a sinking fund.", 0.00),
+    ]),
+    "textbooks": ("Textbooks and supplies", ["books", "textbooks", "supplies", "course materials"], (40, 80, 150), [
+        ("used", "Buy used", "Buy used copies from older students or online marketplaces.", 0.40),
+        ("rent-books", "Rent textbooks", "Rent books you only need for one term.", 0.45),
+        ("library", "Use the library", "Check whether the library holds course books on reserve before buying.", 0.50),
+        ("older-edition", "Ask about older editions", "Ask the instructor whether an older edition will do; they often cost far less.", 0.35),
+        ("ebooks", "Compare ebooks", "Compare the ebook price and any free open-access version.", 0.30),
+        ("resell", "Resell at the end of term", "Sell books back as soon as the term ends, while they still have value.", 0.20),
+        ("share-books", "Share with a classmate", "Share a book with a classmate and split the cost.", 0.50),
+        ("wait", "Wait for the first week", "Wait until the first class to see which books are actually required.", 0.25),
+    ]),
+    "phone-internet": ("Phone and internet", ["phone", "mobile", "internet", "data", "plan"], (25, 50, 90), [
+        ("sim-only", "Switch to SIM-only", "Keep your current phone and move to a SIM-only plan when the contract ends.", 0.40),
+        ("right-size", "Right-size your data", "Check your real data use for three months and pick the plan that fits it.", 0.25),
+        ("wifi", "Use Wi-Fi", "Use campus and home Wi-Fi so a smaller data allowance is enough.", 0.15),
+        ("family-plan", "Join a family plan", "Ask to join a family or group plan, which costs less per line.", 0.35),
+        ("student-plan", "Ask for student pricing", "Ask providers about student plans and discounts.", 0.15),
+        ("repair", "Repair, don't replace", "Replace a cracked screen or battery instead of buying a new phone.", 0.20),
+        ("insurance-addon", "Drop extras", "Remove add-ons such as device insurance you don't need.", 0.10),
+        ("switch", "Switch providers", "Compare providers each year; new-customer deals are often cheaper than staying.", 0.20),
+    ]),
+    "subscriptions": ("Subscriptions", ["subscription", "streaming", "recurring", "apps", "membership"], (20, 45, 80), [
+        ("audit", "Audit subscriptions", "List every recurring charge from the last three months of statements and cancel what you don't use.", 0.35),
+        ("rotate", "Rotate streaming services", "Keep one streaming service at a time and switch each month.", 0.50),
+        ("student-tier", "Use student tiers", "Switch music and software subscriptions to their student tiers.", 0.40),
+        ("share-plan", "Share plans", "Share family plans with housemates where the terms allow it.", 0.40),
+        ("free-trials", "Track free trials", "Put a calendar reminder on every free trial the day before it renews.", 0.10),
+        ("annual", "Pay annually for keepers", "Pay yearly for subscriptions you will keep all year, which usually costs less.", 0.15),
+        ("library-apps", "Use library apps", "Use your library's free ebook, audiobook and film apps.", 0.25),
+        ("campus-software", "Use campus software", "Check which software your university already licenses for students.", 0.20),
+    ]),
+    "entertainment": ("Entertainment", ["entertainment", "fun", "social", "events", "going out"], (40, 90, 180), [
+        ("free-events", "Go to free campus events", "Use free campus events, clubs and societies for most nights out.", 0.35),
+        ("student-tickets", "Ask for student tickets", "Ask for student prices on cinema, theatre, museum and concert tickets.", 0.20),
+        ("pregame", "Eat before going out", "Eat at home before going out so the night is only the event itself.", 0.20),
+        ("cash-night", "Take cash", "Take a set amount of cash on nights out and leave the card at home.", 0.25),
+        ("host", "Host at home", "Host game or film nights at home instead of going out.", 0.30),
+        ("weekday", "Go on cheap days", "Go to the cinema or bowling on discount weekdays.", 0.20),
+        ("outdoors", "Go outdoors", "Plan hikes, picnics and park days, which cost almost nothing.", 0.30),
+        ("say-no", "Skip some plans", "It's fine to skip plans that don't fit the budget; suggest a cheaper alternative.", 0.20),
+    ]),
+    "clothing": ("Clothing", ["clothing", "clothes", "shopping", "shoes", "fashion"], (30, 60, 120), [
+        ("thrift", "Shop second-hand", "Shop thrift stores and resale apps first.", 0.45),
+        ("wait-48", "Wait 48 hours", "Wait two days before buying anything that isn't needed right away.", 0.25),
+        ("sales", "Buy out of season", "Buy seasonal items like coats at end-of-season sales.", 0.30),
+        ("swap", "Hold a clothing swap", "Swap clothes you don't wear with friends.", 0.20),
+        ("care", "Care for what you own", "Wash on cold, air-dry and repair small tears so clothes last longer.", 0.10),
+        ("capsule", "Build a small wardrobe", "Build around a few items that go together instead of buying one-off pieces.", 0.20),
+        ("unsubscribe", "Unsubscribe from store emails", "Unsubscribe from store emails and apps that push sales at you.", 0.15),
+        ("student-discount", "Use student discounts", "Use your student ID or a student discount app for clothing.", 0.10),
+    ]),
+    "health-fitness": ("Health and fitness", ["health", "gym", "fitness", "pharmacy", "sports"], (30, 60, 110), [
+        ("campus-gym", "Use the campus gym", "Use the campus gym or sports centre instead of a private membership.", 0.50),
+        ("generic", "Choose generic medicines", "Ask the pharmacist for generic versions of over-the-counter medicines.", 0.15),
+        ("student-health", "Use student health services", "Use the campus health centre for check-ups and advice before paying elsewhere.", 0.25),
+        ("home-workouts", "Work out at home", "Follow free workout videos or run outdoors.", 0.40),
+        ("cancel-unused", "Cancel unused memberships", "Cancel memberships you haven't used in a month.", 0.30),
+        ("off-peak-gym", "Choose off-peak memberships", "If you need a private gym, choose an off-peak or student membership.", 0.25),
+        ("insurance-check", "Check your coverage", "Check what your student health insurance covers before paying out of pocket.", 0.10),
+        ("prevent", "Budget for prevention", "Budget for dental and eye check-ups; small problems caught early cost less.", 0.05),
+    ]),
+    "personal-care": ("Personal care", ["personal care", "toiletries", "haircut", "beauty", "cosmetics"], (20, 40, 80), [
+        ("store-brand", "Buy store-brand toiletries", "Buy store-brand shampoo, soap and toothpaste.", 0.25),
+        ("bulk-toiletries", "Buy toiletries in bulk", "Buy larger bottles of what you use every day and split them with roommates.", 0.15),
+        ("training-salon", "Use training salons", "Get haircuts at a training salon or beauty school.", 0.50),
+        ("fewer-products", "Use fewer products", "Finish what you have before buying new products.", 0.20),
+        ("diy", "Do simple things yourself", "Do simple grooming such as nails at home.", 0.30),
+        ("samples", "Use samples", "Use free samples to test products before buying full sizes.", 0.10),
+        ("compare-online", "Compare prices online", "Compare prices online for the products you buy regularly.", 0.10),
+        ("spacing", "Space out appointments", "Stretch the time between paid appointments by a few weeks.", 0.20),
+    ]),
+}
+
+# situation -> (label, advice)
+SITUATIONS = {
+    "first-year": ("in your first year", "In your first year, track this spending for a month before setting a limit, so the limit matches real life."),
+    "dorm": ("living in a dorm", "In a dorm, check what your housing fee and campus services already include before paying for it twice."),
+    "roommates": ("sharing with roommates", "Sharing a place, agree on what is shared and split costs in an app so nobody quietly pays more."),
+    "living-at-home": ("living at home", "Living at home, put what you save here toward next term's costs or an emergency fund."),
+    "part-time": ("on a part-time income", "On a part-time income, move the amount you save to savings on payday so it isn't spent elsewhere."),
+    "abroad": ("studying abroad", "Abroad, compare prices in the local currency and use a card without foreign transaction fees."),
+}
+
+
+def _money(amount):
+    return f"${amount:,.0f}"
+
+
+def generate_tips():
+    """Yields tip dicts in a fixed order: area, action, situation, spend level."""
+    for area, (area_title, area_tags, spends, actions) in AREAS.items():
+        for key, title, advice, share in actions:
+            for situation, (label, situation_advice) in SITUATIONS.items():
+                for spend in spends:
+                    if share:
+                        monthly = spend * share
+                        example = (f"At {_money(spend)} a month on {area_title.lower()}, that saves about "
+                                   f"{_money(monthly)} a month, or {_money(monthly * SEMESTER_MONTHS)} a semester.")
+                    else:
+                        example = (f"At {_money(spend)} a month on {area_title.lower()}, setting aside "
+                                   f"{_money(spend * 0.1)} a month covers most surprises.")
+                    yield {
+                        "id": f"{area}-{key}-{situation}-{spend}",
+                        "title": f"{area_title}: {title} ({label}, {_money(spend)}/month)",
+                        "tags": area_tags + [situation.replace('-', ' ')],
+                        "text": f"{advice} {situation_advice} {example}"
+                    }
+
+
+def write_corpus(path=GENERATED_CORPUS_PATH):
+    tmp_path = path + '.tmp'
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for tip in generate_tips():
+            f.write(json.dumps(tip, ensure_ascii=False) + "\n")
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+if __name__ == "__main__":
+    print(f"Wrote {write_corpus()} generated tips -> {GENERATED_CORPUS_PATH}")
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from .memory_store import MemoryStore
+
+_SAFE_USER_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def partition_name(user_id):
+    """File-safe name for a user's partition; other ids are hashed."""
+    user_id = str(user_id)
+    if _SAFE_USER_ID.match(user_id):
+        return user_id
+    return "u_" + hashlib.sha256(user_id.encode('utf-8')).hexdigest()[:32]
+
+
+class UserStores:
+    """
+    One journaled MemoryStore per user under `root`, instead of a single
+    shared `user_data.json`, so users never contend on (or overwrite) one
+    file. At most `max_open` partitions stay open; the least recently used
+    one not in use is compacted and closed, and reopened from disk on its
+    next request.
+
+    Callers pin a store with `acquire()` while they use it and `release()` it
+    after; a pinned store is never evicted, and a user's file is not reopened
+    until its evicted store has finished closing, so there is never more than
+    one live MemoryStore per user file. Per-user objects built on a store
+    (e.g. a chat bot holding its memory) are kept with it via `session()` and
+    evicted together.
+    """
+
+    def __init__(self, root='user_data', max_open=256, compact_every=1000):
+        self.root = root
+        self.max_open = max_open
+        self.compact_every = compact_every
+        self._open = OrderedDict()  # user partition -> {"store": ..., "sessions": {...}, "pins": n}
+        self._closing = {}  # user partition -> Event set once its evicted store is closed
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def acquire(self, user_id):
+        """Returns the user's store, opening it if needed, pinned until release()."""
+        name = partition_name(user_id)
+        while True:
+            with self._lock:
+                entry = self._open.get(name)
+                if entry is not None:
+                    entry["pins"] += 1
+                    self._open.move_to_end(name)
+                    return entry["store"]
+                closing = self._closing.get(name)
+                if closing is None:
+                    store = MemoryStore(os.path.join(self.root, name + '.json'), journal=True,
+                                        compact_every=self.compact_every)
+                    self._open[name] = {"store": store, "sessions": {}, "pins": 1}
+                    evicted = self._take_evicted()
+                    break
+            # Reopen only once the old store has compacted its journal.
+            closing.wait()
+        self._close_evicted(evicted)
+        return store
+
+    def release(self, user_id):
+        name = partition_name(user_id)
+        with self._lock:
+            self._open[name]["pins"] -= 1
+            evicted = self._take_evicted()
+        self._close_evicted(evicted)
+
+    def _take_evicted(self):
+        # Called under the lock: unlinks the least recently used unpinned
+        # entries past max_open. If every entry is pinned, more stay open.
+        excess = len(self._open) - self.max_open
+        evicted = []
+        for name, entry in list(self._open.items()):
+            if excess <= 0:
+                break
+            if entry["pins"] == 0:
+                del self._open[name]
+                self._closing[name] = threading.Event()
+                evicted.append((name, entry["store"]))
+                excess -= 1
+        return evicted
+
+    def _close_evicted(self, evicted):
+        for name, store in evicted:
+            try:
+                self._close(store)
+            finally:
+                with self._lock:
+                    self._closing.pop(name).set()
+
+    @staticmethod
+    def _close(store):
+        try:
+            store.compact()
+        except OSError as e:
+            print(f"Warning: could not compact {store.file_path}: {e}")
+        store.close()
+
+    def session(self, user_id, key, factory):
+        """
+        Returns the user's `key` object, built once with `factory(store)`.
+        The user's store must be held with acquire() while it is used.
+        """
+        with self._lock:
+            entry = self._open.get(partition_name(user_id))
+            if entry is None or not entry["pins"]:
+                raise RuntimeError(f"acquire() the store for {user_id!r} before using its sessions")
+            session = entry["sessions"].get(key)
+            if session is None:
+                session = entry["sessions"][key] = factory(entry["store"])
+            return session
+
+    def open_count(self):
+        return len(self._open)
+
+    def close(self):
+        with self._lock:
+            entries = list(self._open.values())
+            self._open.clear()
+        for entry in entries:
+            self._close(entry["store"])